@@ -0,0 +1,274 @@
+"""
+Aggregate cube Food Group x HC x SC (jumlah baris + presence per nutrisi) untuk dashboard
+Author: Created for Tugas Akhir
+Date: March 23, 2026
+
+Fungsi:
+- Build sekali (per chunk) dari 4th_nutriensFood.csv: satu cell per kombinasi
+  (Food Group, HC_count, SC_count) berisi jumlah baris dan jumlah baris yang
+  nutrisi X-nya terisi (presence sum) untuk setiap nutrisi
+- Dimensi turunan dihitung dari cell saat query: nutrient_count (HC + SC),
+  completeness_category (kategori E.), hc_level (HIGH / MEDIUM / LOW seperti F.)
+- Query roll-up / slice di atas cell (ribuan baris), bukan di atas tabel mentah
+- Disimpan sebagai artefak kecil: H. completeness_cube.npz
+
+Usage:
+    python src/aggregate_cube.py build
+    python src/aggregate_cube.py query --by food_group --where "hc_level=HIGH"
+    python src/aggregate_cube.py query --by completeness_category --pct
+"""
+
+import argparse
+import io
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analyze_hc_sc import HARD_CONSTRAINTS, HIGH_QUALITY_HC, LOW_QUALITY_HC, NON_NUTRIENT_COLS
+from analyze_nutrient_completeness import categorize_completeness
+from streaming_stats import DEFAULT_CHUNKSIZE, UNKNOWN_GROUP, iter_chunks, read_columns
+
+CUBE_FILE = "H. completeness_cube.npz"
+KEY_COLS = ['food_group', 'hc', 'sc']
+DIMENSIONS = KEY_COLS + ['nutrient_count', 'completeness_category', 'hc_level']
+
+
+def hc_level(hc):
+    """
+    Level kualitas berdasarkan jumlah HC terisi (batas sama dengan laporan F.)
+    """
+    if hc >= HIGH_QUALITY_HC:
+        return "HIGH"
+    elif hc >= LOW_QUALITY_HC:
+        return "MEDIUM"
+    return "LOW"
+
+
+class CompletenessCube:
+    """
+    Cube agregat yang bisa di-update per chunk dan di-merge (seperti akumulator di streaming_stats)
+
+    Args:
+        nutrient_cols (list): Semua kolom nutrisi (urut sesuai file)
+        hard_constraints (list): Kolom HC (subset nutrient_cols)
+    """
+
+    def __init__(self, nutrient_cols, hard_constraints=HARD_CONSTRAINTS):
+        self.nutrient_cols = list(nutrient_cols)
+        self.hard_constraints = list(hard_constraints)
+        self.n_sc = len(self.nutrient_cols) - len(self.hard_constraints)
+        self.cells = pd.DataFrame(
+            columns=KEY_COLS + ['count'] + self.nutrient_cols
+        ).astype({col: np.int64 for col in ['hc', 'sc', 'count'] + self.nutrient_cols}).set_index(KEY_COLS)
+        self._frame = None
+
+    @property
+    def n_rows(self):
+        return int(self.cells['count'].sum())
+
+    def update(self, chunk):
+        """
+        Tambahkan satu chunk DataFrame
+        """
+        present = chunk[self.nutrient_cols].notna().astype(np.int64)
+        hc = present[self.hard_constraints].sum(axis=1)
+        keys = [chunk['Food Group'].fillna(UNKNOWN_GROUP).astype(str).rename('food_group'),
+                hc.rename('hc'), (present.sum(axis=1) - hc).rename('sc')]
+        agg = present.assign(count=1).groupby(keys, sort=False).sum()
+        return self._add(agg[['count'] + self.nutrient_cols])
+
+    def merge(self, other):
+        if (other.nutrient_cols, other.hard_constraints) != (self.nutrient_cols, self.hard_constraints):
+            raise ValueError("Cube dengan kolom nutrisi berbeda tidak bisa di-merge")
+        return self._add(other.cells)
+
+    def _add(self, cells):
+        combined = pd.concat([self.cells, cells]) if len(self.cells) else cells
+        self.cells = combined.groupby(level=KEY_COLS).sum().sort_index()
+        self._frame = None
+        return self
+
+    def frame(self):
+        """
+        Cell + dimensi turunan (di-cache sampai cube berubah)
+
+        Returns:
+            pd.DataFrame: food_group, hc, sc, nutrient_count, completeness_category,
+                          hc_level, count, <presence per nutrisi>
+        """
+        if self._frame is None:
+            frame = self.cells.reset_index()
+            total = len(self.nutrient_cols)
+            frame['nutrient_count'] = frame['hc'] + frame['sc']
+            categories = np.array([categorize_completeness(count, total) for count in range(total + 1)])
+            frame['completeness_category'] = categories[frame['nutrient_count'].to_numpy()]
+            levels = np.array([hc_level(hc) for hc in range(len(self.hard_constraints) + 1)])
+            frame['hc_level'] = levels[frame['hc'].to_numpy()]
+            self._frame = frame[DIMENSIONS + ['count'] + self.nutrient_cols]
+        return self._frame
+
+    def slice(self, where=None):
+        """
+        Cell yang memenuhi filter
+
+        Args:
+            where (dict): dimensi -> nilai | list nilai | callable(Series) -> mask
+
+        Returns:
+            pd.DataFrame: Cell terpilih (format sama dengan frame())
+        """
+        frame = self.frame()
+        mask = np.ones(len(frame), dtype=bool)
+        for dim, value in (where or {}).items():
+            if dim not in DIMENSIONS:
+                raise KeyError(f"Dimensi tidak dikenal: {dim} (pilihan: {', '.join(DIMENSIONS)})")
+            if callable(value):
+                mask &= np.asarray(value(frame[dim]), dtype=bool)
+            elif isinstance(value, (list, tuple, set)):
+                mask &= frame[dim].isin(list(value)).to_numpy()
+            else:
+                mask &= (frame[dim] == value).to_numpy()
+        return frame[mask]
+
+    def rollup(self, by=(), where=None, nutrients=None, pct=False):
+        """
+        Roll-up: jumlah baris + presence per nutrisi, dikelompokkan per dimensi `by`
+
+        Args:
+            by (list): Dimensi pengelompokan (kosong = total keseluruhan)
+            where (dict): Filter slice (lihat slice())
+            nutrients (list): Subset nutrisi (default semua)
+            pct (bool): Presence sebagai persentase baris (bukan jumlah)
+
+        Returns:
+            pd.DataFrame: index = dimensi `by`, kolom count + nutrisi
+        """
+        by = list(by)
+        unknown = [dim for dim in by if dim not in DIMENSIONS]
+        if unknown:
+            raise KeyError(f"Dimensi tidak dikenal: {unknown} (pilihan: {', '.join(DIMENSIONS)})")
+        nutrients = list(nutrients) if nutrients else self.nutrient_cols
+        cells = self.slice(where)[by + ['count'] + nutrients]
+        if by:
+            result = cells.groupby(by, sort=True).sum()
+        else:
+            result = cells[['count'] + nutrients].sum().to_frame('ALL').T
+        if pct:
+            result[nutrients] = (result[nutrients].div(result['count'], axis=0) * 100).round(2)
+        return result
+
+    def save(self, path):
+        """
+        Simpan ke .npz (deterministik: isi sama -> bytes sama)
+        """
+        cells = self.cells.reset_index()
+        groups, group_idx = np.unique(cells['food_group'].to_numpy(dtype=str), return_inverse=True)
+        arrays = {
+            'nutrient_cols': np.array(self.nutrient_cols),
+            'hard_constraints': np.array(self.hard_constraints),
+            'groups': groups,
+            'keys': np.column_stack([group_idx, cells['hc'], cells['sc']]).astype(np.int32),
+            'counts': cells['count'].to_numpy(dtype=np.int64),
+            'presence': cells[self.nutrient_cols].to_numpy(dtype=np.int64),
+        }
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name, array in arrays.items():
+                buffer = io.BytesIO()
+                np.save(buffer, array, allow_pickle=False)
+                zf.writestr(zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0)),
+                            buffer.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            cube = cls(data['nutrient_cols'].tolist(), data['hard_constraints'].tolist())
+            keys = data['keys']
+            cells = pd.DataFrame(data['presence'], columns=cube.nutrient_cols)
+            cells.insert(0, 'count', data['counts'])
+            cells.index = pd.MultiIndex.from_arrays(
+                [data['groups'][keys[:, 0]].astype(object), keys[:, 1].astype(np.int64),
+                 keys[:, 2].astype(np.int64)], names=KEY_COLS)
+        cube.cells = cells
+        return cube
+
+
+def build_cube(csv_file, output_file, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Build cube dari tabel nutrisi (per chunk) lalu simpan
+
+    Args:
+        csv_file (str): Path ke 4th_nutriensFood.csv (atau lazy stage view)
+        output_file (str): Path artefak .npz
+        chunksize (int): Jumlah baris per chunk
+
+    Returns:
+        CompletenessCube
+    """
+    print("=" * 70)
+    print("BUILD AGGREGATE CUBE (FOOD GROUP x HC x SC)")
+    print("=" * 70)
+
+    print(f"\n1. Membaca data dari: {csv_file}")
+    nutrient_cols = [col for col in read_columns(csv_file) if col not in NON_NUTRIENT_COLS]
+    cube = CompletenessCube(nutrient_cols)
+    for chunk in iter_chunks(csv_file, chunksize):
+        cube.update(chunk)
+    print(f"   ✓ Total baris: {cube.n_rows:,}")
+
+    cube.save(output_file)
+    print(f"\n2. Cube tersimpan: {output_file}")
+    print(f"   ✓ Cell: {len(cube.cells):,} "
+          f"({cube.cells.index.get_level_values('food_group').nunique()} food group x HC x SC)")
+    print(f"   ✓ Ukuran: {Path(output_file).stat().st_size / 1024:.1f} KB")
+    print("\n✅ Cube selesai!")
+    return cube
+
+
+def _parse_where(items):
+    where = {}
+    for item in items or []:
+        dim, _, value = item.partition('=')
+        values = [int(v) if v.lstrip('-').isdigit() else v for v in value.split('|')]
+        where[dim.strip()] = values if len(values) > 1 else values[0]
+    return where
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+    cube_file = data_processed / CUBE_FILE
+
+    parser = argparse.ArgumentParser(description="Aggregate cube kelengkapan untuk dashboard")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Build cube dari 4th_nutriensFood.csv")
+    build_parser.add_argument('--input', default=None,
+                              help="CSV atau lazy stage view (default: 4th_nutriensFood.csv)")
+    query_parser = subparsers.add_parser('query', help="Roll-up / slice dari cube")
+    query_parser.add_argument('--by', nargs='*', default=[], choices=DIMENSIONS)
+    query_parser.add_argument('--where', nargs='*', default=[],
+                              help="Filter dimensi=nilai (beberapa nilai dipisah '|')")
+    query_parser.add_argument('--nutrients', nargs='*', default=None)
+    query_parser.add_argument('--pct', action='store_true', help="Presence dalam persen")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        csv_file = Path(args.input) if args.input else data_processed / "4th_nutriensFood.csv"
+        if not csv_file.exists():
+            print(f"❌ Error: File tidak ditemukan: {csv_file}")
+            exit(1)
+        build_cube(str(csv_file), str(cube_file))
+    else:
+        if not cube_file.exists():
+            print(f"❌ Error: Cube belum dibuat: {cube_file}")
+            print("   Jalankan dulu: python src/aggregate_cube.py build")
+            exit(1)
+        start = time.perf_counter()
+        cube = CompletenessCube.load(cube_file)
+        result = cube.rollup(args.by, _parse_where(args.where), args.nutrients, args.pct)
+        elapsed = (time.perf_counter() - start) * 1000
+        with pd.option_context('display.max_rows', 200, 'display.width', 200):
+            print(result)
+        print(f"\n({len(result)} baris, {elapsed:.1f} ms termasuk load cube)")
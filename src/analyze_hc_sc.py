@@ -8,47 +8,309 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
-def analyze_hard_soft_constraints(csv_file, output_dir):
+from streaming_stats import (
+    DEFAULT_CHUNKSIZE,
+    CountHistogram,
+    RunningMoments,
+    TopK,
+    iter_chunks,
+    percentage,
+    read_columns,
+    report_path,
+    sample_notice,
+)
+
+# Define Hard Constraints (19 nutrisi)
+HARD_CONSTRAINTS = [
+    'Water (g)',
+    'Calories',
+    'Sugars (g)',
+    'Potassium, K (mg)',
+    'Calcium (mg)',
+    'Carbohydrate (g)',
+    'Cholesterol (mg)',
+    'Saturated Fats (g)',
+    'Fat (g)',
+    'Magnesium (mg)',
+    'Sodium (mg)',
+    'Protein (g)',
+    'Zinc, Zn (mg)',
+    'Fiber (g)',
+    'Vitamin A, RAE (mcg)',
+    'Vitamin B-12 (mcg)',
+    'Vitamin B6 (mg)',
+    'Vitamin C (mg)',
+    'Iron, Fe (mg)'
+]
+
+# Kolom identitas (bukan nutrisi)
+NON_NUTRIENT_COLS = ['ID', 'Name', 'Food Group']
+
+# Batas kualitas data berdasarkan jumlah HC yang terisi
+HIGH_QUALITY_HC = 15
+LOW_QUALITY_HC = 5
+
+class HCSCAccumulator:
+    """
+    Akumulator mergeable untuk statistik HC vs SC
+    
+    Menyimpan histogram exact gabungan (HC_count, SC_count), Welford moments,
+    top-k makanan berkualitas tinggi dan bottom-k makanan dengan HC terendah.
+    Memori O(1) terhadap jumlah baris.
+    """
+    
+    def __init__(self, hard_constraints, soft_constraints, n_top=20, n_worst=10):
+        self.hard_constraints = list(hard_constraints)
+        self.soft_constraints = list(soft_constraints)
+        self.n_hc = len(self.hard_constraints)
+        self.n_sc = len(self.soft_constraints)
+        # Histogram 2D disimpan flat: index = HC_count * (n_sc + 1) + SC_count
+        self.joint = CountHistogram((self.n_hc + 1) * (self.n_sc + 1) - 1)
+        self.hc_moments = RunningMoments()
+        self.sc_moments = RunningMoments()
+        self.high_quality = TopK(n_top, largest=True)
+        self.worst = TopK(n_worst, largest=False)
+    
+    @property
+    def n_rows(self):
+        return self.joint.n
+    
+    @property
+    def table(self):
+        """
+        Returns:
+            np.ndarray: Matriks jumlah baris [HC_count, SC_count]
+        """
+        return self.joint.counts.reshape(self.n_hc + 1, self.n_sc + 1)
+    
+    def marginal(self, axis):
+        """
+        Histogram marginal HC (axis='HC') atau SC (axis='SC')
+        """
+        if axis == 'HC':
+            hist = CountHistogram(self.n_hc)
+            hist.counts = self.table.sum(axis=1)
+        else:
+            hist = CountHistogram(self.n_sc)
+            hist.counts = self.table.sum(axis=0)
+        return hist
+    
+    def update(self, chunk, hc_counts=None, sc_counts=None):
+        """
+        Tambahkan satu chunk DataFrame (index = row id global)
+        
+        hc_counts / sc_counts (Series, opsional): jumlah HC / SC terisi per baris
+        yang sudah dihitung sebelumnya (mis. dari DatasetSession)
+        """
+        counts = pd.DataFrame({
+            'HC_count': chunk[self.hard_constraints].notna().sum(axis=1) if hc_counts is None else hc_counts,
+            'SC_count': chunk[self.soft_constraints].notna().sum(axis=1) if sc_counts is None else sc_counts,
+        })
+        hc = counts['HC_count'].to_numpy()
+        sc = counts['SC_count'].to_numpy()
+        self.joint.update(hc * (self.n_sc + 1) + sc)
+        self.hc_moments.update(hc)
+        self.sc_moments.update(sc)
+        
+        names = chunk['Name'].astype(str) if 'Name' in chunk.columns else pd.Series("N/A", index=chunk.index)
+        
+        # Urutan sama seperti sort HC (desc), SC (desc), lalu urutan baris
+        high = counts[counts['HC_count'] >= HIGH_QUALITY_HC].nlargest(self.high_quality.k, ['HC_count', 'SC_count'])
+        self.high_quality.push_many(
+            [(int(r.HC_count), int(r.SC_count), -int(r.Index)) for r in high.itertuples()],
+            [names[r.Index] for r in high.itertuples()]
+        )
+        low = counts.nsmallest(self.worst.k, ['HC_count', 'SC_count'])
+        self.worst.push_many(
+            [(int(r.HC_count), int(r.SC_count), int(r.Index)) for r in low.itertuples()],
+            [names[r.Index] for r in low.itertuples()]
+        )
+        return self
+    
+    def merge(self, other):
+        """
+        Gabungkan akumulator lain (mis. hasil worker paralel)
+        """
+        if (other.hard_constraints, other.soft_constraints) != (self.hard_constraints, self.soft_constraints):
+            raise ValueError("Akumulator dengan kolom HC/SC berbeda tidak bisa di-merge")
+        self.joint.merge(other.joint)
+        self.hc_moments.merge(other.hc_moments)
+        self.sc_moments.merge(other.sc_moments)
+        self.high_quality.merge(other.high_quality)
+        self.worst.merge(other.worst)
+        return self
+    
+    def to_dict(self):
+        """
+        State akumulator (JSON-serializable), untuk disimpan dan dilanjutkan nanti
+        """
+        return {
+            'hard_constraints': self.hard_constraints,
+            'soft_constraints': self.soft_constraints,
+            'joint': self.joint.to_dict(),
+            'hc_moments': self.hc_moments.to_dict(),
+            'sc_moments': self.sc_moments.to_dict(),
+            'high_quality': self.high_quality.to_dict(),
+            'worst': self.worst.to_dict(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        acc = cls(data['hard_constraints'], data['soft_constraints'],
+                  data['high_quality']['k'], data['worst']['k'])
+        acc.joint = CountHistogram.from_dict(data['joint'])
+        acc.hc_moments = RunningMoments.from_dict(data['hc_moments'])
+        acc.sc_moments = RunningMoments.from_dict(data['sc_moments'])
+        acc.high_quality = TopK.from_dict(data['high_quality'])
+        acc.worst = TopK.from_dict(data['worst'])
+        return acc
+    
+    def summary_table(self):
+        """
+        Tabel summary HC vs SC (urut HC desc, SC desc) dengan persentase kumulatif
+        """
+        hc_idx, sc_idx = np.nonzero(self.table)
+        summary = pd.DataFrame({
+            'HC_count': hc_idx.astype(np.int64),
+            'SC_count': sc_idx.astype(np.int64),
+            'Total_Rows': self.table[hc_idx, sc_idx].astype(np.int64),
+        })
+        summary = summary.sort_values(by=['HC_count', 'SC_count'], ascending=[False, False]).reset_index(drop=True)
+        summary['Percentage'] = (summary['Total_Rows'] / self.n_rows) * 100
+        summary['Cumulative'] = summary['Total_Rows'].cumsum()
+        summary['Cumulative_Pct'] = (summary['Cumulative'] / self.n_rows) * 100
+        return summary
+    
+    def sc_stats_per_hc(self):
+        """
+        Returns:
+            dict: HC_count -> CountHistogram SC_count (urut HC desc, hanya HC yang ada)
+        """
+        stats = {}
+        for hc in self.marginal('HC').nonzero()[::-1]:
+            hist = CountHistogram(self.n_sc)
+            hist.counts = self.table[hc].copy()
+            stats[int(hc)] = hist
+        return stats
+
+
+def write_hc_sc_report(acc, output_dir, sample=None):
+    """
+    Tulis F. HC_SC_summary_table.csv, F. HC_distribution.csv dan F. HC_SC_detailed_report.txt
+    
+    Args:
+        acc (HCSCAccumulator): Akumulator yang sudah terisi
+        output_dir (str): Folder output
+        sample (dict): Metadata sampel jika acc dihitung dari sampel (nama file
+            diberi akhiran [SAMPLE] dan header peringatan)
+        
+    Returns:
+        tuple: (path summary table, path HC distribution, path detailed report)
+    """
+    n_rows = acc.n_rows
+    summary = acc.summary_table()
+    sc_per_hc = acc.sc_stats_per_hc()
+    perfect_hc = int(acc.marginal('HC').counts[acc.n_hc])
+    # Mean dari histogram (sum / n exact), tidak bergantung pada pembagian chunk
+    hc_mean = acc.marginal('HC').mean()
+    sc_mean = acc.marginal('SC').mean()
+    
+    # Save summary table
+    summary_file = report_path(output_dir, "F. HC_SC_summary_table.csv", sample)
+    summary.to_csv(summary_file, index=False)
+    
+    # Save HC distribution
+    hc_dist_file = report_path(output_dir, "F. HC_distribution.csv", sample)
+    rows = []
+    for hc, hist in sorted(sc_per_hc.items()):
+        rows.append({
+            'HC_count': hc,
+            'SC_count_count': hist.n,
+            'SC_count_mean': hist.mean(),
+            'SC_count_min': hist.min(),
+            'SC_count_max': hist.max(),
+            'SC_count_std': hist.std(),
+            'Total_count_mean': hc + hist.mean(),
+            'Total_count_min': hc + hist.min(),
+            'Total_count_max': hc + hist.max(),
+        })
+    # Kolom eksplisit supaya sumber kosong tetap menghasilkan CSV dengan header yang sama
+    columns = ['HC_count', 'SC_count_count', 'SC_count_mean', 'SC_count_min', 'SC_count_max', 'SC_count_std',
+               'Total_count_mean', 'Total_count_min', 'Total_count_max']
+    hc_dist = pd.DataFrame(rows, columns=columns).set_index('HC_count').round(2)
+    hc_dist.to_csv(hc_dist_file)
+    
+    # Save detailed report
+    report_file = report_path(output_dir, "F. HC_SC_detailed_report.txt", sample)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("LAPORAN ANALISIS HARD CONSTRAINT vs SOFT CONSTRAINT\n")
+        f.write("="*90 + "\n\n")
+        if sample is not None:
+            f.write(sample_notice(sample, "CI_hc_sc_report.txt"))
+        f.write(f"Total data: {n_rows:,} baris\n")
+        f.write(f"Hard Constraints: {acc.n_hc} nutrisi\n")
+        f.write(f"Soft Constraints: {acc.n_sc} nutrisi\n\n")
+        
+        f.write("STATISTIK:\n")
+        f.write("-"*90 + "\n")
+        f.write(f"HC Mean: {hc_mean:.2f}/{acc.n_hc} ({hc_mean / acc.n_hc * 100:.1f}%)\n")
+        f.write(f"SC Mean: {sc_mean:.2f}/{acc.n_sc} ({sc_mean / acc.n_sc * 100:.1f}%)\n")
+        f.write(f"Data dengan HC lengkap (19/19): {perfect_hc:,} ({percentage(perfect_hc, n_rows):.2f}%)\n\n")
+        
+        f.write("TABEL SUMMARY HC vs SC (Top 100):\n")
+        f.write("-"*90 + "\n")
+        f.write(f"{'HC':>3} | {'SC':>3} | {'Total Rows':>12} | {'%':>7}\n")
+        f.write(f"{'-'*3}-+-{'-'*3}-+-{'-'*12}-+-{'-'*7}\n")
+        for _, row in summary.head(100).iterrows():
+            f.write(f"{int(row['HC_count']):3d} | {int(row['SC_count']):3d} | {int(row['Total_Rows']):>12,} | {row['Percentage']:>6.2f}%\n")
+        
+        f.write("\n\nDISTRIBUSI PER LEVEL HC:\n")
+        f.write("-"*90 + "\n")
+        for hc, hist in sc_per_hc.items():
+            count = hist.n
+            pct = percentage(count, n_rows)
+            f.write(f"HC {hc:2d}: {count:>10,} baris ({pct:>5.2f}%) | SC mean: {hist.mean():.2f}\n")
+    
+    return summary_file, hc_dist_file, report_file
+
+
+def analyze_hard_soft_constraints(csv_file, output_dir, chunksize=DEFAULT_CHUNKSIZE, progress=None,
+                                  session=None, sample=None):
     """
     Analyze kelengkapan Hard Constraint vs Soft Constraint
+    
+    Data dibaca per chunk dan diakumulasi dengan HCSCAccumulator (tanpa
+    sorting tabel penuh), sehingga memori tidak bergantung pada jumlah baris.
+    
+    Args:
+        progress (callable): Opsional, dipanggil progress(baris_diproses) setiap chunk
+        session (DatasetSession): Opsional, pakai kolom & akumulator yang sudah
+            di-memo di session (tanpa membaca ulang csv_file); csv_file harus
+            sama dengan session.source (ValueError jika berbeda)
+        sample (dict): Metadata sampel jika csv_file adalah sampel (laporan diberi label)
+    
+    Returns:
+        tuple: (HCSCAccumulator, summary table DataFrame)
     """
     print("=" * 90)
     print("ANALISIS HARD CONSTRAINT VS SOFT CONSTRAINT")
     print("=" * 90)
     
-    # Define Hard Constraints (19 nutrisi)
-    hard_constraints = [
-        'Water (g)',
-        'Calories',
-        'Sugars (g)',
-        'Potassium, K (mg)',
-        'Calcium (mg)',
-        'Carbohydrate (g)',
-        'Cholesterol (mg)',
-        'Saturated Fats (g)',
-        'Fat (g)',
-        'Magnesium (mg)',
-        'Sodium (mg)',
-        'Protein (g)',
-        'Zinc, Zn (mg)',
-        'Fiber (g)',
-        'Vitamin A, RAE (mcg)',
-        'Vitamin B-12 (mcg)',
-        'Vitamin B6 (mg)',
-        'Vitamin C (mg)',
-        'Iron, Fe (mg)'
-    ]
-    
-    # Load data
+    hard_constraints = HARD_CONSTRAINTS
+    
+    # Load header
     print(f"\n1. Loading data dari: {csv_file}")
-    print("   (File ~213MB, mohon tunggu...)")
-    df = pd.read_csv(csv_file, low_memory=False)
-    print(f"   ✓ Total baris: {len(df):,}")
-    print(f"   ✓ Total kolom: {len(df.columns)}")
+    if session is not None:
+        session.check_source(csv_file)
+        print(f"   (Memakai data yang sudah di-memo di DatasetSession)")
+        columns = session.columns
+    else:
+        print(f"   (Dibaca per chunk {chunksize:,} baris...)")
+        columns = read_columns(csv_file)
+    print(f"   ✓ Total kolom: {len(columns)}")
     
     # Identify columns
-    non_nutrient_cols = ['ID', 'Name', 'Food Group']
-    all_nutrient_cols = [col for col in df.columns if col not in non_nutrient_cols]
+    all_nutrient_cols = [col for col in columns if col not in NON_NUTRIENT_COLS]
     
     # Soft Constraints = All Nutrients - Hard Constraints
     soft_constraints = [col for col in all_nutrient_cols if col not in hard_constraints]
@@ -68,52 +330,50 @@ def analyze_hard_soft_constraints(csv_file, output_dir):
     
     # Count completeness for HC and SC
     print(f"\n3. Menghitung kelengkapan HC dan SC per baris...")
-    df['HC_count'] = df[hard_constraints].notna().sum(axis=1)
-    df['SC_count'] = df[soft_constraints].notna().sum(axis=1)
-    df['Total_count'] = df['HC_count'] + df['SC_count']
-    
-    df['HC_percentage'] = (df['HC_count'] / len(hard_constraints)) * 100
-    df['SC_percentage'] = (df['SC_count'] / len(soft_constraints)) * 100
+    if session is not None:
+        acc = session.hc_sc_accumulator()
+        if progress:
+            progress(acc.n_rows)
+    else:
+        acc = HCSCAccumulator(hard_constraints, soft_constraints)
+        for chunk in iter_chunks(csv_file, chunksize):
+            acc.update(chunk)
+            if progress:
+                progress(acc.n_rows)
+    n_rows = acc.n_rows
+    print(f"   ✓ Total baris: {n_rows:,}")
+    
+    hc_hist = acc.marginal('HC')
+    sc_hist = acc.marginal('SC')
     
     # Statistics
     print(f"\n{'='*90}")
     print(f"STATISTIK KELENGKAPAN:")
     print(f"{'='*90}")
     print(f"\nHard Constraints (HC):")
-    print(f"   Min HC: {df['HC_count'].min():.0f}/{len(hard_constraints)}")
-    print(f"   Max HC: {df['HC_count'].max():.0f}/{len(hard_constraints)}")
-    print(f"   Mean HC: {df['HC_count'].mean():.2f}/{len(hard_constraints)} ({df['HC_percentage'].mean():.1f}%)")
-    print(f"   Median HC: {df['HC_count'].median():.0f}/{len(hard_constraints)}")
-    print(f"   Std Dev: {df['HC_count'].std():.2f}")
+    print(f"   Min HC: {hc_hist.min():.0f}/{len(hard_constraints)}")
+    print(f"   Max HC: {hc_hist.max():.0f}/{len(hard_constraints)}")
+    print(f"   Mean HC: {hc_hist.mean():.2f}/{len(hard_constraints)} ({hc_hist.mean() / len(hard_constraints) * 100:.1f}%)")
+    print(f"   Median HC: {hc_hist.median():.0f}/{len(hard_constraints)}")
+    print(f"   Std Dev: {hc_hist.std():.2f}")
     
     print(f"\nSoft Constraints (SC):")
-    print(f"   Min SC: {df['SC_count'].min():.0f}/{len(soft_constraints)}")
-    print(f"   Max SC: {df['SC_count'].max():.0f}/{len(soft_constraints)}")
-    print(f"   Mean SC: {df['SC_count'].mean():.2f}/{len(soft_constraints)} ({df['SC_percentage'].mean():.1f}%)")
-    print(f"   Median SC: {df['SC_count'].median():.0f}/{len(soft_constraints)}")
-    print(f"   Std Dev: {df['SC_count'].std():.2f}")
+    print(f"   Min SC: {sc_hist.min():.0f}/{len(soft_constraints)}")
+    print(f"   Max SC: {sc_hist.max():.0f}/{len(soft_constraints)}")
+    print(f"   Mean SC: {sc_hist.mean():.2f}/{len(soft_constraints)} ({sc_hist.mean() / len(soft_constraints) * 100:.1f}%)")
+    print(f"   Median SC: {sc_hist.median():.0f}/{len(soft_constraints)}")
+    print(f"   Std Dev: {sc_hist.std():.2f}")
     
     # Check for perfect HC
-    perfect_hc = (df['HC_count'] == len(hard_constraints)).sum()
-    print(f"\n   🎯 Data dengan HC LENGKAP (19/19): {perfect_hc:,} baris ({perfect_hc/len(df)*100:.2f}%)")
-    
-    # Sort data: Primary by HC (desc), Secondary by SC (desc)
-    print(f"\n4. Sorting data berdasarkan HC (desc) dan SC (desc)...")
-    df_sorted = df.sort_values(by=['HC_count', 'SC_count'], ascending=[False, False])
-    print(f"   ✓ Data sorted!")
+    perfect_hc = int(hc_hist.counts[len(hard_constraints)])
+    print(f"\n   🎯 Data dengan HC LENGKAP (19/19): {perfect_hc:,} baris ({percentage(perfect_hc, n_rows):.2f}%)")
     
     # Create summary table: HC, SC, Total rows
     print(f"\n{'='*90}")
     print(f"TABEL SUMMARY HC vs SC:")
     print(f"{'='*90}")
     
-    summary = df_sorted.groupby(['HC_count', 'SC_count']).size().reset_index(name='Total_Rows')
-    summary = summary.sort_values(by=['HC_count', 'SC_count'], ascending=[False, False])
-    
-    # Add percentages
-    summary['Percentage'] = (summary['Total_Rows'] / len(df)) * 100
-    summary['Cumulative'] = summary['Total_Rows'].cumsum()
-    summary['Cumulative_Pct'] = (summary['Cumulative'] / len(df)) * 100
+    summary = acc.summary_table()
     
     print(f"\n{'HC':>3} | {'SC':>3} | {'Total Rows':>12} | {'%':>7} | {'Cumulative':>12} | {'Cum %':>7}")
     print(f"{'-'*3}-+-{'-'*3}-+-{'-'*12}-+-{'-'*7}-+-{'-'*12}-+-{'-'*7}")
@@ -135,122 +395,83 @@ def analyze_hard_soft_constraints(csv_file, output_dir):
     print(f"DISTRIBUSI DATA PER LEVEL HC:")
     print(f"{'='*90}")
     
-    hc_distribution = df_sorted.groupby('HC_count').agg({
-        'SC_count': ['count', 'mean', 'min', 'max'],
-        'Total_count': 'mean'
-    }).round(2)
-    
     print(f"\n{'HC':>3} | {'Total Rows':>12} | {'%':>7} | {'SC Mean':>8} | {'SC Min':>7} | {'SC Max':>7} | {'Total Mean':>11}")
     print(f"{'-'*3}-+-{'-'*12}-+-{'-'*7}-+-{'-'*8}-+-{'-'*7}-+-{'-'*7}-+-{'-'*11}")
     
-    for hc in sorted(df_sorted['HC_count'].unique(), reverse=True):
-        hc_data = df_sorted[df_sorted['HC_count'] == hc]
-        count = len(hc_data)
-        pct = count / len(df) * 100
-        sc_mean = hc_data['SC_count'].mean()
-        sc_min = hc_data['SC_count'].min()
-        sc_max = hc_data['SC_count'].max()
-        total_mean = hc_data['Total_count'].mean()
+    for hc, sc_data in acc.sc_stats_per_hc().items():
+        count = sc_data.n
+        pct = percentage(count, n_rows)
+        sc_mean = sc_data.mean()
+        total_mean = hc + sc_mean
         
-        print(f"{int(hc):3d} | {count:>12,} | {pct:>6.2f}% | {sc_mean:>8.2f} | {int(sc_min):>7d} | {int(sc_max):>7d} | {total_mean:>11.2f}")
+        print(f"{hc:3d} | {count:>12,} | {pct:>6.2f}% | {sc_mean:>8.2f} | {sc_data.min():>7d} | {sc_data.max():>7d} | {total_mean:>11.2f}")
     
-    # Top quality data (HC ≥ 15)
+    # Top quality data (HC ≥ HIGH_QUALITY_HC)
     print(f"\n{'='*90}")
-    print(f"DATA BERKUALITAS TINGGI (HC ≥ 15):")
+    print(f"DATA BERKUALITAS TINGGI (HC ≥ {HIGH_QUALITY_HC}):")
     print(f"{'='*90}")
     
-    high_quality = df_sorted[df_sorted['HC_count'] >= 15]
-    print(f"\nTotal data dengan HC ≥ 15: {len(high_quality):,} ({len(high_quality)/len(df)*100:.2f}%)")
+    high_quality_count = int(hc_hist.counts[HIGH_QUALITY_HC:].sum())
+    print(f"\nTotal data dengan HC ≥ {HIGH_QUALITY_HC}: {high_quality_count:,} ({percentage(high_quality_count, n_rows):.2f}%)")
     
-    if len(high_quality) > 0:
+    if high_quality_count > 0:
         print(f"\nTop 20 makanan dengan HC & SC terlengkap:")
         print(f"{'-'*90}")
-        for i, row in enumerate(high_quality.head(20).itertuples(), 1):
-            name = str(row.Name)[:60] if hasattr(row, 'Name') else "N/A"
-            print(f"{i:2d}. {name:<60} | HC: {row.HC_count:2.0f}/19 | SC: {row.SC_count:2.0f}/15")
+        for i, ((hc, sc, _), name) in enumerate(acc.high_quality.items(), 1):
+            print(f"{i:2d}. {name[:60]:<60} | HC: {hc:2.0f}/19 | SC: {sc:2.0f}/15")
     
-    # Low quality data (HC < 5)
+    # Low quality data (HC < LOW_QUALITY_HC)
     print(f"\n{'='*90}")
-    print(f"DATA BERKUALITAS RENDAH (HC < 5):")
+    print(f"DATA BERKUALITAS RENDAH (HC < {LOW_QUALITY_HC}):")
     print(f"{'='*90}")
     
-    low_quality = df_sorted[df_sorted['HC_count'] < 5]
-    print(f"\nTotal data dengan HC < 5: {len(low_quality):,} ({len(low_quality)/len(df)*100:.2f}%)")
+    low_quality_count = int(hc_hist.counts[:LOW_QUALITY_HC].sum())
+    print(f"\nTotal data dengan HC < {LOW_QUALITY_HC}: {low_quality_count:,} ({percentage(low_quality_count, n_rows):.2f}%)")
     
-    if len(low_quality) > 0:
+    if low_quality_count > 0:
         print(f"\nContoh 10 makanan dengan HC terendah:")
         print(f"{'-'*90}")
-        worst = df_sorted.nsmallest(10, ['HC_count', 'SC_count'])
-        for i, row in enumerate(worst.itertuples(), 1):
-            name = str(row.Name)[:60] if hasattr(row, 'Name') else "N/A"
-            print(f"{i:2d}. {name:<60} | HC: {row.HC_count:2.0f}/19 | SC: {row.SC_count:2.0f}/15")
+        for i, ((hc, sc, _), name) in enumerate(acc.worst.items(), 1):
+            print(f"{i:2d}. {name[:60]:<60} | HC: {hc:2.0f}/19 | SC: {sc:2.0f}/15")
     
     # Save detailed reports
     print(f"\n{'='*90}")
     print(f"MENYIMPAN LAPORAN:")
     print(f"{'='*90}")
     
-    # Save summary table
-    summary_file = Path(output_dir) / "F. HC_SC_summary_table.csv"
-    summary.to_csv(summary_file, index=False)
+    summary_file, hc_dist_file, report_file = write_hc_sc_report(acc, output_dir, sample)
     print(f"\n1. Summary table: {summary_file}")
-    
-    # Save HC distribution
-    hc_dist_file = Path(output_dir) / "F. HC_distribution.csv"
-    hc_dist = df_sorted.groupby('HC_count').agg({
-        'SC_count': ['count', 'mean', 'min', 'max', 'std'],
-        'Total_count': ['mean', 'min', 'max']
-    }).round(2)
-    hc_dist.columns = ['_'.join(col).strip() for col in hc_dist.columns.values]
-    hc_dist.to_csv(hc_dist_file)
     print(f"2. HC distribution: {hc_dist_file}")
-    
-    # Save detailed report
-    report_file = Path(output_dir) / "F. HC_SC_detailed_report.txt"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("LAPORAN ANALISIS HARD CONSTRAINT vs SOFT CONSTRAINT\n")
-        f.write("="*90 + "\n\n")
-        f.write(f"Total data: {len(df):,} baris\n")
-        f.write(f"Hard Constraints: {len(hard_constraints)} nutrisi\n")
-        f.write(f"Soft Constraints: {len(soft_constraints)} nutrisi\n\n")
-        
-        f.write("STATISTIK:\n")
-        f.write("-"*90 + "\n")
-        f.write(f"HC Mean: {df['HC_count'].mean():.2f}/{len(hard_constraints)} ({df['HC_percentage'].mean():.1f}%)\n")
-        f.write(f"SC Mean: {df['SC_count'].mean():.2f}/{len(soft_constraints)} ({df['SC_percentage'].mean():.1f}%)\n")
-        f.write(f"Data dengan HC lengkap (19/19): {perfect_hc:,} ({perfect_hc/len(df)*100:.2f}%)\n\n")
-        
-        f.write("TABEL SUMMARY HC vs SC (Top 100):\n")
-        f.write("-"*90 + "\n")
-        f.write(f"{'HC':>3} | {'SC':>3} | {'Total Rows':>12} | {'%':>7}\n")
-        f.write(f"{'-'*3}-+-{'-'*3}-+-{'-'*12}-+-{'-'*7}\n")
-        for _, row in summary.head(100).iterrows():
-            f.write(f"{int(row['HC_count']):3d} | {int(row['SC_count']):3d} | {int(row['Total_Rows']):>12,} | {row['Percentage']:>6.2f}%\n")
-        
-        f.write("\n\nDISTRIBUSI PER LEVEL HC:\n")
-        f.write("-"*90 + "\n")
-        for hc in sorted(df_sorted['HC_count'].unique(), reverse=True):
-            hc_data = df_sorted[df_sorted['HC_count'] == hc]
-            count = len(hc_data)
-            pct = count / len(df) * 100
-            f.write(f"HC {int(hc):2d}: {count:>10,} baris ({pct:>5.2f}%) | SC mean: {hc_data['SC_count'].mean():.2f}\n")
-    
     print(f"3. Detailed report: {report_file}")
     
     print(f"\n{'='*90}")
     print("✅ ANALISIS SELESAI!")
     print(f"{'='*90}")
     
-    return df_sorted, summary
+    return acc, summary
 
 if __name__ == "__main__":
+    import argparse
+    from sample_data import add_sample_arguments, run_on_sample
+    
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', default=None,
+                        help="CSV atau lazy stage view (default: 4th_nutriensFood.csv)")
+    add_sample_arguments(parser)
+    args = parser.parse_args()
+    
     base_dir = Path(__file__).parent.parent
     data_processed = base_dir / "data" / "processed"
     
-    csv_file = data_processed / "4th_nutriensFood.csv"
+    csv_file = Path(args.input) if args.input else data_processed / "4th_nutriensFood.csv"
     
     if not csv_file.exists():
         print(f"❌ Error: File tidak ditemukan: {csv_file}")
         exit(1)
     
-    df_sorted, summary = analyze_hard_soft_constraints(str(csv_file), str(data_processed))
+    if args.sample is not None:
+        run_on_sample(str(csv_file), 'hc_sc', frac=args.sample, seed=args.seed,
+                      rebuild=args.rebuild_sample)
+        exit(0)
+    
+    acc, summary = analyze_hard_soft_constraints(str(csv_file), str(data_processed))
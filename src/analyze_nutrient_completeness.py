@@ -9,44 +9,284 @@ import numpy as np
 from pathlib import Path
 import matplotlib.pyplot as plt
 
-def analyze_nutrient_completeness(csv_file, output_dir):
+from streaming_stats import (
+    DEFAULT_CHUNKSIZE,
+    CountHistogram,
+    RunningMoments,
+    TopK,
+    iter_chunks,
+    percentage,
+    read_columns,
+    report_path,
+    sample_notice,
+)
+
+# Kolom identitas (bukan nutrisi)
+NON_NUTRIENT_COLS = ['ID', 'Name', 'Food Group']
+
+def categorize_completeness(count, total):
+    """
+    Kategorisasi kelengkapan berdasarkan persentase nutrisi yang terisi
+    
+    Args:
+        count (int): Jumlah nutrisi yang terisi
+        total (int): Total kolom nutrisi
+        
+    Returns:
+        str: Label kategori kelengkapan
+    """
+    pct = (count / total) * 100
+    if pct == 100:
+        return "1. PERFECT (100%)"
+    elif pct >= 90:
+        return "2. EXCELLENT (90-99%)"
+    elif pct >= 70:
+        return "3. GOOD (70-89%)"
+    elif pct >= 50:
+        return "4. MODERATE (50-69%)"
+    elif pct >= 30:
+        return "5. LOW (30-49%)"
+    else:
+        return "6. VERY LOW (<30%)"
+
+class CompletenessAccumulator:
+    """
+    Akumulator mergeable untuk statistik kelengkapan nutrisi
+    
+    Menyimpan histogram exact nutrient_count, Welford moments, top-k / bottom-k
+    makanan, dan contoh makanan per kategori. Memori O(1) terhadap jumlah baris.
+    """
+    
+    def __init__(self, nutrient_cols, n_top=10, n_samples=3):
+        self.nutrient_cols = list(nutrient_cols)
+        self.total = len(self.nutrient_cols)
+        self.histogram = CountHistogram(self.total)
+        self.moments = RunningMoments()
+        self.most_complete = TopK(n_top, largest=True)
+        self.least_complete = TopK(n_top, largest=False)
+        self.n_samples = n_samples
+        self.category_samples = {}
+        self._category_of = np.array(
+            [categorize_completeness(count, self.total) for count in range(self.total + 1)]
+        )
+    
+    @property
+    def n_rows(self):
+        return self.histogram.n
+    
+    def update(self, chunk, counts=None):
+        """
+        Tambahkan satu chunk DataFrame (index = row id global)
+        
+        counts (Series, opsional): jumlah nutrisi terisi per baris yang sudah
+        dihitung sebelumnya (mis. dari DatasetSession)
+        """
+        if counts is None:
+            counts = chunk[self.nutrient_cols].notna().sum(axis=1)
+        self.histogram.update(counts.to_numpy())
+        self.moments.update(counts.to_numpy())
+        
+        names = chunk['Name'].astype(str)
+        row_ids = chunk.index.to_numpy()
+        
+        # Pre-seleksi per chunk supaya heap hanya menerima <= k kandidat
+        for top, selected in ((self.most_complete, counts.nlargest(self.most_complete.k)),
+                              (self.least_complete, counts.nsmallest(self.least_complete.k))):
+            sign = -1 if top.largest else 1
+            keys = [(int(count), sign * int(row_id)) for row_id, count in selected.items()]
+            top.push_many(keys, [(names[row_id], int(row_id)) for row_id in selected.index])
+        
+        categories = pd.Series(self._category_of[counts.to_numpy()], index=counts.index)
+        for category, rows in categories.groupby(categories, sort=False):
+            samples = self.category_samples.setdefault(category, TopK(self.n_samples, largest=False))
+            first_rows = rows.index[:self.n_samples]
+            samples.push_many([(int(row_id),) for row_id in first_rows],
+                              [names[row_id] for row_id in first_rows])
+        return self
+    
+    def merge(self, other):
+        """
+        Gabungkan akumulator lain (mis. hasil worker paralel)
+        """
+        if other.nutrient_cols != self.nutrient_cols:
+            raise ValueError("Akumulator dengan kolom nutrisi berbeda tidak bisa di-merge")
+        self.histogram.merge(other.histogram)
+        self.moments.merge(other.moments)
+        self.most_complete.merge(other.most_complete)
+        self.least_complete.merge(other.least_complete)
+        for category, samples in other.category_samples.items():
+            self.category_samples.setdefault(
+                category, TopK(self.n_samples, largest=False)
+            ).merge(samples)
+        return self
+    
+    def to_dict(self):
+        """
+        State akumulator (JSON-serializable), untuk disimpan dan dilanjutkan nanti
+        """
+        return {
+            'nutrient_cols': self.nutrient_cols,
+            'histogram': self.histogram.to_dict(),
+            'moments': self.moments.to_dict(),
+            'most_complete': self.most_complete.to_dict(),
+            'least_complete': self.least_complete.to_dict(),
+            'n_samples': self.n_samples,
+            'category_samples': {category: samples.to_dict()
+                                 for category, samples in self.category_samples.items()},
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        acc = cls(data['nutrient_cols'], data['most_complete']['k'], data['n_samples'])
+        acc.histogram = CountHistogram.from_dict(data['histogram'])
+        acc.moments = RunningMoments.from_dict(data['moments'])
+        acc.most_complete = TopK.from_dict(data['most_complete'])
+        acc.least_complete = TopK.from_dict(data['least_complete'])
+        acc.category_samples = {category: TopK.from_dict(samples)
+                                for category, samples in data['category_samples'].items()}
+        return acc
+    
+    def category_stats(self):
+        """
+        Returns:
+            dict: kategori -> (jumlah baris, mean, min, max nutrient_count), urut kategori
+        """
+        stats = {}
+        for category in sorted(set(self._category_of[self.histogram.nonzero()])):
+            hist = CountHistogram(self.total)
+            hist.counts = np.where(self._category_of == category, self.histogram.counts, 0)
+            stats[category] = (hist.n, hist.mean(), hist.min(), hist.max())
+        return stats
+    
+    def distribution(self):
+        """
+        Returns:
+            list: (jumlah nutrisi, jumlah baris) urut dari nutrisi terbanyak
+        """
+        return [(int(count), int(self.histogram.counts[count]))
+                for count in self.histogram.nonzero()[::-1]]
+
+
+def write_completeness_report(acc, output_dir, sample=None):
+    """
+    Tulis E. nutrient_completeness_report.txt dan E. nutrient_completeness_summary.csv
+    
+    Args:
+        acc (CompletenessAccumulator): Akumulator yang sudah terisi
+        output_dir (str): Folder output
+        sample (dict): Metadata sampel jika acc dihitung dari sampel (nama file
+            diberi akhiran [SAMPLE] dan header peringatan)
+        
+    Returns:
+        tuple: (path laporan, path summary CSV)
+    """
+    n_rows = acc.n_rows
+    category_stats = acc.category_stats()
+    
+    output_file = report_path(output_dir, "E. nutrient_completeness_report.txt", sample)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("LAPORAN KELENGKAPAN NUTRISI\n")
+        f.write("="*80 + "\n\n")
+        if sample is not None:
+            f.write(sample_notice(sample, "CI_completeness_report.txt"))
+        f.write(f"Total data: {n_rows:,} baris\n")
+        f.write(f"Total nutrisi: {acc.total} kolom\n\n")
+        
+        f.write("KATEGORI KELENGKAPAN:\n")
+        f.write("-"*80 + "\n")
+        for category, (count, mean, min_count, max_count) in category_stats.items():
+            pct = percentage(count, n_rows)
+            f.write(f"\n{category}\n")
+            f.write(f"  Jumlah: {count:,} baris ({pct:.2f}%)\n")
+            f.write(f"  Range: {min_count:.0f} - {max_count:.0f} nutrisi\n")
+            f.write(f"  Rata-rata: {mean:.2f} nutrisi\n")
+        
+        f.write("\n\n" + "="*80 + "\n")
+        f.write("DISTRIBUSI LENGKAP PER JUMLAH NUTRISI:\n")
+        f.write("="*80 + "\n")
+        for count, freq in acc.distribution():
+            pct = (count / acc.total) * 100
+            f.write(f"{count:2d} nutrisi ({pct:5.1f}%): {freq:>10,} baris\n")
+    
+    # Create summary CSV
+    summary_csv = report_path(output_dir, "E. nutrient_completeness_summary.csv", sample)
+    summary_df = pd.DataFrame(
+        [(count, mean, min_count, max_count, mean / acc.total * 100)
+         for count, mean, min_count, max_count in category_stats.values()],
+        index=pd.Index(list(category_stats.keys()), name='completeness_category'),
+        columns=['Total_Rows', 'Avg_Nutrients', 'Min_Nutrients', 'Max_Nutrients', 'Avg_Percentage']
+    ).round(2)
+    summary_df.to_csv(summary_csv)
+    
+    return output_file, summary_csv
+
+
+def analyze_nutrient_completeness(csv_file, output_dir, chunksize=DEFAULT_CHUNKSIZE, progress=None,
+                                  session=None, sample=None):
     """
     Analyze kelengkapan nutrisi per baris dan kategorisasi
+    
+    Data dibaca per chunk dan diakumulasi dengan CompletenessAccumulator,
+    sehingga memori tidak bergantung pada jumlah baris.
+    
+    Args:
+        progress (callable): Opsional, dipanggil progress(baris_diproses) setiap chunk
+        session (DatasetSession): Opsional, pakai kolom & akumulator yang sudah
+            di-memo di session (tanpa membaca ulang csv_file); csv_file harus
+            sama dengan session.source (ValueError jika berbeda)
+        sample (dict): Metadata sampel jika csv_file adalah sampel (laporan diberi label)
+    
+    Returns:
+        CompletenessAccumulator: Akumulator statistik kelengkapan
     """
     print("=" * 80)
     print("ANALISIS KELENGKAPAN NUTRISI")
     print("=" * 80)
     
-    # Load data
+    # Load header
     print(f"\n1. Loading data dari: {csv_file}")
-    print("   (File ~213MB, mohon tunggu...)")
-    df = pd.read_csv(csv_file, low_memory=False)
-    print(f"   ✓ Total baris: {len(df):,}")
-    print(f"   ✓ Total kolom: {len(df.columns)}")
+    if session is not None:
+        session.check_source(csv_file)
+        print(f"   (Memakai data yang sudah di-memo di DatasetSession)")
+        columns = session.columns
+    else:
+        print(f"   (Dibaca per chunk {chunksize:,} baris...)")
+        columns = read_columns(csv_file)
+    print(f"   ✓ Total kolom: {len(columns)}")
     
     # Identify nutrient columns (exclude ID, Name, Food Group)
-    non_nutrient_cols = ['ID', 'Name', 'Food Group']
-    nutrient_cols = [col for col in df.columns if col not in non_nutrient_cols]
+    nutrient_cols = [col for col in columns if col not in NON_NUTRIENT_COLS]
     
     print(f"\n2. Identifikasi kolom nutrisi:")
     print(f"   ✓ Total kolom nutrisi: {len(nutrient_cols)}")
-    print(f"   ✓ Kolom non-nutrisi: {non_nutrient_cols}")
+    print(f"   ✓ Kolom non-nutrisi: {NON_NUTRIENT_COLS}")
     
     # Count non-null nutrients per row
     print(f"\n3. Menghitung kelengkapan nutrisi per baris...")
-    df['nutrient_count'] = df[nutrient_cols].notna().sum(axis=1)
-    df['nutrient_percentage'] = (df['nutrient_count'] / len(nutrient_cols)) * 100
+    if session is not None:
+        acc = session.completeness_accumulator()
+        if progress:
+            progress(acc.n_rows)
+    else:
+        acc = CompletenessAccumulator(nutrient_cols)
+        for chunk in iter_chunks(csv_file, chunksize):
+            acc.update(chunk)
+            if progress:
+                progress(acc.n_rows)
+    n_rows = acc.n_rows
+    total = acc.total
+    print(f"   ✓ Total baris: {n_rows:,}")
     
     # Statistics
     print(f"\n{'='*80}")
     print(f"STATISTIK KELENGKAPAN:")
     print(f"{'='*80}")
-    print(f"Total nutrisi: {len(nutrient_cols)}")
-    print(f"Min nutrisi terisi: {df['nutrient_count'].min():.0f}")
-    print(f"Max nutrisi terisi: {df['nutrient_count'].max():.0f}")
-    print(f"Mean nutrisi terisi: {df['nutrient_count'].mean():.2f}")
-    print(f"Median nutrisi terisi: {df['nutrient_count'].median():.0f}")
-    print(f"Std Dev: {df['nutrient_count'].std():.2f}")
+    print(f"Total nutrisi: {total}")
+    print(f"Min nutrisi terisi: {acc.histogram.min():.0f}")
+    print(f"Max nutrisi terisi: {acc.histogram.max():.0f}")
+    print(f"Mean nutrisi terisi: {acc.histogram.mean():.2f}")
+    print(f"Median nutrisi terisi: {acc.histogram.median():.0f}")
+    print(f"Std Dev: {acc.histogram.std():.2f}")
     
     # Distribution analysis
     print(f"\n{'='*80}")
@@ -54,60 +294,28 @@ def analyze_nutrient_completeness(csv_file, output_dir):
     print(f"{'='*80}")
     
     # Show exact count distribution
-    completeness_dist = df['nutrient_count'].value_counts().sort_index(ascending=False)
-    print(f"\nBaris dengan nutrisi lengkap ({len(nutrient_cols)} nutrisi):")
-    if len(nutrient_cols) in completeness_dist.index:
-        print(f"   ✓ {completeness_dist[len(nutrient_cols)]:,} baris (100% lengkap)")
+    print(f"\nBaris dengan nutrisi lengkap ({total} nutrisi):")
+    if acc.histogram.counts[total] > 0:
+        print(f"   ✓ {acc.histogram.counts[total]:,} baris (100% lengkap)")
     else:
         print(f"   ✗ Tidak ada baris dengan 100% lengkap")
     
     # Top 10 most common completeness levels
     print(f"\nTop 10 level kelengkapan nutrisi:")
-    for i, (count, freq) in enumerate(completeness_dist.head(10).items(), 1):
-        pct = (count / len(nutrient_cols)) * 100
-        print(f"   {i:2d}. {count:2d}/{len(nutrient_cols)} nutrisi ({pct:5.1f}%) - {freq:>8,} baris ({freq/len(df)*100:5.2f}%)")
+    for i, (count, freq) in enumerate(acc.distribution()[:10], 1):
+        pct = (count / total) * 100
+        print(f"   {i:2d}. {count:2d}/{total} nutrisi ({pct:5.1f}%) - {freq:>8,} baris ({percentage(freq, n_rows):5.2f}%)")
     
     # Categorization using meaningful ranges
     print(f"\n{'='*80}")
     print(f"KATEGORISASI OTOMATIS:")
     print(f"{'='*80}")
     
-    # Define categories based on completeness percentage
-    def categorize_completeness(count, total):
-        pct = (count / total) * 100
-        if pct == 100:
-            return "1. PERFECT (100%)"
-        elif pct >= 90:
-            return "2. EXCELLENT (90-99%)"
-        elif pct >= 70:
-            return "3. GOOD (70-89%)"
-        elif pct >= 50:
-            return "4. MODERATE (50-69%)"
-        elif pct >= 30:
-            return "5. LOW (30-49%)"
-        else:
-            return "6. VERY LOW (<30%)"
-    
-    df['completeness_category'] = df['nutrient_count'].apply(
-        lambda x: categorize_completeness(x, len(nutrient_cols))
-    )
-    
-    # Show categorization results
-    category_stats = df.groupby('completeness_category').agg({
-        'nutrient_count': ['count', 'mean', 'min', 'max'],
-        'nutrient_percentage': 'mean'
-    }).round(2)
-    
     print(f"\nHasil Kategorisasi:")
     print(f"-" * 80)
     
-    for category in sorted(df['completeness_category'].unique()):
-        cat_df = df[df['completeness_category'] == category]
-        count = len(cat_df)
-        pct_of_total = count / len(df) * 100
-        avg_nutrients = cat_df['nutrient_count'].mean()
-        min_nutrients = cat_df['nutrient_count'].min()
-        max_nutrients = cat_df['nutrient_count'].max()
+    for category, (count, avg_nutrients, min_nutrients, max_nutrients) in acc.category_stats().items():
+        pct_of_total = percentage(count, n_rows)
         
         print(f"\n{category}")
         print(f"   Jumlah baris: {count:>10,} ({pct_of_total:5.2f}%)")
@@ -115,87 +323,58 @@ def analyze_nutrient_completeness(csv_file, output_dir):
         print(f"   Rata-rata: {avg_nutrients:.2f} nutrisi")
         
         # Show sample foods
-        samples = cat_df['Name'].head(3).tolist()
         print(f"   Contoh makanan:")
-        for i, food in enumerate(samples, 1):
+        for i, (_, food) in enumerate(acc.category_samples[category].items(), 1):
             print(f"      {i}. {food}")
     
     # Additional analysis: Most complete and least complete foods
     print(f"\n{'='*80}")
     print(f"MAKANAN PALING LENGKAP NUTRISINYA:")
     print(f"{'='*80}")
-    most_complete = df.nlargest(10, 'nutrient_count')[['Name', 'nutrient_count', 'nutrient_percentage']]
-    for i, row in enumerate(most_complete.itertuples(), 1):
-        print(f"{i:2d}. {row.Name[:60]:<60} - {row.nutrient_count:.0f}/{len(nutrient_cols)} ({row.nutrient_percentage:.1f}%)")
+    for i, ((count, _), (name, _)) in enumerate(acc.most_complete.items(), 1):
+        print(f"{i:2d}. {name[:60]:<60} - {count:.0f}/{total} ({count / total * 100:.1f}%)")
     
     print(f"\n{'='*80}")
     print(f"MAKANAN PALING TIDAK LENGKAP NUTRISINYA:")
     print(f"{'='*80}")
-    least_complete = df.nsmallest(10, 'nutrient_count')[['Name', 'nutrient_count', 'nutrient_percentage']]
-    for i, row in enumerate(least_complete.itertuples(), 1):
-        print(f"{i:2d}. {row.Name[:60]:<60} - {row.nutrient_count:.0f}/{len(nutrient_cols)} ({row.nutrient_percentage:.1f}%)")
+    for i, ((count, _), (name, _)) in enumerate(acc.least_complete.items(), 1):
+        print(f"{i:2d}. {name[:60]:<60} - {count:.0f}/{total} ({count / total * 100:.1f}%)")
     
-    # Save detailed report
-    output_file = Path(output_dir) / "E. nutrient_completeness_report.txt"
+    # Save detailed report + summary CSV
     print(f"\n{'='*80}")
+    output_file, summary_csv = write_completeness_report(acc, output_dir, sample)
     print(f"Menyimpan laporan detail ke: {output_file}")
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("LAPORAN KELENGKAPAN NUTRISI\n")
-        f.write("="*80 + "\n\n")
-        f.write(f"Total data: {len(df):,} baris\n")
-        f.write(f"Total nutrisi: {len(nutrient_cols)} kolom\n\n")
-        
-        f.write("KATEGORI KELENGKAPAN:\n")
-        f.write("-"*80 + "\n")
-        for category in sorted(df['completeness_category'].unique()):
-            cat_df = df[df['completeness_category'] == category]
-            count = len(cat_df)
-            pct = count / len(df) * 100
-            f.write(f"\n{category}\n")
-            f.write(f"  Jumlah: {count:,} baris ({pct:.2f}%)\n")
-            f.write(f"  Range: {cat_df['nutrient_count'].min():.0f} - {cat_df['nutrient_count'].max():.0f} nutrisi\n")
-            f.write(f"  Rata-rata: {cat_df['nutrient_count'].mean():.2f} nutrisi\n")
-        
-        f.write("\n\n" + "="*80 + "\n")
-        f.write("DISTRIBUSI LENGKAP PER JUMLAH NUTRISI:\n")
-        f.write("="*80 + "\n")
-        for count, freq in completeness_dist.items():
-            pct = (count / len(nutrient_cols)) * 100
-            f.write(f"{count:2d} nutrisi ({pct:5.1f}%): {freq:>10,} baris\n")
-    
     print(f"   ✓ Laporan tersimpan!")
-    
-    # Save categorized data (optional - might be large)
-    # output_csv = Path(output_dir) / "5th_categorized_nutriensFood.csv"
-    # print(f"\nMenyimpan data dengan kategori ke: {output_csv}")
-    # df.to_csv(output_csv, index=False)
-    # print(f"   ✓ Data tersimpan!")
-    
-    # Create summary CSV
-    summary_csv = Path(output_dir) / "E. nutrient_completeness_summary.csv"
-    summary_df = df.groupby('completeness_category').agg({
-        'nutrient_count': ['count', 'mean', 'min', 'max'],
-        'nutrient_percentage': 'mean'
-    }).round(2)
-    summary_df.columns = ['Total_Rows', 'Avg_Nutrients', 'Min_Nutrients', 'Max_Nutrients', 'Avg_Percentage']
-    summary_df.to_csv(summary_csv)
     print(f"\nSummary data tersimpan di: {summary_csv}")
     
     print(f"\n{'='*80}")
     print("✅ ANALISIS SELESAI!")
     print(f"{'='*80}")
     
-    return df
+    return acc
 
 if __name__ == "__main__":
+    import argparse
+    from sample_data import add_sample_arguments, run_on_sample
+    
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', default=None,
+                        help="CSV atau lazy stage view (default: 4th_nutriensFood.csv)")
+    add_sample_arguments(parser)
+    args = parser.parse_args()
+    
     base_dir = Path(__file__).parent.parent
     data_processed = base_dir / "data" / "processed"
     
-    csv_file = data_processed / "4th_nutriensFood.csv"
+    csv_file = Path(args.input) if args.input else data_processed / "4th_nutriensFood.csv"
     
     if not csv_file.exists():
         print(f"❌ Error: File tidak ditemukan: {csv_file}")
         exit(1)
     
-    df = analyze_nutrient_completeness(str(csv_file), str(data_processed))
+    if args.sample is not None:
+        run_on_sample(str(csv_file), 'completeness', frac=args.sample, seed=args.seed,
+                      rebuild=args.rebuild_sample)
+        exit(0)
+    
+    acc = analyze_nutrient_completeness(str(csv_file), str(data_processed))
@@ -0,0 +1,288 @@
+"""
+Script untuk batch rekomendasi menu harian untuk banyak profil user
+Author: Created for Tugas Akhir
+Date: March 6, 2026
+
+Fungsi:
+- Load matriks nutrisi Hard Constraint (HC) sekali ke multiprocessing.shared_memory
+- Sebar profil user (target HC berbeda-beda) ke process pool per batch, dengan
+  jumlah batch in-flight dibatasi (memori tidak bergantung jumlah profil)
+- Worker membaca matriks tanpa copy (zero-copy), juga tanpa copy per profil
+- Hasil ditulis streaming ke CSV
+- Laporan throughput (profil/detik) untuk beberapa jumlah worker
+
+Format file profil (CSV):
+    profile_id,Calories,Protein (g),Fat (g),...
+Kolom target boleh subset dari HARD_CONSTRAINTS; sel kosong = tidak ditarget.
+"""
+
+import argparse
+import csv
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analyze_hc_sc import HARD_CONSTRAINTS, HIGH_QUALITY_HC
+from streaming_stats import DEFAULT_CHUNKSIZE, iter_chunks
+
+DEFAULT_MENU_SIZE = 5
+# Profil per task worker, dan batas task in-flight per worker (backpressure pembacaan profil)
+BATCH_SIZE = 64
+MAX_PENDING_PER_WORKER = 4
+
+# Di-set oleh _init_worker di setiap proses worker
+_WORKER = {}
+
+
+def load_food_matrix(csv_file, min_hc=HIGH_QUALITY_HC, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Load matriks HC (per 100 g) untuk makanan dengan minimal min_hc nutrisi HC terisi
+
+    Nilai HC yang kosong diisi 0 (makanan dianggap tidak menyumbang nutrisi tsb).
+
+    Args:
+        csv_file (str): Path ke 4th_nutriensFood.csv
+        min_hc (int): Minimal jumlah HC terisi supaya makanan jadi kandidat
+        chunksize (int): Jumlah baris per chunk
+
+    Returns:
+        tuple: (ids np.ndarray int64, names list, food groups np.ndarray object,
+                matrix np.ndarray float32 [n_food, n_hc])
+    """
+    ids, names, groups, blocks = [], [], [], []
+    for chunk in iter_chunks(csv_file, chunksize):
+        values = chunk[HARD_CONSTRAINTS]
+        keep = values.notna().sum(axis=1) >= min_hc
+        ids.append(chunk.loc[keep, 'ID'].to_numpy(dtype=np.int64))
+        names.extend(chunk.loc[keep, 'Name'].astype(str).tolist())
+        groups.append(chunk.loc[keep, 'Food Group'].fillna('').astype(str).to_numpy(dtype=object))
+        blocks.append(values[keep].fillna(0).to_numpy(dtype=np.float32))
+
+    if not blocks:
+        return (np.empty(0, dtype=np.int64), [], np.empty(0, dtype=object),
+                np.empty((0, len(HARD_CONSTRAINTS)), dtype=np.float32))
+    return np.concatenate(ids), names, np.concatenate(groups), np.vstack(blocks)
+
+
+class SharedFoodMatrix:
+    """
+    Matriks nutrisi di shared memory supaya bisa dibaca semua worker tanpa copy
+
+    Disimpan column-major (order='F'): recommend_menu membaca per kolom nutrisi,
+    jadi setiap kolom contiguous di memori.
+    """
+
+    def __init__(self, matrix):
+        matrix = np.asfortranarray(matrix, dtype=np.float32)
+        self.shape = matrix.shape
+        self.dtype = matrix.dtype.str
+        self.shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        view = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf, order='F')
+        view[:] = matrix
+
+    @property
+    def spec(self):
+        """
+        Info yang dikirim ke worker untuk attach (hanya nama + shape, bukan data)
+        """
+        return {'name': self.shm.name, 'shape': self.shape, 'dtype': self.dtype}
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(spec, n_items):
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    _WORKER['shm'] = shm  # simpan referensi supaya buffer tidak di-GC
+    _WORKER['matrix'] = np.ndarray(spec['shape'], dtype=spec['dtype'], buffer=shm.buf, order='F')
+    _WORKER['n_items'] = n_items
+
+
+def recommend_menu(matrix, targets, n_items=DEFAULT_MENU_SIZE):
+    """
+    Pilih menu (porsi 100 g per item) secara greedy mendekati target HC
+
+    Setiap langkah memilih makanan yang paling menurunkan error relatif kuadrat
+    sum(((total - target) / target)^2) pada nutrisi yang ditarget. Skor dihitung
+    per kolom yang ditarget, sehingga matriks tidak pernah di-copy / di-scale utuh
+    (memori tambahan per profil O(n_food)).
+
+    Args:
+        matrix (np.ndarray): Matriks nutrisi [n_food, n_hc]
+        targets (np.ndarray): Target per HC (NaN = tidak ditarget)
+        n_items (int): Jumlah item maksimal di menu
+
+    Returns:
+        tuple: (list index baris terpilih, error relatif akhir)
+    """
+    mask = ~np.isnan(targets) & (targets > 0)
+    if not mask.any() or len(matrix) == 0:
+        return [], 0.0
+
+    cols = np.flatnonzero(mask)
+    current = np.zeros(len(cols), dtype=np.float64)  # total relatif terhadap target
+    error = float(((current - 1) ** 2).sum())
+    chosen = []
+    scores = np.empty(len(matrix), dtype=np.float64)
+    diff = np.empty(len(matrix), dtype=np.float64)
+    for _ in range(n_items):
+        scores[:] = 0
+        for k, col in enumerate(cols):
+            np.divide(matrix[:, col], targets[col], out=diff)
+            diff += current[k] - 1
+            scores += np.square(diff, out=diff)
+        scores[chosen] = np.inf
+        best = int(np.argmin(scores))
+        if scores[best] >= error:
+            break
+        chosen.append(best)
+        current += matrix[best, cols] / targets[cols]
+        error = float(scores[best])
+    return chosen, error
+
+
+def _recommend_for_batch(jobs):
+    results = []
+    for profile_id, targets in jobs:
+        chosen, error = recommend_menu(_WORKER['matrix'], targets, _WORKER['n_items'])
+        results.append((profile_id, chosen, error))
+    return results
+
+
+def iter_profiles(profiles_csv, chunksize=10_000):
+    """
+    Baca profil user per chunk -> (profile_id, vektor target HC)
+    """
+    for chunk in pd.read_csv(profiles_csv, chunksize=chunksize):
+        if not any(col in chunk.columns for col in HARD_CONSTRAINTS):
+            raise ValueError(f"File profil tidak punya kolom target HC: {profiles_csv}")
+        targets = chunk.reindex(columns=HARD_CONSTRAINTS).to_numpy(dtype=np.float64)
+        for profile_id, row in zip(chunk['profile_id'].astype(str), targets):
+            yield profile_id, row
+
+
+def run_batch(shared, ids, names, profiles_csv, output_csv, workers, n_items=DEFAULT_MENU_SIZE):
+    """
+    Jalankan rekomendasi untuk semua profil dengan process pool
+
+    Profil dibaca lazy dan dikirim per batch; paling banyak
+    workers * MAX_PENDING_PER_WORKER batch in-flight, hasil ditulis sesuai urutan profil.
+
+    Args:
+        shared (SharedFoodMatrix): Matriks nutrisi di shared memory
+        ids (np.ndarray): ID makanan (urutan sama dengan baris matriks)
+        names (list): Nama makanan
+        profiles_csv (str): Path file profil
+        output_csv (str): Path output (ditulis streaming)
+        workers (int): Jumlah proses worker
+        n_items (int): Jumlah item per menu
+
+    Returns:
+        tuple: (jumlah profil, durasi detik)
+    """
+    start = time.perf_counter()
+    n_profiles = 0
+    with open(output_csv, 'w', newline='', encoding='utf-8') as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(shared.spec, n_items)) as pool:
+        writer = csv.writer(f)
+        writer.writerow(['profile_id', 'rank', 'ID', 'Name', 'relative_error'])
+        profiles = iter_profiles(profiles_csv)
+        pending = deque()
+        while True:
+            while len(pending) < workers * MAX_PENDING_PER_WORKER:
+                batch = list(islice(profiles, BATCH_SIZE))
+                if not batch:
+                    break
+                pending.append(pool.submit(_recommend_for_batch, batch))
+            if not pending:
+                break
+            for profile_id, chosen, error in pending.popleft().result():
+                for rank, row in enumerate(chosen, 1):
+                    writer.writerow([profile_id, rank, ids[row], names[row], f"{error:.4f}"])
+                n_profiles += 1
+    return n_profiles, time.perf_counter() - start
+
+
+def batch_recommend(csv_file, profiles_csv, output_csv, workers_list=(1,),
+                    min_hc=HIGH_QUALITY_HC, n_items=DEFAULT_MENU_SIZE):
+    """
+    Load matriks nutrisi sekali, lalu jalankan batch untuk tiap jumlah worker
+
+    Returns:
+        list: (workers, jumlah profil, durasi, profil/detik) per run
+    """
+    print("=" * 80)
+    print("BATCH REKOMENDASI MENU (SHARED MEMORY)")
+    print("=" * 80)
+
+    print(f"\n1. Loading matriks nutrisi dari: {csv_file}")
+    ids, names, _, matrix = load_food_matrix(csv_file, min_hc)
+    print(f"   ✓ Kandidat makanan (HC ≥ {min_hc}): {len(ids):,}")
+    print(f"   ✓ Ukuran matriks: {matrix.nbytes / (1024 * 1024):.2f} MB (di-share, tidak di-copy)")
+
+    print(f"\n2. Menjalankan batch untuk profil dari: {profiles_csv}")
+    runs = []
+    with SharedFoodMatrix(matrix) as shared:
+        del matrix  # data sudah ada di shared memory
+        for workers in workers_list:
+            n_profiles, duration = run_batch(shared, ids, names, profiles_csv,
+                                             output_csv, workers, n_items)
+            rate = n_profiles / duration if duration > 0 else float('inf')
+            runs.append((workers, n_profiles, duration, rate))
+            print(f"   ✓ {workers:2d} worker: {n_profiles:,} profil dalam {duration:.2f} detik "
+                  f"({rate:,.1f} profil/detik)")
+
+    print(f"\n{'='*80}")
+    print("SCALING:")
+    print(f"{'='*80}")
+    print(f"{'Workers':>8} | {'Profil':>10} | {'Detik':>8} | {'Profil/detik':>13} | {'Speedup':>8}")
+    base_rate = runs[0][3] if runs else 0
+    for workers, n_profiles, duration, rate in runs:
+        speedup = rate / base_rate if base_rate else 0
+        print(f"{workers:>8} | {n_profiles:>10,} | {duration:>8.2f} | {rate:>13,.1f} | {speedup:>7.2f}x")
+
+    print(f"\nHasil tersimpan di: {output_csv}")
+    print("\n✅ Batch selesai!")
+    return runs
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+
+    parser = argparse.ArgumentParser(description="Batch rekomendasi menu untuk banyak profil user")
+    parser.add_argument('profiles', help="CSV profil user (profile_id + kolom target HC)")
+    parser.add_argument('--output', default=str(data_processed / "batch_menus.csv"))
+    parser.add_argument('--workers', default="1",
+                        help="Jumlah worker, bisa daftar untuk uji scaling (mis. 1,2,4,8)")
+    parser.add_argument('--min-hc', type=int, default=HIGH_QUALITY_HC)
+    parser.add_argument('--items', type=int, default=DEFAULT_MENU_SIZE)
+    args = parser.parse_args()
+
+    csv_file = data_processed / "4th_nutriensFood.csv"
+
+    if not csv_file.exists():
+        print(f"❌ Error: File tidak ditemukan: {csv_file}")
+        exit(1)
+
+    if not Path(args.profiles).exists():
+        print(f"❌ Error: File tidak ditemukan: {args.profiles}")
+        exit(1)
+
+    workers_list = [int(w) for w in args.workers.split(',')]
+    batch_recommend(str(csv_file), args.profiles, args.output, workers_list,
+                    args.min_hc, args.items)
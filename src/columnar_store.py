@@ -0,0 +1,397 @@
+"""
+Columnar store + lazy stage view (selection bitmap + daftar kolom)
+Author: Created for Tugas Akhir
+Date: March 13, 2026
+
+Daripada setiap stage menulis copy CSV baru (3rd_halalFood.csv 117 kolom,
+4th_nutriensFood.csv 37 kolom), stage bisa menulis "view":
+- base store: 1st_CleanedRawNutriens.csv dikonversi sekali ke file per kolom
+  (numerik: int64/float64 mentah, bisa di-memmap; teks: UTF-8 blob + offsets)
+- view: folder kecil berisi view.json (path base store + daftar kolom) dan
+  selection.npy (bitmap baris terpilih, np.packbits)
+
+Pembaca (analyzer) me-resolve view secara lazy per chunk, hanya kolom yang
+dibutuhkan. Materialisasi penuh hanya saat export_csv() dipanggil.
+
+Store mencatat ukuran + mtime CSV sumber. Jika CSV sumber berubah setelah build
+(mis. delta di-append oleh ingest_delta.py), store dan semua view di atasnya
+menolak dibuka sampai store di-build ulang (StaleStoreError).
+
+Usage:
+    python src/columnar_store.py build                 # buat base store
+    python src/columnar_store.py export VIEW OUT.csv   # materialisasi view ke CSV
+"""
+
+import argparse
+import json
+import mmap
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = "schema.json"
+VIEW_FILE = "view.json"
+SELECTION_FILE = "selection.npy"
+DEFAULT_CHUNKSIZE = 200_000
+
+# kind -> (ekstensi file, dtype) untuk kolom numerik
+NUMERIC_KINDS = {
+    'int': ('i8', np.int64),
+    'float': ('f8', np.float64),
+}
+# Tipe hasil scan_kinds -> kind kolom di store
+STORE_KINDS = {'int': 'int', 'float': 'float', 'empty': 'float', 'object': 'text'}
+
+
+def column_kinds(df):
+    """
+    Tipe tiap kolom seperti hasil inferensi pd.read_csv:
+    'int', 'float', 'object' (teks / campuran) atau 'empty' (semua NaN)
+    """
+    kinds = {}
+    for col in df.columns:
+        series = df[col]
+        if series.isna().all():
+            kinds[col] = 'empty'
+        elif pd.api.types.is_bool_dtype(series):
+            kinds[col] = 'object'
+        elif pd.api.types.is_integer_dtype(series):
+            kinds[col] = 'int'
+        elif pd.api.types.is_numeric_dtype(series):
+            kinds[col] = 'float'
+        else:
+            kinds[col] = 'object'
+    return kinds
+
+
+def merge_kind(a, b):
+    """
+    Tipe kolom gabungan dua bagian file (int + NaN -> float, angka + teks -> object)
+    """
+    if a == b:
+        return a
+    if 'object' in (a, b):
+        return 'object'
+    return 'float'  # int+float, int+empty, float+empty
+
+
+def scan_kinds(csv_file, usecols=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Tipe kolom seluruh file (per chunk, lalu digabung)
+
+    Returns:
+        tuple: (jumlah baris, dict kolom -> tipe)
+    """
+    n_rows, kinds = 0, None
+    for chunk in pd.read_csv(csv_file, usecols=usecols, low_memory=False, chunksize=chunksize):
+        chunk_kinds = column_kinds(chunk)
+        kinds = chunk_kinds if kinds is None else {col: merge_kind(kinds[col], chunk_kinds[col])
+                                                   for col in kinds}
+        n_rows += len(chunk)
+    if kinds is None:
+        kinds = {col: 'empty' for col in pd.read_csv(csv_file, usecols=usecols, nrows=0).columns}
+    return n_rows, kinds
+
+
+class StaleStoreError(ValueError):
+    """
+    CSV sumber berubah sejak base store di-build (store / view sudah basi)
+    """
+
+
+def source_signature(csv_file):
+    """
+    Signature CSV sumber: [ukuran, mtime_ns]
+    """
+    stat = os.stat(csv_file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def is_view(path):
+    """
+    Cek apakah path adalah folder view (atau base store)
+    """
+    path = Path(path)
+    return path.is_dir() and ((path / VIEW_FILE).exists() or (path / SCHEMA_FILE).exists())
+
+
+class ColumnarStore:
+    """
+    Base store: satu file per kolom, ditulis sekali dari CSV mentah
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / SCHEMA_FILE, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        self.source = schema['source']
+        if schema.get('source_signature') is None:
+            raise StaleStoreError(f"Base store {self.store_dir} tidak mencatat signature sumber; build ulang store")
+        if Path(self.source).exists() and source_signature(self.source) != schema['source_signature']:
+            raise StaleStoreError(f"{self.source} berubah sejak base store {self.store_dir} di-build; "
+                                  f"build ulang store lalu buat ulang view-nya")
+        self.n_rows = schema['n_rows']
+        self.columns = [col['name'] for col in schema['columns']]
+        self._specs = {col['name']: col for col in schema['columns']}
+
+    @classmethod
+    def build(cls, csv_file, store_dir, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Konversi CSV ke columnar store (per chunk, dua pass)
+
+        Pass pertama menentukan tipe kolom dari seluruh file (scan_kinds), sama
+        seperti pd.read_csv membaca file utuh: int (tanpa NaN), float (angka
+        dengan NaN / kolom kosong) atau text. Pass kedua menulis file per kolom.
+
+        Args:
+            csv_file (str): Path ke CSV sumber
+            store_dir (str): Folder tujuan
+            chunksize (int): Jumlah baris per chunk
+
+        Returns:
+            ColumnarStore
+        """
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+
+        signature = source_signature(csv_file)
+        _, kinds = scan_kinds(csv_file, chunksize=chunksize)
+        specs, handles = [], {}
+        offsets = {}
+        n_rows = 0
+        try:
+            for i, (col, kind) in enumerate(kinds.items()):
+                spec = {'name': col, 'kind': STORE_KINDS[kind], 'file': f"c{i:03d}"}
+                specs.append(spec)
+                if spec['kind'] in NUMERIC_KINDS:
+                    handles[col] = [open(store_dir / f"{spec['file']}.{NUMERIC_KINDS[spec['kind']][0]}", 'wb')]
+                else:
+                    handles[col] = [open(store_dir / f"{spec['file']}.data", 'wb'),
+                                    open(store_dir / f"{spec['file']}.offsets", 'wb'),
+                                    open(store_dir / f"{spec['file']}.null", 'wb')]
+                    handles[col][1].write(np.zeros(1, dtype=np.int64).tobytes())
+                    offsets[col] = 0
+
+            # Kolom text dibaca sebagai string apa adanya (chunk yang kebetulan hanya berisi angka tidak jadi float)
+            text_cols = {spec['name']: str for spec in specs if spec['kind'] == 'text'}
+            for chunk in pd.read_csv(csv_file, dtype=text_cols, low_memory=False, chunksize=chunksize):
+                for spec in specs:
+                    col = spec['name']
+                    if spec['kind'] in NUMERIC_KINDS:
+                        values = pd.to_numeric(chunk[col]).to_numpy(dtype=NUMERIC_KINDS[spec['kind']][1])
+                        handles[col][0].write(values.tobytes())
+                    else:
+                        series = chunk[col]
+                        null = series.isna().to_numpy()
+                        encoded = [b'' if is_null else str(value).encode('utf-8')
+                                   for value, is_null in zip(series.tolist(), null)]
+                        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+                        ends = offsets[col] + np.cumsum(lengths)
+                        handles[col][0].write(b''.join(encoded))
+                        handles[col][1].write(ends.tobytes())
+                        handles[col][2].write(null.astype(np.uint8).tobytes())
+                        if len(ends):
+                            offsets[col] = int(ends[-1])
+                n_rows += len(chunk)
+        finally:
+            for files in handles.values():
+                for handle in files:
+                    handle.close()
+
+        with open(store_dir / SCHEMA_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'source': str(Path(csv_file).resolve()), 'source_signature': signature,
+                       'n_rows': n_rows, 'columns': specs}, f, indent=2)
+        return cls(store_dir)
+
+    def read(self, column, rows=None):
+        """
+        Baca satu kolom (opsional hanya baris tertentu)
+
+        Args:
+            column (str): Nama kolom
+            rows (np.ndarray): Index baris (None = semua)
+
+        Returns:
+            np.ndarray: int64 / float64 untuk kolom numerik, object (str / None) untuk teks
+        """
+        spec = self._specs[column]
+        base = self.store_dir / spec['file']
+        if spec['kind'] in NUMERIC_KINDS:
+            suffix, dtype = NUMERIC_KINDS[spec['kind']]
+            values = np.memmap(f"{base}.{suffix}", dtype=dtype, mode='r', shape=(self.n_rows,))
+            return np.array(values if rows is None else values[rows])
+
+        if rows is None:
+            rows = np.arange(self.n_rows)
+        offsets = np.memmap(f"{base}.offsets", dtype=np.int64, mode='r', shape=(self.n_rows + 1,))
+        null = np.memmap(f"{base}.null", dtype=np.uint8, mode='r', shape=(self.n_rows,))
+        starts, ends = offsets[rows], offsets[rows + 1]
+        result = np.empty(len(rows), dtype=object)
+        with open(f"{base}.data", 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b''
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for i, (start, end, is_null) in enumerate(zip(starts, ends, null[rows])):
+                    result[i] = None if is_null else data[start:end].decode('utf-8')
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+        return result
+
+
+class StageView:
+    """
+    Hasil stage yang lazy: bitmap baris terpilih + daftar kolom di atas base store
+    """
+
+    def __init__(self, store, columns=None, selection=None):
+        self.store = store
+        self.columns = list(columns) if columns is not None else list(store.columns)
+        missing = [col for col in self.columns if col not in store.columns]
+        if missing:
+            raise KeyError(f"Kolom tidak ada di base store: {missing}")
+        # selection: bool array panjang store.n_rows (None = semua baris)
+        self.selection = selection
+        self._rows = None
+
+    @classmethod
+    def from_store(cls, store_dir):
+        return cls(ColumnarStore(store_dir))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load view dari folder (atau base store langsung = semua baris & kolom)
+        """
+        path = Path(path)
+        if (path / SCHEMA_FILE).exists():
+            return cls.from_store(path)
+        with open(path / VIEW_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        store = ColumnarStore((path / meta['store']).resolve())
+        selection = None
+        if meta['selection']:
+            packed = np.load(path / SELECTION_FILE)
+            selection = np.unpackbits(packed, count=store.n_rows).astype(bool)
+        return cls(store, meta['columns'], selection)
+
+    def save(self, path):
+        """
+        Simpan view (hanya metadata + bitmap, ukuran ~n_rows/8 byte)
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        if self.selection is not None:
+            np.save(path / SELECTION_FILE, np.packbits(self.selection))
+        elif (path / SELECTION_FILE).exists():
+            (path / SELECTION_FILE).unlink()
+        store_ref = Path(os.path.relpath(Path(self.store.store_dir).resolve(), path.resolve())).as_posix()
+        with open(path / VIEW_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'store': store_ref, 'columns': self.columns,
+                       'selection': self.selection is not None,
+                       'n_rows': self.n_rows}, f, indent=2)
+        return path
+
+    @property
+    def rows(self):
+        """
+        Index baris base store yang terpilih
+        """
+        if self._rows is None:
+            self._rows = (np.arange(self.store.n_rows) if self.selection is None
+                          else np.flatnonzero(self.selection))
+        return self._rows
+
+    @property
+    def n_rows(self):
+        return self.store.n_rows if self.selection is None else int(self.selection.sum())
+
+    def select(self, mask):
+        """
+        View baru dengan filter baris tambahan
+
+        Args:
+            mask (np.ndarray): bool per baris view ini (panjang n_rows)
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != self.n_rows:
+            raise ValueError(f"Panjang mask {len(mask)} != jumlah baris view {self.n_rows}")
+        selection = np.zeros(self.store.n_rows, dtype=bool)
+        selection[self.rows[mask]] = True
+        return StageView(self.store, self.columns, selection)
+
+    def project(self, columns):
+        """
+        View baru dengan subset kolom (urutan mengikuti argumen)
+        """
+        missing = [col for col in columns if col not in self.columns]
+        if missing:
+            raise KeyError(f"Kolom tidak ada di view: {missing}")
+        return StageView(self.store, columns, self.selection)
+
+    def column(self, name):
+        if name not in self.columns:
+            raise KeyError(name)
+        return self.store.read(name, self.rows)
+
+    def iter_chunks(self, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+        """
+        Resolve view per chunk (index = posisi baris di view, sama seperti CSV hasil export)
+        """
+        columns = self.columns if columns is None else columns
+        rows = self.rows
+        for start in range(0, len(rows), chunksize):
+            chunk_rows = rows[start:start + chunksize]
+            yield pd.DataFrame({col: self.store.read(col, chunk_rows) for col in columns},
+                               index=pd.RangeIndex(start, start + len(chunk_rows)))
+
+    def to_frame(self, columns=None):
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({col: self.store.read(col, self.rows) for col in columns})
+
+    def export_csv(self, csv_file, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Materialisasi penuh ke CSV (hanya jika benar-benar dibutuhkan)
+        """
+        header = True
+        for chunk in self.iter_chunks(chunksize):
+            chunk.to_csv(csv_file, mode='w' if header else 'a', header=header, index=False)
+            header = False
+        if header:
+            pd.DataFrame(columns=self.columns).to_csv(csv_file, index=False)
+        return csv_file
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+
+    parser = argparse.ArgumentParser(description="Columnar store untuk lazy stage output")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Buat base store dari CSV mentah")
+    build_parser.add_argument('--input', default=str(data_processed / "1st_CleanedRawNutriens.csv"))
+    build_parser.add_argument('--store', default=str(data_processed / "store"))
+    export_parser = subparsers.add_parser('export', help="Materialisasi view ke CSV")
+    export_parser.add_argument('view')
+    export_parser.add_argument('output')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        if not Path(args.input).exists():
+            print(f"❌ Error: File tidak ditemukan: {args.input}")
+            exit(1)
+        print(f"Membuat base store dari: {args.input}")
+        store = ColumnarStore.build(args.input, args.store)
+        print(f"✓ {store.n_rows:,} baris, {len(store.columns)} kolom -> {args.store}")
+    else:
+        try:
+            view = StageView.load(args.view)
+        except StaleStoreError as e:
+            print(f"❌ Error: {e}")
+            exit(1)
+        view.export_csv(args.output)
+        print(f"✓ {view.n_rows:,} baris, {len(view.columns)} kolom -> {args.output}")
@@ -0,0 +1,177 @@
+"""
+Session dataset dengan memo kolom turunan (untuk notebook dan analyzer)
+Author: Created for Tugas Akhir
+Date: March 27, 2026
+
+Fungsi:
+- Load tabel nutrisi (CSV atau lazy stage view) sekali per session
+- Memo kolom turunan: nutrient_count, HC_count, SC_count, daftar kolom HC / SC,
+  view terurut (sorted_by) dan akumulator kelengkapan / HC-SC
+- Semua memo otomatis di-invalidate jika sumber berubah (size / mtime file; untuk
+  view termasuk file base store-nya)
+
+Contoh (notebook):
+    session = DatasetSession("data/processed/4th_nutriensFood.csv")
+    session.counts                                  # HC_count, SC_count, nutrient_count
+    session.sorted_by(['HC_count', 'SC_count'], ascending=False)
+    analyze_nutrient_completeness(session.source, out_dir, session=session)
+    analyze_hard_soft_constraints(session.source, out_dir, session=session)  # tanpa baca ulang
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from analyze_hc_sc import HARD_CONSTRAINTS, NON_NUTRIENT_COLS, HCSCAccumulator
+from analyze_nutrient_completeness import CompletenessAccumulator
+from columnar_store import VIEW_FILE
+from streaming_stats import DEFAULT_CHUNKSIZE, iter_chunks, read_columns
+
+COUNT_COLS = ['HC_count', 'SC_count', 'nutrient_count']
+
+
+class DatasetSession:
+    """
+    Tabel nutrisi + memo kolom turunan, di-invalidate saat sumber berubah
+
+    Args:
+        source (str): Path CSV atau folder lazy stage view
+        chunksize (int): Jumlah baris per chunk saat load
+    """
+
+    def __init__(self, source, chunksize=DEFAULT_CHUNKSIZE):
+        self.source = str(source)
+        self.chunksize = chunksize
+        self._memo = {}
+        self._signature = None
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _source_signature(self):
+        # Stat cukup (mikrodetik); untuk view, stat file di folder view + folder base store
+        path = Path(self.source)
+        if not path.is_dir():
+            files = [path]
+        else:
+            files = sorted(path.iterdir())
+            if (path / VIEW_FILE).exists():
+                with open(path / VIEW_FILE, 'r', encoding='utf-8') as f:
+                    store_dir = (path / json.load(f)['store']).resolve()
+                files += sorted(store_dir.iterdir())
+        return tuple((str(file), os.stat(file).st_size, os.stat(file).st_mtime_ns) for file in files)
+
+    def _memoized(self, key, compute):
+        signature = self._source_signature()
+        if signature != self._signature:
+            if self._memo:
+                self.stats['invalidations'] += 1
+            self._memo.clear()
+            self._signature = signature
+        if key in self._memo:
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def invalidate(self):
+        """
+        Hapus semua memo (dipanggil otomatis jika sumber berubah)
+        """
+        self._memo.clear()
+        self._signature = None
+
+    @property
+    def columns(self):
+        return self._memoized('columns', lambda: read_columns(self.source))
+
+    @property
+    def nutrient_cols(self):
+        return self._memoized('nutrient_cols',
+                              lambda: [col for col in self.columns if col not in NON_NUTRIENT_COLS])
+
+    @property
+    def hard_constraints(self):
+        return list(HARD_CONSTRAINTS)
+
+    @property
+    def soft_constraints(self):
+        return self._memoized('soft_constraints',
+                              lambda: [col for col in self.nutrient_cols if col not in HARD_CONSTRAINTS])
+
+    @property
+    def frame(self):
+        """
+        Tabel lengkap (index = row id global). Jangan diubah in-place: dipakai bersama memo lain.
+        Sumber tanpa baris -> DataFrame kosong dengan kolom sumber.
+        """
+        def compute():
+            chunks = list(iter_chunks(self.source, self.chunksize))
+            return pd.concat(chunks) if chunks else pd.DataFrame(columns=self.columns)
+        return self._memoized('frame', compute)
+
+    @property
+    def counts(self):
+        """
+        Returns:
+            pd.DataFrame: HC_count, SC_count, nutrient_count per baris
+        """
+        def compute():
+            frame = self.frame
+            hc = frame[self.hard_constraints].notna().sum(axis=1)
+            sc = frame[self.soft_constraints].notna().sum(axis=1)
+            return pd.DataFrame({'HC_count': hc, 'SC_count': sc, 'nutrient_count': hc + sc})
+        return self._memoized('counts', compute)
+
+    def with_counts(self):
+        """
+        Tabel + kolom HC_count, SC_count, nutrient_count
+        """
+        return self._memoized('with_counts', lambda: pd.concat([self.frame, self.counts], axis=1))
+
+    def sorted_by(self, by, ascending=True):
+        """
+        View terurut (memo per kombinasi kolom + arah), boleh memakai kolom count
+
+        Args:
+            by (str / list): Kolom pengurutan
+            ascending (bool / list): Arah pengurutan
+
+        Returns:
+            pd.DataFrame
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+        key = ('sorted', tuple(by), tuple(ascending))
+        return self._memoized(key, lambda: self.with_counts().sort_values(by, ascending=ascending,
+                                                                          kind='stable'))
+
+    def completeness_accumulator(self):
+        """
+        CompletenessAccumulator dari nutrient_count yang sudah di-memo
+        """
+        def compute():
+            acc = CompletenessAccumulator(self.nutrient_cols)
+            return acc.update(self.frame, counts=self.counts['nutrient_count'])
+        return self._memoized('completeness', compute)
+
+    def hc_sc_accumulator(self):
+        """
+        HCSCAccumulator dari HC_count / SC_count yang sudah di-memo
+        """
+        def compute():
+            acc = HCSCAccumulator(self.hard_constraints, self.soft_constraints)
+            counts = self.counts
+            return acc.update(self.frame, hc_counts=counts['HC_count'], sc_counts=counts['SC_count'])
+        return self._memoized('hc_sc', compute)
+
+    def check_source(self, csv_file):
+        """
+        Pastikan csv_file yang diberikan ke analyzer sama dengan sumber session
+
+        Raises:
+            ValueError: Jika berbeda (analyzer akan memakai data session, bukan csv_file)
+        """
+        if Path(csv_file).resolve() != Path(self.source).resolve():
+            raise ValueError(f"csv_file ({csv_file}) berbeda dengan sumber session ({self.source})")
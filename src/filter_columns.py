@@ -8,6 +8,8 @@ Date: February 25, 2026
 import pandas as pd
 from pathlib import Path
 
+from columnar_store import StageView
+
 def filter_columns(input_csv, nutrient_list_file, output_csv):
     """
     Filter kolom CSV, keep hanya kolom yang ada di nutrient list
@@ -77,10 +79,56 @@ def filter_columns(input_csv, nutrient_list_file, output_csv):
     
     return df
 
+def filter_columns_view(input_view, nutrient_list_file, output_view):
+    """
+    Versi lazy dari filter_columns: hanya mengganti daftar kolom di view,
+    tanpa membaca atau menyalin data
+    
+    Args:
+        input_view (str): Path ke view (mis. 3rd_halalFood.view)
+        nutrient_list_file (str): Path ke listNutriens.txt
+        output_view (str): Path folder view output (mis. 4th_nutriensFood.view)
+        
+    Returns:
+        StageView: View dengan kolom nutrisi saja
+    """
+    print("=" * 70)
+    print("FILTERING KOLOM NUTRISI (LAZY VIEW)")
+    print("=" * 70)
+    
+    with open(nutrient_list_file, 'r', encoding='utf-8') as f:
+        desired_columns = [line.strip() for line in f if line.strip()]
+    
+    view = StageView.load(input_view).project(desired_columns)
+    view.save(output_view)
+    
+    print(f"\n   ✓ Kolom dipertahankan: {len(desired_columns)}")
+    print(f"   ✓ Total baris: {view.n_rows:,}")
+    print(f"   ✓ View tersimpan di: {output_view}")
+    print("\n✅ Filtering kolom selesai (tanpa copy data)!")
+    
+    return view
+
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lazy', action='store_true',
+                        help="Input/output berupa view di atas base store, bukan copy CSV")
+    args = parser.parse_args()
+    
     base_dir = Path(__file__).parent.parent
     data_processed = base_dir / "data" / "processed"
     
+    if args.lazy:
+        input_view = data_processed / "3rd_halalFood.view"
+        if not input_view.exists():
+            print(f"❌ Error: View tidak ditemukan: {input_view}")
+            exit(1)
+        filter_columns_view(str(input_view), str(data_processed / "C. listNutriens.txt"),
+                            str(data_processed / "4th_nutriensFood.view"))
+        exit(0)
+    
     input_csv = data_processed / "3rd_halalFood.csv"
     nutrient_list = data_processed / "C. listNutriens.txt"
     output_csv = data_processed / "4th_nutriensFood.csv"
@@ -7,12 +7,16 @@ Fungsi:
 - Membaca list kata haram dari file txt
 - Filter menu makanan yang mengandung minimal 1 kata haram dalam nama
 - Simpan hasil ke file baru (tanpa makanan haram)
+- Mode --lazy: simpan view (bitmap baris halal) di atas base store
 """
 
 import pandas as pd
+import numpy as np
 import os
 from pathlib import Path
 
+from columnar_store import StageView
+
 def load_haram_words(file_path):
     """
     Load list kata haram dari file txt
@@ -124,11 +128,66 @@ def filter_haram_foods(input_csv, haram_list_txt, output_csv):
     
     return df_halal
 
+def filter_haram_view(input_path, haram_list_txt, output_view):
+    """
+    Versi lazy dari filter_haram_foods: hanya kolom Name yang dibaca, hasilnya
+    berupa view (bitmap baris halal) di atas base store, bukan copy CSV
+    
+    Args:
+        input_path (str): Path ke base store / view
+        haram_list_txt (str): Path ke listHaram.txt
+        output_view (str): Path folder view output (mis. 3rd_halalFood.view)
+        
+    Returns:
+        StageView: View berisi baris halal saja
+    """
+    print("=" * 60)
+    print("FILTERING MAKANAN HARAM (LAZY VIEW)")
+    print("=" * 60)
+    
+    haram_words = load_haram_words(haram_list_txt)
+    print(f"\n1. Total kata haram: {len(haram_words)}")
+    
+    view = StageView.load(input_path)
+    names = view.column('Name')
+    print(f"\n2. Kolom Name dimuat dari: {input_path} ({len(names):,} baris)")
+    
+    is_haram = np.fromiter((contains_haram_word(name, haram_words) for name in names),
+                           dtype=bool, count=len(names))
+    haram_count = int(is_haram.sum())
+    initial_count = len(names)
+    halal_view = view.select(~is_haram)
+    halal_view.save(output_view)
+    
+    print(f"\n3. Menyimpan view ke: {output_view}")
+    print(f"   ✓ Makanan HARAM (dihapus): {haram_count:,} ({haram_count/initial_count*100:.2f}%)")
+    print(f"   ✓ Makanan HALAL (disimpan): {halal_view.n_rows:,}")
+    print("\n✅ Filtering selesai (tanpa copy data)!")
+    
+    return halal_view
+
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lazy', action='store_true',
+                        help="Output view (bitmap baris) di atas base store, bukan copy CSV")
+    args = parser.parse_args()
+    
     # Define paths
     base_dir = Path(__file__).parent.parent
     data_processed = base_dir / "data" / "processed"
     
+    if args.lazy:
+        store_dir = data_processed / "store"
+        if not store_dir.exists():
+            print(f"❌ Error: Base store belum dibuat: {store_dir}")
+            print("   Jalankan dulu: python src/columnar_store.py build")
+            exit(1)
+        filter_haram_view(str(store_dir), str(data_processed / "B. listHaram.txt"),
+                          str(data_processed / "3rd_halalFood.view"))
+        exit(0)
+    
     input_csv = data_processed / "cleaned_nutrition_table.csv"
     haram_list_txt = data_processed / "listHaram.txt"
     output_csv = data_processed / "halal_food.csv"
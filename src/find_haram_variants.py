@@ -0,0 +1,271 @@
+"""
+Script untuk mencari variasi ejaan kata haram (typo, bentuk jamak, varian merek)
+Author: Created for Tugas Akhir
+Date: March 25, 2026
+
+Fungsi:
+- Load vocabulary kata unik + frekuensi dari A. all_31426_words_list.txt
+  (atau CSV Word,Frequency seperti 2st_wordVariations.csv)
+- Bangun deletion index ala SymSpell di atas vocabulary: setiap kata disimpan
+  di bawah semua bentuk hasil menghapus <= d huruf
+- Untuk setiap kata di B. listHaram.txt cari kandidat dengan edit distance
+  (Damerau-Levenshtein / OSA) <= d tanpa membandingkan semua pasangan kata
+- Kandidat (beserta frekuensi) disimpan untuk direview manual, TIDAK otomatis
+  ditambahkan ke B. listHaram.txt
+
+Batas edit distance mengikuti panjang kata haram (kata pendek seperti HAM / RUM
+hanya dicek bentuk jamaknya, karena 1 edit sudah menghasilkan kata lain seperti
+JAM / RUN).
+"""
+
+import argparse
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from filter_haram import load_haram_words
+
+DEFAULT_MAX_DISTANCE = 2
+PLURAL_SUFFIXES = ('S', 'ES')
+
+# "    1. CHOCOLATE                      - 215,710 kali"
+WORD_LINE = re.compile(r'^\s*\d+\.\s+(\S+)\s+-\s+([\d,]+)\s+kali\s*$')
+
+
+def load_vocabulary(path):
+    """
+    Load vocabulary kata -> frekuensi
+
+    Args:
+        path (str): A. all_31426_words_list.txt (UTF-16 / UTF-8) atau CSV Word,Frequency
+
+    Returns:
+        dict: kata (uppercase) -> frekuensi
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        df = pd.read_csv(path)
+        return dict(zip(df['Word'].astype(str).str.upper(), df['Frequency'].astype(int)))
+
+    raw = path.read_bytes()
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        text = raw.decode('utf-16')
+    else:
+        text = raw.decode('utf-8-sig')
+
+    vocabulary = {}
+    for line in text.splitlines():
+        match = WORD_LINE.match(line)
+        if match:
+            vocabulary[match.group(1).upper()] = int(match.group(2).replace(',', ''))
+    return vocabulary
+
+
+def max_distance_for(term, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Edit distance yang diizinkan untuk sebuah kata: 0 (<= 3 huruf), 1 (4-6), 2 (>= 7)
+    """
+    return min(max_distance, (len(term) - 1) // 3)
+
+
+def _deletes(word, distance):
+    """
+    Semua string hasil menghapus 1..distance huruf dari word
+    """
+    results = set()
+    frontier = {word}
+    for _ in range(distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        next_frontier -= results
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a, b, limit=None):
+    """
+    Optimal string alignment distance (Damerau-Levenshtein dengan transposisi bersebelahan)
+
+    Args:
+        limit (int): Jika diberikan, berhenti lebih awal dan kembalikan limit + 1
+                     begitu jarak pasti melebihi limit
+    """
+    if abs(len(a) - len(b)) > (limit if limit is not None else len(a) + len(b)):
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class DeletionIndex:
+    """
+    Deletion index ala SymSpell: hapus-k-huruf -> kata vocabulary asal
+
+    Dua kata berjarak <= d pasti berbagi minimal satu bentuk hasil penghapusan
+    (<= d huruf dari masing-masing), jadi lookup cukup membangkitkan bentuk
+    penghapusan kata query lalu verifikasi kandidat dengan edit_distance().
+    """
+
+    def __init__(self, vocabulary, max_distance=DEFAULT_MAX_DISTANCE):
+        self.vocabulary = vocabulary
+        self.max_distance = max_distance
+        self._index = defaultdict(list)
+        for word in vocabulary:
+            self._index[word].append(word)
+            for deleted in _deletes(word, max_distance):
+                self._index[deleted].append(word)
+
+    def __len__(self):
+        return len(self._index)
+
+    def lookup(self, term, max_distance=None):
+        """
+        Kata vocabulary dengan edit distance <= max_distance dari term
+
+        Returns:
+            list: (kata, distance, frekuensi), urut distance lalu frekuensi (desc)
+        """
+        max_distance = self.max_distance if max_distance is None else max_distance
+        if max_distance > self.max_distance:
+            raise ValueError(f"max_distance > {self.max_distance} (batas saat index dibangun)")
+
+        candidates = set(self._index.get(term, ()))
+        for deleted in _deletes(term, max_distance):
+            candidates.update(self._index.get(deleted, ()))
+
+        results = []
+        for word in candidates:
+            distance = edit_distance(term, word, max_distance)
+            if distance <= max_distance:
+                results.append((word, distance, self.vocabulary[word]))
+        return sorted(results, key=lambda item: (item[1], -item[2], item[0]))
+
+
+def find_variants(vocabulary, haram_words, max_distance=DEFAULT_MAX_DISTANCE, min_frequency=1):
+    """
+    Cari kandidat variasi untuk setiap kata haram
+
+    Args:
+        vocabulary (dict): kata -> frekuensi
+        haram_words (set): Kata haram (uppercase)
+        max_distance (int): Edit distance maksimal (untuk kata haram >= 7 huruf)
+        min_frequency (int): Abaikan kandidat dengan frekuensi lebih kecil
+
+    Returns:
+        pd.DataFrame: Haram_Word, Candidate, Match_Type, Distance, Frequency
+    """
+    vocabulary = {word: freq for word, freq in vocabulary.items() if freq >= min_frequency}
+    index = DeletionIndex(vocabulary, max_distance)
+
+    rows = []
+    for term in sorted(haram_words):
+        found = {}
+        for word, distance, freq in index.lookup(term, max_distance_for(term, max_distance)):
+            found[word] = (word, 'edit', distance, freq)
+        for suffix in PLURAL_SUFFIXES:
+            word = term + suffix
+            if word in vocabulary:
+                found[word] = (word, 'plural', len(suffix), vocabulary[word])
+        for word, match_type, distance, freq in found.values():
+            if word not in haram_words:
+                rows.append((term, word, match_type, distance, freq))
+
+    candidates = pd.DataFrame(rows, columns=['Haram_Word', 'Candidate', 'Match_Type', 'Distance', 'Frequency'])
+    return candidates.sort_values(['Haram_Word', 'Distance', 'Frequency', 'Candidate'],
+                                  ascending=[True, True, False, True]).reset_index(drop=True)
+
+
+def write_variant_report(candidates, haram_words, output_dir):
+    """
+    Tulis I. haram_variant_candidates.csv dan I. haram_variant_candidates.txt (untuk review)
+
+    Returns:
+        tuple: (path CSV, path laporan)
+    """
+    csv_file = Path(output_dir) / "I. haram_variant_candidates.csv"
+    candidates.to_csv(csv_file, index=False)
+
+    report_file = Path(output_dir) / "I. haram_variant_candidates.txt"
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("KANDIDAT VARIASI KATA HARAM (PERLU REVIEW MANUAL)\n")
+        f.write("="*70 + "\n\n")
+        f.write(f"Total kata haram: {len(haram_words)}\n")
+        f.write(f"Kata haram dengan kandidat: {candidates['Haram_Word'].nunique()}\n")
+        f.write(f"Total kandidat: {len(candidates)} "
+                f"({candidates['Candidate'].nunique()} kata unik)\n\n")
+        f.write("Kandidat yang disetujui bisa ditambahkan manual ke B. listHaram.txt\n")
+        f.write("-"*70 + "\n")
+        for term, group in candidates.groupby('Haram_Word', sort=True):
+            f.write(f"\n{term}\n")
+            for row in group.itertuples():
+                f.write(f"   {row.Candidate:<30} {row.Match_Type:<7} d={row.Distance}  {row.Frequency:>10,} kali\n")
+
+    return csv_file, report_file
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+
+    parser = argparse.ArgumentParser(description="Cari variasi ejaan kata haram di vocabulary")
+    parser.add_argument('--vocabulary', default=str(data_processed / "A. all_31426_words_list.txt"),
+                        help="A. all_31426_words_list.txt atau CSV Word,Frequency")
+    parser.add_argument('--max-distance', type=int, default=DEFAULT_MAX_DISTANCE)
+    parser.add_argument('--min-frequency', type=int, default=1)
+    args = parser.parse_args()
+
+    haram_list_txt = data_processed / "B. listHaram.txt"
+
+    for path in (Path(args.vocabulary), haram_list_txt):
+        if not path.exists():
+            print(f"❌ Error: File tidak ditemukan: {path}")
+            exit(1)
+
+    print("=" * 70)
+    print("PENCARIAN VARIASI KATA HARAM")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    print(f"\n1. Loading vocabulary dari: {args.vocabulary}")
+    vocabulary = load_vocabulary(args.vocabulary)
+    print(f"   ✓ Total kata unik: {len(vocabulary):,}")
+
+    print(f"\n2. Loading kata haram dari: {haram_list_txt}")
+    haram_words = load_haram_words(haram_list_txt)
+    print(f"   ✓ Total kata haram: {len(haram_words)}")
+
+    print(f"\n3. Mencari kandidat (deletion index, edit distance <= {args.max_distance})...")
+    candidates = find_variants(vocabulary, haram_words, args.max_distance, args.min_frequency)
+    print(f"   ✓ Kata haram dengan kandidat: {candidates['Haram_Word'].nunique()}")
+    print(f"   ✓ Total kandidat: {len(candidates):,}")
+
+    print(f"\n   Contoh kandidat (frekuensi tertinggi):")
+    for i, row in enumerate(candidates.nlargest(10, 'Frequency').itertuples(), 1):
+        print(f"      {i:2d}. {row.Haram_Word:<15} -> {row.Candidate:<20} (d={row.Distance}, {row.Frequency:,} kali)")
+
+    csv_file, report_file = write_variant_report(candidates, haram_words, data_processed)
+    print(f"\n4. Menyimpan hasil:")
+    print(f"   ✓ CSV: {csv_file}")
+    print(f"   ✓ Laporan review: {report_file}")
+
+    print(f"\n{'='*70}")
+    print(f"✅ Selesai dalam {time.perf_counter() - start:.2f} detik")
+    print(f"{'='*70}")
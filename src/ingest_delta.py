@@ -0,0 +1,368 @@
+"""
+Script untuk ingest inkremental makanan baru (delta CSV) tanpa rebuild pipeline penuh
+Author: Created for Tugas Akhir
+Date: March 20, 2026
+
+Fungsi:
+- Delta CSV (skema mentah 117 kolom, sama dengan 1st_CleanedRawNutriens.csv):
+  hanya baris delta yang difilter haram + diproyeksi ke kolom nutrisi, lalu
+  di-append ke 1st / 3rd / 4th
+- State akumulator kelengkapan (E), HC/SC (F) dan validasi (G) disimpan di
+  data/cache/ingest_state.json dan di-update dengan baris delta saja, lalu
+  laporan E / F / G ditulis ulang; aggregate cube (H) juga di-update
+- Hasil identik dengan rebuild penuh: format angka mengikuti tipe kolom file
+  penuh (int / float / teks). Jika delta mengubah tipe kolom (mis. NaN di kolom
+  int), ingest ditolak dan pipeline penuh harus dijalankan
+- Jika gagal di tengah jalan, file yang sudah di-append dikembalikan ke ukuran semula
+- --update-cache: daftarkan output baru ke stage cache pipeline.py
+- Base store (store/) dan view lazy (*.view) TIDAK di-update: setelah 1st di-append,
+  store otomatis ditolak saat dibuka (signature sumber berubah) sampai di-build ulang
+
+State dibuat sekali (bootstrap) dari file yang ada jika belum ada / file
+berubah di luar ingest (mis. setelah pipeline.py dijalankan ulang).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from aggregate_cube import CUBE_FILE, CompletenessCube
+from analyze_hc_sc import HARD_CONSTRAINTS, NON_NUTRIENT_COLS, HCSCAccumulator, write_hc_sc_report
+from analyze_nutrient_completeness import CompletenessAccumulator, write_completeness_report
+from columnar_store import column_kinds, merge_kind, scan_kinds
+from filter_haram import contains_haram_word, load_haram_words
+from pipeline import STAGES, FileHashIndex, record_stage
+from streaming_stats import DEFAULT_CHUNKSIZE, read_columns
+from validate_nutrients import (FLAG_COLUMNS, ValidationSummary, compute_violation_flags, flagged_rows,
+                                write_validation_report)
+
+# 2: state juga mencatat aggregate cube (H.) di 'files'
+STATE_VERSION = 2
+
+STORE_DIR = "store"
+
+RAW_CSV = "1st_CleanedRawNutriens.csv"
+HALAL_CSV = "3rd_halalFood.csv"
+NUTRIENT_CSV = "4th_nutriensFood.csv"
+FLAGS_CSV = "G. nutrient_validation_flags.csv"
+HARAM_LIST = "B. listHaram.txt"
+NUTRIENT_LIST = "C. listNutriens.txt"
+
+APPENDED_FILES = [RAW_CSV, HALAL_CSV, NUTRIENT_CSV, FLAGS_CSV]
+TRACKED_FILES = APPENDED_FILES + [CUBE_FILE]
+
+
+def check_kinds(existing, delta, file_name):
+    """
+    Gabungkan tipe kolom file dengan delta; tolak jika tipe baris lama ikut berubah
+
+    Returns:
+        dict: Tipe kolom setelah delta di-append
+    """
+    merged = {}
+    for col, kind in existing.items():
+        merged[col] = merge_kind(kind, delta[col])
+        if merged[col] != kind and kind != 'empty':
+            raise ValueError(f"Delta mengubah tipe kolom '{col}' di {file_name} ({kind} -> {merged[col]}); "
+                             f"format baris lama ikut berubah, jalankan pipeline penuh")
+    return merged
+
+
+def cast_to_kinds(df, kinds):
+    """
+    Samakan dtype DataFrame dengan tipe kolom file penuh (menentukan format angka di CSV)
+    """
+    df = df.copy()
+    for col, kind in kinds.items():
+        if kind == 'int':
+            df[col] = df[col].astype('int64')
+        elif kind in ('float', 'empty'):
+            df[col] = pd.to_numeric(df[col]).astype('float64')
+    return df
+
+
+def read_csv_text(text, columns, kinds):
+    """
+    Parse CSV tanpa header (hasil to_csv) seperti pd.read_csv membaca file penuh
+    """
+    text_cols = {col: str for col, kind in kinds.items() if kind == 'object'}
+    return pd.read_csv(io.StringIO(text), header=None, names=columns, dtype=text_cols, low_memory=False)
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def list_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_nutrient_columns(nutrient_list_file):
+    with open(nutrient_list_file, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def bootstrap_state(data_dir, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Bangun state ingest dari file yang ada (sekali saja, membaca 1st / 3rd / 4th penuh)
+
+    Returns:
+        dict: State ingest
+    """
+    data_dir = Path(data_dir)
+    print(f"   Membangun state dari file yang ada (sekali saja, mohon tunggu...)")
+
+    n_raw, kinds_raw = scan_kinds(data_dir / RAW_CSV, chunksize=chunksize)
+    print(f"   ✓ {RAW_CSV}: {n_raw:,} baris")
+
+    nutrient_cols = read_columns(str(data_dir / NUTRIENT_CSV))
+    n_halal, kinds_halal = scan_kinds(data_dir / HALAL_CSV, usecols=nutrient_cols, chunksize=chunksize)
+    print(f"   ✓ {HALAL_CSV}: {n_halal:,} baris")
+
+    all_nutrients = [col for col in nutrient_cols if col not in NON_NUTRIENT_COLS]
+    completeness = CompletenessAccumulator(all_nutrients)
+    hc_sc = HCSCAccumulator(HARD_CONSTRAINTS, [col for col in all_nutrients if col not in HARD_CONSTRAINTS])
+    validation = ValidationSummary()
+    cube = CompletenessCube(all_nutrients)
+    # Flags ditulis ke file sementara dulu: jika bootstrap gagal, file G. lama tetap utuh
+    flags_tmp = (data_dir / FLAGS_CSV).with_suffix('.tmp')
+    pd.DataFrame(columns=FLAG_COLUMNS).to_csv(flags_tmp, index=False)
+    try:
+        for chunk in pd.read_csv(data_dir / NUTRIENT_CSV, low_memory=False, chunksize=chunksize):
+            completeness.update(chunk)
+            hc_sc.update(chunk)
+            cube.update(chunk)
+            flags, applicable = compute_violation_flags(chunk)
+            validation.update(chunk, flags, applicable)
+            flagged_rows(chunk, flags).to_csv(flags_tmp, mode='a', header=False, index=False)
+    except Exception:
+        flags_tmp.unlink()
+        raise
+    os.replace(flags_tmp, data_dir / FLAGS_CSV)
+    cube.save(data_dir / CUBE_FILE)
+    print(f"   ✓ {NUTRIENT_CSV}: {completeness.n_rows:,} baris")
+
+    return {
+        'version': STATE_VERSION,
+        'lists': {name: list_hash(data_dir / name) for name in (HARAM_LIST, NUTRIENT_LIST)},
+        'n_raw': n_raw,
+        'kinds_raw': kinds_raw,
+        'kinds_halal': kinds_halal,
+        'completeness': completeness.to_dict(),
+        'hc_sc': hc_sc.to_dict(),
+        'validation': validation.to_dict(),
+    }
+
+
+def load_state(state_file, data_dir):
+    """
+    Load state ingest; None jika belum ada atau file data berubah di luar ingest
+    """
+    if not Path(state_file).exists():
+        return None
+    with open(state_file, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION or set(state.get('files', {})) != set(TRACKED_FILES):
+        return None
+    if any(not (Path(data_dir) / name).exists() or file_signature(Path(data_dir) / name) != signature
+           for name, signature in state['files'].items()):
+        return None
+    return state
+
+
+def save_state(state, state_file, data_dir):
+    state['files'] = {name: file_signature(Path(data_dir) / name) for name in TRACKED_FILES}
+    Path(state_file).parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = Path(state_file).with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_file, state_file)
+
+
+def _append_text(path, text):
+    with open(path, 'ab') as f:
+        f.write(text.encode('utf-8'))
+
+
+def ingest_delta(delta_csv, data_dir, state_file, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Ingest delta CSV: filter haram + proyeksi kolom untuk delta saja, append ke
+    1st / 3rd / 4th, update akumulator E / F / G dan tulis ulang laporannya
+
+    Args:
+        delta_csv (str): Path delta CSV (header sama dengan 1st_CleanedRawNutriens.csv)
+        data_dir (str): Folder data/processed
+        state_file (str): Path state ingest (JSON)
+        chunksize (int): Jumlah baris per chunk saat bootstrap state
+
+    Returns:
+        dict: Jumlah baris delta / haram / halal dan total baris 4th setelah ingest
+    """
+    print("=" * 70)
+    print("INGEST INKREMENTAL (DELTA)")
+    print("=" * 70)
+    start = time.perf_counter()
+    data_dir = Path(data_dir)
+
+    print(f"\n1. Loading state ingest: {state_file}")
+    state = load_state(state_file, data_dir)
+    if state is None:
+        state = bootstrap_state(data_dir, chunksize)
+    else:
+        print(f"   ✓ State valid ({state['n_raw']:,} baris mentah)")
+    for name, digest in state['lists'].items():
+        if list_hash(data_dir / name) != digest:
+            raise ValueError(f"{name} berubah sejak output terakhir dibuat; jalankan pipeline penuh")
+
+    # Delta mentah: header harus sama persis dengan file mentah
+    print(f"\n2. Loading delta dari: {delta_csv}")
+    raw_columns = list(state['kinds_raw'])
+    if read_columns(str(delta_csv)) != raw_columns:
+        raise ValueError(f"Header delta berbeda dengan {RAW_CSV}")
+    text_cols = {col: str for col, kind in state['kinds_raw'].items() if kind == 'object'}
+    delta = pd.read_csv(delta_csv, dtype=text_cols, low_memory=False)
+    kinds_raw = check_kinds(state['kinds_raw'], column_kinds(delta), RAW_CSV)
+    delta = cast_to_kinds(delta, kinds_raw)
+    print(f"   ✓ Baris delta: {len(delta):,}")
+
+    print(f"\n3. Filter haram + proyeksi kolom (delta saja)...")
+    haram_words = load_haram_words(data_dir / HARAM_LIST)
+    is_haram = delta['Name'].apply(lambda x: contains_haram_word(x, haram_words)).to_numpy(dtype=bool)
+    halal = delta[~is_haram]
+    print(f"   ✓ Makanan HARAM (dibuang): {int(is_haram.sum()):,}")
+    print(f"   ✓ Makanan HALAL (di-append): {len(halal):,}")
+
+    # Urutan kolom 4th mengikuti urutan di file (seperti usecols di filter_columns)
+    desired = load_nutrient_columns(data_dir / NUTRIENT_LIST)
+    missing = [col for col in desired if col not in raw_columns]
+    if missing:
+        raise ValueError(f"Kolom nutrisi tidak ada di delta: {missing}")
+    nutrient_cols = [col for col in raw_columns if col in desired]
+
+    # Round-trip lewat teks CSV supaya tipe & nilai sama seperti saat file penuh dibaca ulang
+    halal_text = halal.to_csv(index=False, header=False)
+    kinds_halal = state['kinds_halal']
+    nutrient_text = ''
+    chunk = None
+    if len(halal):
+        reread = read_csv_text(halal_text, raw_columns, kinds_halal)[nutrient_cols]
+        kinds_halal = check_kinds(kinds_halal, column_kinds(reread), HALAL_CSV)
+        nutrient_text = cast_to_kinds(reread, kinds_halal).to_csv(index=False, header=False)
+        chunk = pd.read_csv(io.StringIO(nutrient_text), header=None, names=nutrient_cols, low_memory=False)
+
+    completeness = CompletenessAccumulator.from_dict(state['completeness'])
+    hc_sc = HCSCAccumulator.from_dict(state['hc_sc'])
+    validation = ValidationSummary.from_dict(state['validation'])
+    cube = CompletenessCube.load(data_dir / CUBE_FILE)
+
+    print(f"\n4. Append ke stage output + update akumulator...")
+    with open(delta_csv, 'rb') as f:
+        f.readline()  # header
+        raw_body = f.read()
+    if raw_body and not raw_body.endswith(b'\n'):
+        raw_body += b'\n'
+
+    sizes = {name: os.path.getsize(data_dir / name) for name in APPENDED_FILES}
+    try:
+        with open(data_dir / RAW_CSV, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+            f.write(raw_body)
+        _append_text(data_dir / HALAL_CSV, halal_text)
+        _append_text(data_dir / NUTRIENT_CSV, nutrient_text)
+
+        if chunk is not None:
+            chunk.index = pd.RangeIndex(completeness.n_rows, completeness.n_rows + len(chunk))
+            completeness.update(chunk)
+            hc_sc.update(chunk)
+            cube.update(chunk)
+            flags, applicable = compute_violation_flags(chunk)
+            validation.update(chunk, flags, applicable)
+            flagged_rows(chunk, flags).to_csv(data_dir / FLAGS_CSV, mode='a', header=False, index=False)
+    except Exception:
+        # Kembalikan file ke kondisi sebelum ingest
+        for name, size in sizes.items():
+            os.truncate(data_dir / name, size)
+        raise
+    for name in (RAW_CSV, HALAL_CSV, NUTRIENT_CSV):
+        print(f"   ✓ {name}: +{os.path.getsize(data_dir / name) - sizes[name]:,} bytes")
+    if (data_dir / STORE_DIR).exists():
+        print(f"   ⚠️  {STORE_DIR}/ dan view lazy (*.view) sekarang basi (ditolak saat dibuka);")
+        print("      build ulang: python src/columnar_store.py build, lalu filter_haram/filter_columns --lazy")
+
+    print(f"\n5. Menulis ulang laporan E / F / G + cube H...")
+    cube.save(data_dir / CUBE_FILE)
+    for path in (*write_completeness_report(completeness, data_dir),
+                 *write_hc_sc_report(hc_sc, data_dir),
+                 *write_validation_report(validation, data_dir), data_dir / CUBE_FILE):
+        print(f"   ✓ {Path(path).name}")
+
+    state.update({
+        'n_raw': state['n_raw'] + len(delta),
+        'kinds_raw': kinds_raw,
+        'kinds_halal': kinds_halal,
+        'completeness': completeness.to_dict(),
+        'hc_sc': hc_sc.to_dict(),
+        'validation': validation.to_dict(),
+    })
+    save_state(state, state_file, data_dir)
+
+    print(f"\n{'='*70}")
+    print(f"Total baris {NUTRIENT_CSV}: {completeness.n_rows:,}")
+    print(f"Waktu: {time.perf_counter() - start:.2f} detik")
+    print("✅ Ingest selesai!")
+    print(f"{'='*70}")
+    return {'delta': len(delta), 'haram': int(is_haram.sum()), 'halal': len(halal),
+            'total': completeness.n_rows}
+
+
+def update_stage_cache(data_dir, cache_dir):
+    """
+    Daftarkan output hasil ingest ke stage cache pipeline (run berikutnya 'up-to-date')
+    """
+    hashes = FileHashIndex(Path(cache_dir) / "file_hashes.json")
+    try:
+        for stage in STAGES:
+            record_stage(stage, data_dir, cache_dir, hashes)
+            print(f"   ✓ Stage cache: {stage['name']}")
+    finally:
+        hashes.save()
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+    cache_dir = base_dir / "data" / "cache"
+
+    parser = argparse.ArgumentParser(description="Ingest inkremental delta CSV (skema mentah)")
+    parser.add_argument('delta', help="Delta CSV dengan kolom sama seperti 1st_CleanedRawNutriens.csv")
+    parser.add_argument('--update-cache', action='store_true',
+                        help="Daftarkan output baru ke stage cache pipeline.py")
+    args = parser.parse_args()
+
+    for name in (RAW_CSV, HALAL_CSV, NUTRIENT_CSV, HARAM_LIST, NUTRIENT_LIST):
+        if not (data_processed / name).exists():
+            print(f"❌ Error: File tidak ditemukan: {data_processed / name}")
+            exit(1)
+
+    if not Path(args.delta).exists():
+        print(f"❌ Error: File tidak ditemukan: {args.delta}")
+        exit(1)
+
+    try:
+        ingest_delta(args.delta, str(data_processed), str(cache_dir / "ingest_state.json"))
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        exit(1)
+
+    if args.update_cache:
+        update_stage_cache(data_processed, cache_dir)
@@ -0,0 +1,615 @@
+"""
+Job runner async untuk analisis / pipeline yang lama (tanpa broker eksternal)
+Author: Created for Tugas Akhir
+Date: March 18, 2026
+
+Fungsi:
+- Antrian job persisten di SQLite lokal (data/jobs/jobs.db)
+- Job dijalankan di background oleh thread pool atau process pool, jumlah job
+  yang jalan bersamaan dibatasi (--workers)
+- Job identik (jenis + parameter sama) yang masih queued/running tidak dijalankan
+  dua kali: submit mengembalikan job_id yang sudah ada
+- Job yang menulis output yang sama (mis. dua pipeline dengan parameter berbeda,
+  atau pipeline + completeness) tidak jalan bersamaan: job berikutnya menunggu
+- Progress (stage, baris diproses, status) dicatat sebagai event berurutan, client
+  bisa streaming lewat Server-Sent Events dan menyambung lagi dengan Last-Event-ID
+- Setiap job queued/running punya owner (runner: host + pid) dan heartbeat; runner
+  yang start hanya mengambil alih job milik runner yang sudah mati (pid tidak ada
+  atau heartbeat basi), job milik runner lain yang masih hidup tidak disentuh
+
+Jenis job:
+    completeness  - analyze_nutrient_completeness -> E. *
+    hc_sc         - analyze_hard_soft_constraints -> F. *
+    validate      - validate_nutrients            -> G. *
+    pipeline      - run_pipeline (dengan stage cache)
+
+HTTP (python job_runner.py serve):
+    POST /jobs                {"kind": "hc_sc", "params": {...}} -> {"job_id", "deduplicated"}
+    GET  /jobs                daftar job terbaru
+    GET  /jobs/<id>           status job
+    GET  /jobs/<id>/events    stream progress (text/event-stream)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from analyze_hc_sc import analyze_hard_soft_constraints
+from analyze_nutrient_completeness import analyze_nutrient_completeness
+from pipeline import STAGES, run_pipeline
+from streaming_stats import DEFAULT_CHUNKSIZE
+from validate_nutrients import validate_nutrients
+
+DEFAULT_WORKERS = 2
+POLL_INTERVAL = 0.5  # detik, interval cek event baru saat streaming
+TERMINAL_STATUSES = ('done', 'failed')
+HEARTBEAT_INTERVAL = 5.0  # detik, runner memperbarui heartbeat job miliknya
+HEARTBEAT_STALE = 30.0    # detik tanpa heartbeat -> owner dianggap mati
+
+
+def _job_completeness(params, emit):
+    data_dir = Path(params['data_dir'])
+    acc = analyze_nutrient_completeness(
+        str(data_dir / "4th_nutriensFood.csv"), str(data_dir), params['chunksize'],
+        progress=lambda rows: emit('progress', stage='completeness', rows=rows))
+    return {'rows': acc.n_rows}
+
+
+def _job_hc_sc(params, emit):
+    data_dir = Path(params['data_dir'])
+    acc, _ = analyze_hard_soft_constraints(
+        str(data_dir / "4th_nutriensFood.csv"), str(data_dir), params['chunksize'],
+        progress=lambda rows: emit('progress', stage='hc_sc', rows=rows))
+    return {'rows': acc.n_rows}
+
+
+def _job_validate(params, emit):
+    data_dir = Path(params['data_dir'])
+    summary = validate_nutrients(
+        str(data_dir / "4th_nutriensFood.csv"), str(data_dir), params['chunksize'],
+        progress=lambda rows: emit('progress', stage='validate', rows=rows))
+    return {'rows': summary.n_rows, 'flagged': summary.n_flagged}
+
+
+def _job_pipeline(params, emit):
+    def progress(stage, rows=None, status=None):
+        if rows is not None:
+            emit('progress', stage=stage, rows=rows)
+        else:
+            emit('stage', stage=stage, status=status)
+
+    return run_pipeline(params['data_dir'], params['cache_dir'], force=params['force'],
+                        max_cache_mb=params['max_cache_mb'], stages=params['stages'],
+                        progress=progress)
+
+
+# Jenis job: fungsi, parameter yang boleh dikirim client (beserta default), dan output
+# yang ditulis di data_dir / cache_dir (job dengan output beririsan dijalankan bergantian)
+JOB_KINDS = {
+    'completeness': {'run': _job_completeness, 'params': {'chunksize': DEFAULT_CHUNKSIZE},
+                     'writes': {'E'}},
+    'hc_sc': {'run': _job_hc_sc, 'params': {'chunksize': DEFAULT_CHUNKSIZE},
+              'writes': {'F'}},
+    'validate': {'run': _job_validate, 'params': {'chunksize': DEFAULT_CHUNKSIZE},
+                 'writes': {'G'}},
+    'pipeline': {'run': _job_pipeline, 'params': {'force': [], 'stages': None, 'max_cache_mb': None},
+                 'writes': {'3rd', '4th', 'E', 'F', 'G', 'H', 'stage_cache'}},
+}
+
+
+def conflicting_kinds(kind):
+    """
+    Jenis job yang tidak boleh jalan bersamaan dengan kind (output beririsan, termasuk kind sendiri)
+    """
+    return sorted(other for other, spec in JOB_KINDS.items() if spec['writes'] & JOB_KINDS[kind]['writes'])
+
+
+OWNER_COLUMNS = {'owner': 'TEXT', 'owner_host': 'TEXT', 'owner_pid': 'INTEGER', 'heartbeat': 'REAL'}
+
+
+def runner_identity():
+    """
+    Identitas runner (owner job): id unik + host + pid proses runner
+    """
+    return {'id': uuid.uuid4().hex[:12], 'host': socket.gethostname(), 'pid': os.getpid()}
+
+
+def _pid_alive(pid):
+    if os.name == 'nt':
+        return True  # os.kill(pid, 0) di Windows menghentikan proses; andalkan heartbeat saja
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def owner_is_dead(job, now=None):
+    """
+    Owner job dianggap mati jika heartbeat basi, atau proses owner (host yang sama) sudah tidak ada
+    """
+    now = time.time() if now is None else now
+    if job['owner'] is None or job['heartbeat'] is None or now - job['heartbeat'] > HEARTBEAT_STALE:
+        return True
+    return job['owner_host'] == socket.gethostname() and not _pid_alive(job['owner_pid'])
+
+
+class JobStore:
+    """
+    Antrian job + event progress di SQLite
+
+    Setiap operasi membuka koneksi sendiri, sehingga aman dipakai dari banyak
+    thread maupun proses worker.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = str(db_file)
+        Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    dedup_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    started REAL,
+                    finished REAL,
+                    result TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    owner_host TEXT,
+                    owner_pid INTEGER,
+                    heartbeat REAL
+                );
+                -- Maksimal satu job queued/running per dedup_key
+                CREATE UNIQUE INDEX IF NOT EXISTS jobs_in_flight
+                    ON jobs (dedup_key) WHERE status IN ('queued', 'running');
+                CREATE TABLE IF NOT EXISTS events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    time REAL NOT NULL,
+                    type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                );
+            """)
+            # Migrasi jobs.db lama (sebelum ada kolom owner / heartbeat)
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, sql_type in OWNER_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}")
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _execute(self, sql, args=()):
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute(sql, args).fetchall()
+        finally:
+            conn.close()
+
+    def _execute_count(self, sql, args=()):
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute(sql, args).rowcount
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _add_event(conn, job_id, event_type, data):
+        conn.execute(
+            "INSERT INTO events (job_id, seq, time, type, data) "
+            "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ? FROM events WHERE job_id = ?",
+            (job_id, time.time(), event_type, json.dumps(data), job_id))
+
+    def create(self, kind, params, dedup_key, owner):
+        """
+        Buat job baru (milik runner owner), atau kembalikan job in-flight dengan dedup_key yang sama
+
+        Returns:
+            tuple: (job_id, True jika job baru)
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                existing = conn.execute(
+                    "SELECT id FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')",
+                    (dedup_key,)).fetchone()
+                if existing:
+                    return existing['id'], False
+                job_id = uuid.uuid4().hex[:12]
+                now = time.time()
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, params, dedup_key, status, created, "
+                    "owner, owner_host, owner_pid, heartbeat) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?, ?)",
+                    (job_id, kind, json.dumps(params), dedup_key, now,
+                     owner['id'], owner['host'], owner['pid'], now))
+                self._add_event(conn, job_id, 'status', {'status': 'queued'})
+                return job_id, True
+        except sqlite3.IntegrityError:
+            # Kalah balapan dengan submit identik dari thread / proses lain
+            return self.create(kind, params, dedup_key, owner)
+        finally:
+            conn.close()
+
+    def claim(self, job_id, owner, conflicts=()):
+        """
+        Tandai job queued -> running (atomik) milik runner owner.
+        Returns False jika sudah diambil worker lain, atau masih ada job running
+        dengan jenis di conflicts (output beririsan).
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                now = time.time()
+                placeholders = ', '.join('?' * len(conflicts))
+                blocked = (f" AND NOT EXISTS (SELECT 1 FROM jobs WHERE status = 'running' "
+                           f"AND kind IN ({placeholders}))" if conflicts else "")
+                claimed = conn.execute(
+                    "UPDATE jobs SET status = 'running', started = ?, owner = ?, owner_host = ?, "
+                    "owner_pid = ?, heartbeat = ? WHERE id = ? AND status = 'queued'" + blocked,
+                    (now, owner['id'], owner['host'], owner['pid'], now, job_id, *conflicts)).rowcount == 1
+                if claimed:
+                    self._add_event(conn, job_id, 'status', {'status': 'running'})
+                return claimed
+        finally:
+            conn.close()
+
+    def heartbeat(self, owner):
+        """
+        Perbarui heartbeat semua job queued/running milik runner owner
+        """
+        self._execute("UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                      (time.time(), owner['id']))
+
+    def adopt(self, job_id, previous_owner, owner):
+        """
+        Ambil alih job queued dari owner yang mati (atomik: gagal jika owner sudah berubah)
+        """
+        return self._execute_count(
+            "UPDATE jobs SET owner = ?, owner_host = ?, owner_pid = ?, heartbeat = ? "
+            "WHERE id = ? AND status = 'queued' AND owner IS ?",
+            (owner['id'], owner['host'], owner['pid'], time.time(), job_id, previous_owner)) == 1
+
+    def fail_orphan(self, job_id, previous_owner, error):
+        """
+        Tandai job running yang owner-nya mati sebagai failed (atomik seperti adopt)
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                failed = conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished = ?, result = ?, error = ? "
+                    "WHERE id = ? AND status = 'running' AND owner IS ?",
+                    (time.time(), json.dumps(None), error, job_id, previous_owner)).rowcount == 1
+                if failed:
+                    self._add_event(conn, job_id, 'status', {'status': 'failed', 'result': None, 'error': error})
+                return failed
+        finally:
+            conn.close()
+
+    def emit(self, job_id, event_type, **data):
+        conn = self._connect()
+        try:
+            with conn:
+                self._add_event(conn, job_id, event_type, data)
+        finally:
+            conn.close()
+
+    def finish(self, job_id, result=None, error=None):
+        status = 'failed' if error else 'done'
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("UPDATE jobs SET status = ?, finished = ?, result = ?, error = ? WHERE id = ?",
+                             (status, time.time(), json.dumps(result), error, job_id))
+                self._add_event(conn, job_id, 'status',
+                                {'status': status, 'result': result, 'error': error})
+        finally:
+            conn.close()
+
+    def get(self, job_id):
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def list(self, limit=50):
+        rows = self._execute("SELECT id FROM jobs ORDER BY created DESC LIMIT ?", (limit,))
+        return [self.get(row['id']) for row in rows]
+
+    def jobs_with_status(self, status):
+        return [row['id'] for row in self._execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created", (status,))]
+
+    def in_flight(self):
+        """
+        Job queued/running beserta owner + heartbeat (untuk recovery)
+        """
+        return [dict(row) for row in self._execute(
+            "SELECT id, status, owner, owner_host, owner_pid, heartbeat FROM jobs "
+            "WHERE status IN ('queued', 'running') ORDER BY created")]
+
+    def events(self, job_id, after=0):
+        """
+        Event job dengan seq > after (urut)
+        """
+        rows = self._execute("SELECT seq, time, type, data FROM events WHERE job_id = ? AND seq > ? "
+                             "ORDER BY seq", (job_id, after))
+        return [{'seq': row['seq'], 'time': row['time'], 'type': row['type'],
+                 'data': json.loads(row['data'])} for row in rows]
+
+
+def execute_job(db_file, job_id, owner):
+    """
+    Jalankan satu job (dipanggil di thread / proses worker) atas nama runner owner
+    """
+    store = JobStore(db_file)
+    job = store.get(job_id)
+    conflicts = conflicting_kinds(job['kind'])
+    waiting = False
+    while not store.claim(job_id, owner, conflicts):
+        if store.get(job_id)['status'] != 'queued':
+            return  # sudah diambil worker lain
+        if not waiting:
+            store.emit(job_id, 'waiting', reason="menunggu job lain yang menulis output yang sama")
+            waiting = True
+        time.sleep(POLL_INTERVAL)
+    job = store.get(job_id)
+    try:
+        result = JOB_KINDS[job['kind']]['run'](job['params'],
+                                               lambda event_type, **data: store.emit(job_id, event_type, **data))
+        store.finish(job_id, result=result)
+    except Exception as e:
+        traceback.print_exc()
+        store.finish(job_id, error=f"{type(e).__name__}: {e}")
+
+
+def format_sse(event):
+    """
+    Format event sebagai pesan Server-Sent Events
+    """
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+class JobRunner:
+    """
+    Terima job, jalankan di pool background, dan sediakan stream progress
+
+    Args:
+        db_file (str): File SQLite antrian job
+        data_dir (str): Folder data/processed
+        cache_dir (str): Folder stage cache pipeline
+        max_concurrent (int): Jumlah job maksimal yang jalan bersamaan
+        backend (str): 'thread' atau 'process'
+    """
+
+    def __init__(self, db_file, data_dir, cache_dir, max_concurrent=DEFAULT_WORKERS, backend='thread'):
+        self.store = JobStore(db_file)
+        self.data_dir = str(data_dir)
+        self.cache_dir = str(cache_dir)
+        self.owner = runner_identity()
+        executor = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}[backend]
+        self.pool = executor(max_workers=max_concurrent)
+        self._recover()
+        self._stop = threading.Event()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._heartbeat_thread.start()
+
+    def _recover(self):
+        # Hanya job milik runner yang sudah mati: 'running' terputus -> failed,
+        # 'queued' diambil alih dan dijalankan di pool ini
+        for job in self.store.in_flight():
+            if job['owner'] == self.owner['id'] or not owner_is_dead(job):
+                continue
+            if job['status'] == 'running':
+                self.store.fail_orphan(job['id'], job['owner'],
+                                       "Interrupted: runner berhenti saat job berjalan")
+            elif self.store.adopt(job['id'], job['owner'], self.owner):
+                self.pool.submit(execute_job, self.store.db_file, job['id'], self.owner)
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.store.heartbeat(self.owner)
+                self._recover()
+            except sqlite3.Error:
+                traceback.print_exc()
+
+    def _resolve_params(self, kind, params):
+        if not isinstance(kind, str) or kind not in JOB_KINDS:
+            raise ValueError(f"Jenis job tidak dikenal: {kind!r} (pilihan: {', '.join(JOB_KINDS)})")
+        if params is not None and not isinstance(params, dict):
+            raise ValueError(f"params harus object JSON, bukan {type(params).__name__}")
+        params = dict(params or {})
+        unknown = set(params) - set(JOB_KINDS[kind]['params'])
+        if unknown:
+            raise ValueError(f"Parameter tidak dikenal untuk {kind}: {', '.join(sorted(unknown))}")
+        for name in ('force', 'stages'):
+            value = params.get(name)
+            if value is not None and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                raise ValueError(f"{name} harus list nama stage")
+        if kind == 'pipeline' and params.get('stages'):
+            invalid = set(params['stages']) - {stage['name'] for stage in STAGES}
+            if invalid:
+                raise ValueError(f"Stage tidak dikenal: {', '.join(sorted(invalid))}")
+        resolved = dict(JOB_KINDS[kind]['params'], **params)
+        resolved['data_dir'] = self.data_dir
+        if kind == 'pipeline':
+            resolved['cache_dir'] = self.cache_dir
+        return resolved
+
+    def submit(self, kind, params=None):
+        """
+        Masukkan job ke antrian (job identik yang masih in-flight tidak diduplikasi;
+        job dengan output beririsan baru mulai setelah job sebelumnya selesai)
+
+        Returns:
+            tuple: (job_id, True jika job baru / False jika job in-flight yang sudah ada)
+        """
+        params = self._resolve_params(kind, params)
+        dedup_key = hashlib.sha256(json.dumps([kind, params], sort_keys=True).encode('utf-8')).hexdigest()
+        job_id, created = self.store.create(kind, params, dedup_key, self.owner)
+        if created:
+            self.pool.submit(execute_job, self.store.db_file, job_id, self.owner)
+        return job_id, created
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def stream(self, job_id, after=0, poll_interval=POLL_INTERVAL):
+        """
+        Generator event job (mulai dari seq > after) sampai job selesai
+        """
+        while True:
+            events = self.store.events(job_id, after)
+            for event in events:
+                after = event['seq']
+                yield event
+                if event['type'] == 'status' and event['data']['status'] in TERMINAL_STATUSES:
+                    return
+            if not events:
+                job = self.store.get(job_id)
+                if job is None:
+                    return
+                time.sleep(poll_interval)
+
+    def shutdown(self, wait=True):
+        self._stop.set()
+        self.pool.shutdown(wait=wait)
+
+
+def make_handler(runner):
+    """
+    Handler HTTP (stdlib) untuk submit job, cek status, dan stream progress via SSE
+    """
+
+    class JobHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if urlparse(self.path).path.rstrip('/') != '/jobs':
+                return self._send_json(404, {'error': 'not found'})
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(request, dict):
+                    raise ValueError("Body request harus object JSON")
+                job_id, created = runner.submit(request.get('kind'), request.get('params'))
+            except (ValueError, TypeError, AttributeError) as e:
+                return self._send_json(400, {'error': str(e)})
+            self._send_json(202, {'job_id': job_id, 'deduplicated': not created})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [part for part in url.path.split('/') if part]
+            if parts == ['jobs']:
+                return self._send_json(200, runner.store.list())
+            if len(parts) < 2 or parts[0] != 'jobs':
+                return self._send_json(404, {'error': 'not found'})
+            job = runner.get(parts[1])
+            if job is None:
+                return self._send_json(404, {'error': 'job tidak ditemukan'})
+            if len(parts) == 2:
+                return self._send_json(200, job)
+            if parts[2:] != ['events']:
+                return self._send_json(404, {'error': 'not found'})
+
+            # Sambung ulang: lanjut dari Last-Event-ID (atau ?after=N); divalidasi sebelum header dikirim
+            after = self.headers.get('Last-Event-ID') or parse_qs(url.query).get('after', ['0'])[0]
+            try:
+                after = int(after)
+                if after < 0:
+                    raise ValueError
+            except ValueError:
+                return self._send_json(400, {'error': f"Last-Event-ID / after tidak valid: {after!r}"})
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            try:
+                for event in runner.stream(job['id'], after):
+                    self.wfile.write(format_sse(event).encode('utf-8'))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client menutup koneksi, job tetap jalan
+
+        def log_message(self, format, *args):
+            pass
+
+    return JobHandler
+
+
+def serve(runner, host='127.0.0.1', port=8765):
+    server = ThreadingHTTPServer((host, port), make_handler(runner))
+    print(f"✓ Job runner di http://{host}:{port} (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        runner.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+    cache_dir = base_dir / "data" / "cache"
+    db_file = base_dir / "data" / "jobs" / "jobs.db"
+
+    parser = argparse.ArgumentParser(description="Job runner async untuk analisis / pipeline")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Jumlah job maksimal yang jalan bersamaan")
+    parser.add_argument('--backend', choices=['thread', 'process'], default='thread')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help="Jalankan HTTP server (submit + SSE progress)")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    run_parser = subparsers.add_parser('run', help="Submit job lalu tampilkan progress sampai selesai")
+    run_parser.add_argument('kind', choices=list(JOB_KINDS))
+    run_parser.add_argument('--params', default='{}', help="Parameter job (JSON)")
+    args = parser.parse_args()
+
+    runner = JobRunner(db_file, data_processed, cache_dir, args.workers, args.backend)
+    if args.command == 'serve':
+        serve(runner, args.host, args.port)
+    else:
+        job_id, created = runner.submit(args.kind, json.loads(args.params))
+        print(f"✓ Job {job_id} ({'baru' if created else 'sudah berjalan, ikut memantau'})")
+        for event in runner.stream(job_id):
+            print(f"   [{event['seq']}] {event['type']}: {event['data']}")
+        runner.shutdown()
+        job = runner.get(job_id)
+        print(f"\n{'✅' if job['status'] == 'done' else '❌'} Job {job['status']}")
@@ -0,0 +1,449 @@
+"""
+Script untuk menjalankan seluruh pipeline dengan stage cache (content-addressed)
+Author: Created for Tugas Akhir
+Date: March 9, 2026
+
+Fungsi:
+- Setiap stage punya fingerprint = hash(isi input + parameter + source code stage,
+  termasuk semua modul lokal src/ yang di-import secara transitif)
+- Output stage disimpan di data/cache/<stage>/<fingerprint>/
+- Rerun: stage yang fingerprint-nya sama langsung di-skip (cukup cek stat file),
+  hanya stage yang input/code-nya berubah (dan downstream-nya) yang dihitung ulang
+- --force untuk paksa hitung ulang, --max-cache-mb untuk eviction (LRU)
+
+Pipeline:
+    1st_CleanedRawNutriens.csv + B. listHaram.txt   -> filter_haram   -> 3rd_halalFood.csv
+    3rd_halalFood.csv + C. listNutriens.txt         -> filter_columns -> 4th_nutriensFood.csv
+    4th_nutriensFood.csv                            -> completeness   -> E. *
+    4th_nutriensFood.csv                            -> hc_sc          -> F. *
+    4th_nutriensFood.csv                            -> validate       -> G. *
+    4th_nutriensFood.csv                            -> cube           -> H. completeness_cube.npz
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from aggregate_cube import CUBE_FILE, build_cube
+from analyze_hc_sc import analyze_hard_soft_constraints
+from analyze_nutrient_completeness import analyze_nutrient_completeness
+from filter_columns import filter_columns
+from filter_haram import filter_haram_foods
+from validate_nutrients import validate_nutrients
+
+SRC_DIR = Path(__file__).parent
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _run_filter_haram(inputs, output_dir, params, progress=None):
+    filter_haram_foods(str(inputs[0]), str(inputs[1]), str(Path(output_dir) / "3rd_halalFood.csv"))
+
+
+def _run_filter_columns(inputs, output_dir, params, progress=None):
+    filter_columns(str(inputs[0]), str(inputs[1]), str(Path(output_dir) / "4th_nutriensFood.csv"))
+
+
+def _run_completeness(inputs, output_dir, params, progress=None):
+    analyze_nutrient_completeness(str(inputs[0]), str(output_dir), progress=progress, **params)
+
+
+def _run_hc_sc(inputs, output_dir, params, progress=None):
+    analyze_hard_soft_constraints(str(inputs[0]), str(output_dir), progress=progress, **params)
+
+
+def _run_validate(inputs, output_dir, params, progress=None):
+    validate_nutrients(str(inputs[0]), str(output_dir), progress=progress, **params)
+
+
+def _run_cube(inputs, output_dir, params, progress=None):
+    build_cube(str(inputs[0]), str(Path(output_dir) / CUBE_FILE), **params)
+
+
+# Definisi stage: input & output relatif ke data/processed, code relatif ke src/
+# (cukup script stage; modul lokal yang di-import ikut di-hash lewat local_imports)
+STAGES = [
+    {
+        'name': 'filter_haram',
+        'inputs': ["1st_CleanedRawNutriens.csv", "B. listHaram.txt"],
+        'outputs': ["3rd_halalFood.csv"],
+        'code': ["filter_haram.py"],
+        'params': {},
+        'run': _run_filter_haram,
+    },
+    {
+        'name': 'filter_columns',
+        'inputs': ["3rd_halalFood.csv", "C. listNutriens.txt"],
+        'outputs': ["4th_nutriensFood.csv"],
+        'code': ["filter_columns.py"],
+        'params': {},
+        'run': _run_filter_columns,
+    },
+    {
+        'name': 'completeness',
+        'inputs': ["4th_nutriensFood.csv"],
+        'outputs': ["E. nutrient_completeness_report.txt", "E. nutrient_completeness_summary.csv"],
+        'code': ["analyze_nutrient_completeness.py"],
+        'params': {},
+        'run': _run_completeness,
+    },
+    {
+        'name': 'hc_sc',
+        'inputs': ["4th_nutriensFood.csv"],
+        'outputs': ["F. HC_SC_summary_table.csv", "F. HC_distribution.csv", "F. HC_SC_detailed_report.txt"],
+        'code': ["analyze_hc_sc.py"],
+        'params': {},
+        'run': _run_hc_sc,
+    },
+    {
+        'name': 'validate',
+        'inputs': ["4th_nutriensFood.csv"],
+        'outputs': ["G. nutrient_validation_flags.csv", "G. nutrient_validation_report.txt",
+                    "G. nutrient_validation_summary.csv"],
+        'code': ["validate_nutrients.py"],
+        'params': {},
+        'run': _run_validate,
+    },
+    {
+        'name': 'cube',
+        'inputs': ["4th_nutriensFood.csv"],
+        'outputs': [CUBE_FILE],
+        'code': ["aggregate_cube.py"],
+        'params': {},
+        'run': _run_cube,
+    },
+]
+
+
+class FileHashIndex:
+    """
+    Memo sha256 per file, di-key dengan (size, mtime_ns)
+
+    File besar hanya di-hash ulang jika stat-nya berubah, sehingga cek
+    "up-to-date" cukup beberapa os.stat() (milidetik).
+    """
+
+    def __init__(self, index_file):
+        self.index_file = Path(index_file)
+        self.entries = {}
+        self.dirty = False  # ada entry baru / berubah yang belum di-save
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def _stat_key(self, path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def hash(self, path):
+        """
+        Returns:
+            str: sha256 isi file (dari memo jika stat tidak berubah)
+        """
+        path = str(Path(path).resolve())
+        stat_key = self._stat_key(path)
+        entry = self.entries.get(path)
+        if entry and entry['stat'] == stat_key:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        self.entries[path] = {'stat': stat_key, 'sha256': digest.hexdigest()}
+        self.dirty = True
+        return digest.hexdigest()
+
+    def record(self, path, sha256):
+        """
+        Simpan hash yang sudah diketahui (mis. file baru di-copy dari cache)
+        """
+        path = str(Path(path).resolve())
+        self.entries[path] = {'stat': self._stat_key(path), 'sha256': sha256}
+        self.dirty = True
+
+    def forget(self, path):
+        if self.entries.pop(str(Path(path).resolve()), None) is not None:
+            self.dirty = True
+
+    def save(self):
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_file, self.index_file)
+        self.dirty = False
+
+
+def _is_main_block(node):
+    return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name) and node.test.left.id == '__name__')
+
+
+def local_imports(scripts):
+    """
+    Script + semua modul lokal (file .py di src/) yang di-import secara transitif
+
+    Import dibaca dari AST (termasuk import di dalam fungsi, kecuali blok
+    `if __name__ == "__main__":` yang tidak jalan saat stage dipanggil), tanpa
+    menjalankan modul.
+
+    Args:
+        scripts (list): Nama file script relatif ke src/
+
+    Returns:
+        list: Nama file .py terurut
+    """
+    found = set()
+    pending = list(scripts)
+    while pending:
+        name = pending.pop()
+        if name in found:
+            continue
+        found.add(name)
+        tree = ast.parse((SRC_DIR / name).read_text(encoding='utf-8'), filename=name)
+        body = [node for node in tree.body if not _is_main_block(node)]
+        for node in (child for top in body for child in ast.walk(top)):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                file_name = module.split('.')[0] + ".py"
+                if (SRC_DIR / file_name).exists():
+                    pending.append(file_name)
+    return sorted(found)
+
+
+def stage_fingerprint(stage, data_dir, hashes):
+    """
+    Fingerprint stage = hash(nama, hash isi input, parameter, hash source code
+    script stage + modul lokal yang di-import)
+    """
+    payload = {
+        'stage': stage['name'],
+        'inputs': {name: hashes.hash(Path(data_dir) / name) for name in stage['inputs']},
+        'params': stage['params'],
+        'code': {name: hashes.hash(SRC_DIR / name) for name in local_imports(stage['code'])},
+    }
+    raw = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _read_manifest(entry_dir):
+    manifest_file = Path(entry_dir) / "manifest.json"
+    if not manifest_file.exists():
+        return None
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(entry_dir, manifest):
+    with open(Path(entry_dir) / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def run_stage(stage, data_dir, cache_dir, hashes, force=False, progress=None):
+    """
+    Jalankan satu stage, atau skip / restore dari cache jika fingerprint sama
+
+    progress (opsional) diteruskan ke stage yang membaca per chunk: progress(baris_diproses)
+
+    Returns:
+        tuple: (status 'up-to-date' / 'restored' / 'computed', folder entry cache)
+    """
+    data_dir = Path(data_dir)
+    key = stage_fingerprint(stage, data_dir, hashes)
+    entry_dir = Path(cache_dir) / stage['name'] / key
+    manifest = _read_manifest(entry_dir)
+
+    if manifest and not force:
+        targets = {name: data_dir / name for name in stage['outputs']}
+        if all(path.exists() and hashes.hash(path) == manifest['outputs'][name]['sha256']
+               for name, path in targets.items()):
+            status = 'up-to-date'
+        else:
+            for name, path in targets.items():
+                shutil.copy2(entry_dir / name, path)
+                hashes.record(path, manifest['outputs'][name]['sha256'])
+            status = 'restored'
+        manifest['last_used'] = time.time()
+        _write_manifest(entry_dir, manifest)
+        return status, entry_dir
+
+    # Hitung ulang di folder sementara, lalu pindahkan ke cache secara atomik
+    tmp_dir = entry_dir.with_name(f"{key}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    stage['run']([data_dir / name for name in stage['inputs']], tmp_dir, stage['params'], progress)
+
+    outputs = _commit_entry(stage, key, tmp_dir, entry_dir, hashes)
+
+    for name in stage['outputs']:
+        target = data_dir / name
+        shutil.copy2(entry_dir / name, target)
+        hashes.record(target, outputs[name]['sha256'])
+    return 'computed', entry_dir
+
+
+def _commit_entry(stage, key, tmp_dir, entry_dir, hashes):
+    """
+    Tulis manifest untuk output di tmp_dir, lalu pindahkan ke entry cache (atomik)
+    """
+    outputs = {}
+    for name in stage['outputs']:
+        output = tmp_dir / name
+        outputs[name] = {'sha256': hashes.hash(output), 'size': output.stat().st_size}
+        hashes.forget(output)
+    _write_manifest(tmp_dir, {
+        'stage': stage['name'],
+        'key': key,
+        'outputs': outputs,
+        'created': time.time(),
+        'last_used': time.time(),
+    })
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(tmp_dir, entry_dir)
+    return outputs
+
+
+def record_stage(stage, data_dir, cache_dir, hashes):
+    """
+    Simpan output stage yang sudah ada di data_dir sebagai entry cache untuk
+    fingerprint input saat ini (mis. setelah output di-update secara inkremental
+    oleh ingest_delta.py), sehingga run_pipeline berikutnya langsung 'up-to-date'
+
+    Returns:
+        Path: Folder entry cache
+    """
+    data_dir = Path(data_dir)
+    key = stage_fingerprint(stage, data_dir, hashes)
+    entry_dir = Path(cache_dir) / stage['name'] / key
+    tmp_dir = entry_dir.with_name(f"{key}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name in stage['outputs']:
+        shutil.copy2(data_dir / name, tmp_dir / name)
+
+    outputs = _commit_entry(stage, key, tmp_dir, entry_dir, hashes)
+    for name in stage['outputs']:
+        hashes.record(data_dir / name, outputs[name]['sha256'])
+    return entry_dir
+
+
+def evict_cache(cache_dir, max_bytes, keep=()):
+    """
+    Hapus entry cache yang paling lama tidak dipakai (LRU) sampai total <= max_bytes
+
+    Args:
+        cache_dir (str): Folder cache
+        max_bytes (int): Batas ukuran cache
+        keep (iterable): Folder entry yang tidak boleh dihapus (dipakai run ini)
+
+    Returns:
+        list: Folder entry yang dihapus
+    """
+    entries = []
+    for manifest_file in Path(cache_dir).glob("*/*/manifest.json"):
+        entry_dir = manifest_file.parent
+        manifest = _read_manifest(entry_dir)
+        size = sum(path.stat().st_size for path in entry_dir.iterdir() if path.is_file())
+        entries.append((manifest.get('last_used', 0), entry_dir, size))
+
+    keep = {Path(path).resolve() for path in keep}
+    total = sum(size for _, _, size in entries)
+    evicted = []
+    for _, entry_dir, size in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if entry_dir.resolve() in keep:
+            continue
+        shutil.rmtree(entry_dir)
+        total -= size
+        evicted.append(entry_dir)
+    return evicted
+
+
+def run_pipeline(data_dir, cache_dir, force=(), max_cache_mb=None, stages=None, progress=None):
+    """
+    Jalankan pipeline berurutan dengan stage cache
+
+    Args:
+        data_dir (str): Folder data/processed
+        cache_dir (str): Folder cache stage
+        force (iterable): Nama stage yang dipaksa hitung ulang ('all' = semua)
+        max_cache_mb (float): Batas ukuran cache (None = tanpa batas)
+        stages (list): Nama stage yang dijalankan (default semua)
+        progress (callable): Opsional, dipanggil progress(stage, rows=..., status=...)
+
+    Returns:
+        dict: nama stage -> status
+    """
+    print("=" * 70)
+    print("PIPELINE (STAGE CACHE)")
+    print("=" * 70)
+
+    cache_dir = Path(cache_dir)
+    hashes = FileHashIndex(cache_dir / "file_hashes.json")
+    force = set(force)
+    results = {}
+    used_entries = []
+
+    try:
+        for stage in STAGES:
+            if stages and stage['name'] not in stages:
+                continue
+            start = time.perf_counter()
+            stage_force = 'all' in force or stage['name'] in force
+            stage_progress = None
+            if progress:
+                progress(stage['name'], status='running')
+                stage_progress = lambda rows, name=stage['name']: progress(name, rows=rows)
+            status, entry_dir = run_stage(stage, data_dir, cache_dir, hashes, stage_force, stage_progress)
+            used_entries.append(entry_dir)
+            results[stage['name']] = status
+            if progress:
+                progress(stage['name'], status=status)
+            print(f"   ✓ {stage['name']:<16} {status:<11} ({(time.perf_counter() - start) * 1000:,.0f} ms)")
+    finally:
+        hashes.save()
+
+    if max_cache_mb is not None:
+        evicted = evict_cache(cache_dir, max_cache_mb * 1024 * 1024, keep=used_entries)
+        print(f"\n   Cache eviction: {len(evicted)} entry dihapus (batas {max_cache_mb:,.0f} MB)")
+
+    print("=" * 70)
+    print("\n✅ Pipeline selesai!")
+    return results
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+    cache_dir = base_dir / "data" / "cache"
+
+    parser = argparse.ArgumentParser(description="Jalankan pipeline dengan stage cache")
+    parser.add_argument('--force', nargs='*', default=None, metavar='STAGE',
+                        help="Paksa hitung ulang (tanpa argumen = semua stage)")
+    parser.add_argument('--max-cache-mb', type=float, default=None,
+                        help="Batas ukuran cache, entry LRU dihapus jika terlampaui")
+    parser.add_argument('--stages', nargs='*', default=None,
+                        choices=[stage['name'] for stage in STAGES])
+    args = parser.parse_args()
+
+    force = []
+    if args.force is not None:
+        force = args.force or ['all']
+
+    for name in ["1st_CleanedRawNutriens.csv", "B. listHaram.txt", "C. listNutriens.txt"]:
+        if not (data_processed / name).exists():
+            print(f"❌ Error: File tidak ditemukan: {data_processed / name}")
+            exit(1)
+
+    run_pipeline(str(data_processed), str(cache_dir), force, args.max_cache_mb, args.stages)
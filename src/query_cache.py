@@ -0,0 +1,269 @@
+"""
+Cache hasil query rekomendasi / filter kandidat berdasarkan profil constraint
+Author: Created for Tugas Akhir
+Date: March 16, 2026
+
+Fungsi:
+- Kanonikalisasi profil constraint (urutan key, pembulatan target, food group
+  yang dikecualikan) supaya profil identik / hampir identik punya key yang sama
+- Cache LRU dengan batas ukuran + TTL, di-key dengan (profil kanonik, versi dataset)
+- Versi dataset = hash isi 4th_nutriensFood.csv + B. listHaram.txt + C. listNutriens.txt;
+  jika berubah, seluruh cache di-invalidate otomatis
+- Metrik hit / miss / eviction / expiration / invalidation
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from analyze_hc_sc import HARD_CONSTRAINTS, HIGH_QUALITY_HC
+from batch_recommend import DEFAULT_MENU_SIZE, load_food_matrix, recommend_menu
+from pipeline import FileHashIndex
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_SIGNIFICANT_DIGITS = 3
+VERSION_CHECK_INTERVAL = 1.0  # detik, supaya cek stat file tidak dilakukan per query
+
+
+def _round_significant(value, digits):
+    if value == 0:
+        return 0.0
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def canonicalize_profile(profile, significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+    """
+    Ubah profil constraint jadi key string yang kanonik
+
+    Args:
+        profile (dict): {'targets': {nutrisi: nilai}, 'excluded_food_groups': [...],
+                         parameter lain (mis. 'n_items')}
+        significant_digits (int): Pembulatan target (profil yang hampir sama -> key sama)
+
+    Returns:
+        str: JSON kanonik
+    """
+    targets = {}
+    for nutrient, value in (profile.get('targets') or {}).items():
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            continue
+        if nutrient not in HARD_CONSTRAINTS:
+            raise KeyError(f"Target bukan Hard Constraint: {nutrient}")
+        targets[nutrient] = _round_significant(float(value), significant_digits)
+
+    excluded = sorted({str(group).strip().upper()
+                       for group in profile.get('excluded_food_groups') or [] if str(group).strip()})
+    extra = {key: value for key, value in profile.items()
+             if key not in ('targets', 'excluded_food_groups')}
+
+    return json.dumps({'targets': targets, 'excluded_food_groups': excluded, 'params': extra},
+                      sort_keys=True, separators=(',', ':'))
+
+
+def dataset_version(paths, hashes=None):
+    """
+    Versi dataset = hash gabungan isi file (memo per stat, jadi murah jika tidak berubah)
+
+    Memo hash disimpan ke disk setiap ada file yang di-hash ulang, supaya start
+    berikutnya tidak membaca ulang 4th_nutriensFood.csv.
+    """
+    hashes = hashes or FileHashIndex(Path(paths[0]).parent.parent / "cache" / "file_hashes.json")
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(hashes.hash(path).encode('ascii'))
+    if hashes.dirty:
+        hashes.save()
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Cache LRU + TTL yang thread-safe dengan invalidasi berdasarkan versi dataset
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 version_fn=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_fn = version_fn
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = version_fn() if version_fn else None
+        self._version_checked = clock()
+        # Naik setiap cache dikosongkan; hasil compute dari generasi lama tidak disimpan
+        self._generation = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0,
+                      'expirations': 0, 'invalidations': 0, 'stale_discards': 0}
+
+    def _check_version(self):
+        if self.version_fn is None:
+            return
+        now = self.clock()
+        if now - self._version_checked < VERSION_CHECK_INTERVAL:
+            return
+        self._version_checked = now
+        version = self.version_fn()
+        if version != self._version:
+            self._version = version
+            self._clear()
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+            value, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def _clear(self):
+        self._entries.clear()
+        self._generation += 1
+        self.stats['invalidations'] += 1
+
+    def put(self, key, value, generation=None):
+        """
+        Simpan value; jika generation diberikan dan cache sudah dikosongkan sejak
+        generasi itu (versi dataset berubah / invalidate()), value dibuang
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stats['stale_discards'] += 1
+                return
+            self._entries[key] = (value, self.clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Ambil dari cache, atau hitung dengan compute() lalu simpan
+
+        Hasil tetap dikembalikan, tapi tidak disimpan jika cache di-invalidate
+        selama compute() berjalan (hasil mungkin dari dataset versi lama).
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            with self._lock:
+                generation = self._generation
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    def invalidate(self):
+        """
+        Hapus semua entry (mis. setelah haram list / data diperbarui)
+        """
+        with self._lock:
+            self._clear()
+
+    @property
+    def version(self):
+        return self._version
+
+    def __len__(self):
+        return len(self._entries)
+
+    def metrics(self):
+        """
+        Returns:
+            dict: statistik + hit rate + jumlah entry
+        """
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(self.stats, entries=len(self._entries),
+                    hit_rate=self.stats['hits'] / lookups if lookups else 0.0)
+
+
+class CachedRecommender:
+    """
+    Query rekomendasi / filter kandidat di atas tabel nutrisi halal, dengan ResultCache
+
+    Matriks nutrisi dimuat sekali; hasil query di-cache per profil kanonik.
+    """
+
+    def __init__(self, data_dir, min_hc=HIGH_QUALITY_HC, max_entries=DEFAULT_MAX_ENTRIES,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+        data_dir = Path(data_dir)
+        self.csv_file = data_dir / "4th_nutriensFood.csv"
+        self.version_paths = [self.csv_file, data_dir / "B. listHaram.txt", data_dir / "C. listNutriens.txt"]
+        self.hashes = FileHashIndex(data_dir.parent / "cache" / "file_hashes.json")
+        self.min_hc = min_hc
+        self.significant_digits = significant_digits
+        self.cache = ResultCache(max_entries, ttl_seconds, version_fn=self._version)
+        self._loaded_version = None
+        self._load()
+
+    def _version(self):
+        return dataset_version(self.version_paths, self.hashes)
+
+    def _load(self):
+        self.ids, self.names, self.groups, self.matrix = load_food_matrix(str(self.csv_file), self.min_hc)
+        self._upper_groups = np.array([group.upper() for group in self.groups], dtype=object)
+        self._loaded_version = self.cache.version
+
+    def _ensure_fresh(self):
+        # Jika cache sudah di-invalidate karena versi dataset berubah, reload matriks
+        if self.cache.version != self._loaded_version:
+            self._load()
+
+    def _profile_key(self, kind, profile):
+        return f"{kind}:{canonicalize_profile(profile, self.significant_digits)}"
+
+    def filter_candidates(self, profile):
+        """
+        Index kandidat makanan setelah mengecualikan food group di profil
+
+        Returns:
+            np.ndarray: Index baris matriks kandidat
+        """
+        key = self._profile_key('filter', {'excluded_food_groups': profile.get('excluded_food_groups')})
+
+        def compute():
+            self._ensure_fresh()
+            excluded = json.loads(key.split(':', 1)[1])['excluded_food_groups']
+            if excluded:
+                candidates = np.flatnonzero(~np.isin(self._upper_groups, excluded))
+            else:
+                candidates = np.arange(len(self.ids))
+            candidates.setflags(write=False)  # dibagi antar pemanggil lewat cache
+            return candidates
+
+        return self.cache.get_or_compute(key, compute)
+
+    def recommend(self, profile):
+        """
+        Rekomendasi menu untuk profil (hasil di-cache per profil kanonik)
+
+        Returns:
+            tuple: ((ID, Name), ...)
+        """
+        key = self._profile_key('recommend', profile)
+
+        def compute():
+            self._ensure_fresh()
+            canonical = json.loads(key.split(':', 1)[1])
+            candidates = self.filter_candidates(profile)
+            targets = np.array([canonical['targets'].get(col, np.nan) for col in HARD_CONSTRAINTS])
+            n_items = canonical['params'].get('n_items', DEFAULT_MENU_SIZE)
+            chosen, _ = recommend_menu(self.matrix[candidates], targets, n_items)
+            return tuple((int(self.ids[candidates[i]]), self.names[candidates[i]]) for i in chosen)
+
+        return self.cache.get_or_compute(key, compute)
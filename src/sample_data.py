@@ -0,0 +1,329 @@
+"""
+Script untuk membuat sampel bertingkat (stratified sample) dari nutriensFood.csv
+Author: Created for Tugas Akhir
+Date: March 2, 2026
+
+Fungsi:
+- Membuat sampel yang reproducible, stratifikasi berdasarkan Food Group x HC level
+- Menyimpan sampel ke cache (data/processed/sample/) supaya tidak dibuat ulang
+- Menjalankan analyzer (completeness / hc_sc) pada sampel
+- Melaporkan setiap persentase beserta confidence interval (CI)
+
+Tujuan: tuning kategori / threshold dalam hitungan detik, lalu konfirmasi
+dengan data penuh.
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analyze_hc_sc import (
+    HARD_CONSTRAINTS,
+    HIGH_QUALITY_HC,
+    LOW_QUALITY_HC,
+    NON_NUTRIENT_COLS,
+    analyze_hard_soft_constraints,
+)
+from analyze_nutrient_completeness import analyze_nutrient_completeness, categorize_completeness
+from streaming_stats import UNKNOWN_GROUP
+
+DEFAULT_FRAC = 0.01
+DEFAULT_SEED = 42
+
+
+def sample_key(csv_file, frac, seed, min_per_stratum):
+    """
+    Buat cache key dari identitas file sumber dan parameter sampling
+
+    Args:
+        csv_file (str): Path ke file sumber
+        frac (float): Fraksi sampel per stratum
+        seed (int): Random seed
+        min_per_stratum (int): Minimal baris per stratum
+
+    Returns:
+        str: Hex key (12 karakter)
+    """
+    stat = Path(csv_file).stat()
+    # UNKNOWN_GROUP ikut di key: label stratum tersimpan di metadata sampel
+    raw = (f"{Path(csv_file).resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{frac}|{seed}|{min_per_stratum}"
+           f"|{UNKNOWN_GROUP}")
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def add_strata(df):
+    """
+    Tambahkan kolom stratum (Food Group, HC level) ke DataFrame
+
+    Returns:
+        pd.Series: Label stratum per baris dengan format "<Food Group>|<HC_count>"
+    """
+    hc_cols = [col for col in HARD_CONSTRAINTS if col in df.columns]
+    hc_count = df[hc_cols].notna().sum(axis=1)
+    food_group = df['Food Group'].fillna(UNKNOWN_GROUP).astype(str)
+    return food_group + "|" + hc_count.astype(str)
+
+
+def build_stratified_sample(csv_file, cache_dir, frac=DEFAULT_FRAC, seed=DEFAULT_SEED,
+                            min_per_stratum=2, rebuild=False):
+    """
+    Buat (atau ambil dari cache) sampel bertingkat Food Group x HC level
+
+    Alokasi proporsional: n_h = max(min_per_stratum, round(frac * N_h)),
+    dibatasi N_h. Urutan baris asli tetap dipertahankan.
+
+    Args:
+        csv_file (str): Path ke 4th_nutriensFood.csv
+        cache_dir (str): Folder cache sampel
+        frac (float): Fraksi sampel per stratum (0 < frac <= 1)
+        seed (int): Random seed supaya reproducible
+        min_per_stratum (int): Minimal baris per stratum (stratum kecil tetap terwakili)
+        rebuild (bool): Paksa buat ulang sampel walaupun sudah ada di cache
+
+    Returns:
+        tuple: (path sampel CSV, metadata dict)
+    """
+    if not 0 < frac <= 1:
+        raise ValueError(f"frac harus di antara 0 dan 1, didapat: {frac}")
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = sample_key(csv_file, frac, seed, min_per_stratum)
+    sample_csv = cache_dir / f"sample_{key}.csv"
+    meta_file = cache_dir / f"sample_{key}.json"
+
+    if sample_csv.exists() and meta_file.exists() and not rebuild:
+        print(f"   ✓ Sampel diambil dari cache: {sample_csv}")
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            return sample_csv, json.load(f)
+
+    print(f"   Membuat sampel baru dari: {csv_file}")
+    print("   (Full load hanya sekali, hasil disimpan ke cache...)")
+    df = pd.read_csv(csv_file, low_memory=False)
+    strata = add_strata(df)
+
+    rng = np.random.default_rng(seed)
+    selected = []
+    strata_meta = {}
+    # sort=True supaya urutan stratum (dan hasil rng) selalu sama
+    for stratum, idx in strata.groupby(strata, sort=True).groups.items():
+        positions = np.asarray(idx)
+        n_total = len(positions)
+        n_sample = min(n_total, max(min_per_stratum, int(round(frac * n_total))))
+        chosen = rng.choice(positions, size=n_sample, replace=False)
+        selected.append(chosen)
+        strata_meta[stratum] = {'N': int(n_total), 'n': int(n_sample)}
+
+    selected = np.sort(np.concatenate(selected))
+    df_sample = df.loc[selected]
+    df_sample.to_csv(sample_csv, index=False)
+
+    meta = {
+        'source': str(Path(csv_file).resolve()),
+        'key': key,
+        'frac': frac,
+        'seed': seed,
+        'min_per_stratum': min_per_stratum,
+        'population_rows': int(len(df)),
+        'sample_rows': int(len(df_sample)),
+        'strata': strata_meta,
+    }
+    with open(meta_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    print(f"   ✓ Total strata: {len(strata_meta):,}")
+    print(f"   ✓ Sampel: {len(df_sample):,} dari {len(df):,} baris ({len(df_sample)/len(df)*100:.2f}%)")
+    print(f"   ✓ Sampel tersimpan di: {sample_csv}")
+    return sample_csv, meta
+
+
+def estimate_proportions(labels, strata, meta, z=1.96):
+    """
+    Estimasi proporsi populasi per label dengan stratified estimator + CI
+
+    p = sum(W_h * p_h), Var = sum(W_h^2 * (1 - n_h/N_h) * p_h(1-p_h) / (n_h - 1))
+    dengan W_h = N_h / N. Stratum dengan n_h = 1 memakai batas atas p(1-p) = 0.25.
+
+    Args:
+        labels (pd.Series): Label per baris sampel (mis. kategori, HC_count)
+        strata (pd.Series): Label stratum per baris sampel (lihat add_strata)
+        meta (dict): Metadata sampel dari build_stratified_sample
+        z (float): Nilai z untuk CI (1.96 = 95%)
+
+    Returns:
+        pd.DataFrame: Label, Sample_Rows, Percentage, CI_Low, CI_High, Est_Rows
+    """
+    population = meta['population_rows']
+    strata_meta = meta['strata']
+
+    counts = pd.crosstab(strata, labels)
+    n_h = np.array([strata_meta[s]['n'] for s in counts.index], dtype=float)
+    big_n_h = np.array([strata_meta[s]['N'] for s in counts.index], dtype=float)
+    weight = big_n_h / population
+    fpc = 1 - n_h / big_n_h
+
+    p_h = counts.to_numpy(dtype=float) / n_h[:, None]
+    estimate = (weight[:, None] * p_h).sum(axis=0)
+    # Stratum dengan n_h = 1 tidak bisa diestimasi variansnya -> pakai batas atas 0.25
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var_h = np.where(n_h[:, None] > 1,
+                         fpc[:, None] * p_h * (1 - p_h) / (n_h[:, None] - 1),
+                         fpc[:, None] * 0.25)
+    std_err = np.sqrt((weight[:, None] ** 2 * var_h).sum(axis=0))
+
+    result = pd.DataFrame({
+        'Label': counts.columns,
+        'Sample_Rows': counts.sum(axis=0).to_numpy(),
+        'Percentage': estimate * 100,
+        'CI_Low': np.clip(estimate - z * std_err, 0, 1) * 100,
+        'CI_High': np.clip(estimate + z * std_err, 0, 1) * 100,
+        'Est_Rows': np.round(estimate * population).astype(int),
+    })
+    return result
+
+
+def write_ci_report(sample_csv, meta, analyzer, output_dir, z=1.96):
+    """
+    Tulis laporan persentase + CI untuk analyzer yang dijalankan pada sampel
+
+    Args:
+        sample_csv (str): Path ke sampel CSV
+        meta (dict): Metadata sampel
+        analyzer (str): 'completeness' atau 'hc_sc'
+        output_dir (str): Folder output laporan
+        z (float): Nilai z untuk CI
+
+    Returns:
+        Path: Path file laporan
+    """
+    df = pd.read_csv(sample_csv, low_memory=False)
+    strata = add_strata(df)
+    nutrient_cols = [col for col in df.columns if col not in NON_NUTRIENT_COLS]
+
+    sections = []
+    if analyzer == 'completeness':
+        nutrient_count = df[nutrient_cols].notna().sum(axis=1)
+        category = nutrient_count.apply(lambda x: categorize_completeness(x, len(nutrient_cols)))
+        sections.append(("KATEGORI KELENGKAPAN", category))
+        sections.append(("DISTRIBUSI PER JUMLAH NUTRISI", nutrient_count))
+    else:
+        hc_cols = [col for col in HARD_CONSTRAINTS if col in df.columns]
+        sc_cols = [col for col in nutrient_cols if col not in hc_cols]
+        hc_count = df[hc_cols].notna().sum(axis=1)
+        sc_count = df[sc_cols].notna().sum(axis=1)
+        quality = pd.Series("MEDIUM", index=df.index)
+        quality[hc_count >= HIGH_QUALITY_HC] = f"HIGH (HC >= {HIGH_QUALITY_HC})"
+        quality[hc_count < LOW_QUALITY_HC] = f"LOW (HC < {LOW_QUALITY_HC})"
+        sections.append(("DISTRIBUSI PER LEVEL HC", hc_count))
+        sections.append(("KUALITAS DATA", quality))
+        sections.append(("KOMBINASI HC | SC", hc_count.astype(str) + " | " + sc_count.astype(str)))
+
+    report_file = Path(output_dir) / f"CI_{analyzer}_report.txt"
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("LAPORAN ESTIMASI DARI SAMPEL (APPROXIMATE)\n")
+        f.write("=" * 90 + "\n\n")
+        f.write(f"Sumber: {meta['source']}\n")
+        f.write(f"Sampel: {meta['sample_rows']:,} dari {meta['population_rows']:,} baris "
+                f"(frac={meta['frac']}, seed={meta['seed']}, strata={len(meta['strata']):,})\n")
+        f.write(f"Confidence interval: z = {z}\n")
+
+        for title, labels in sections:
+            est = estimate_proportions(labels, strata, meta, z=z)
+            est = est.sort_values('Label', ascending=(title != "DISTRIBUSI PER LEVEL HC"))
+            f.write(f"\n{title}:\n")
+            f.write("-" * 90 + "\n")
+            f.write(f"{'Label':<28} | {'Sampel':>8} | {'Estimasi %':>10} | {'CI':>19} | {'Est. Baris':>12}\n")
+            for row in est.itertuples():
+                ci = f"[{row.CI_Low:6.2f}, {row.CI_High:6.2f}]"
+                f.write(f"{str(row.Label):<28} | {row.Sample_Rows:>8,} | {row.Percentage:>9.2f}% | "
+                        f"{ci:>19} | {row.Est_Rows:>12,}\n")
+
+    return report_file
+
+
+def run_on_sample(csv_file, analyzer, frac=DEFAULT_FRAC, seed=DEFAULT_SEED,
+                  min_per_stratum=2, rebuild=False, cache_dir=None):
+    """
+    Jalankan analyzer pada sampel bertingkat dan tulis laporan CI
+
+    Laporan analyzer ditulis ke folder sampel (data/processed/sample/reports_<key>/)
+    sehingga laporan data penuh tidak tertimpa. Laporan E. / F. dari sampel berisi
+    hitungan mentah (tidak berbobot), jadi diberi akhiran [SAMPLE] + header peringatan;
+    estimasi berbobot ada di laporan CI.
+
+    Args:
+        csv_file (str): Path ke 4th_nutriensFood.csv
+        analyzer (str): 'completeness', 'hc_sc', atau 'all'
+        frac (float): Fraksi sampel
+        seed (int): Random seed
+        min_per_stratum (int): Minimal baris per stratum
+        rebuild (bool): Paksa buat ulang sampel
+        cache_dir (str): Folder cache (default: <folder csv>/sample)
+
+    Returns:
+        list: Path laporan CI yang dihasilkan
+    """
+    print("=" * 90)
+    print(f"SAMPLE MODE: {analyzer.upper()} (frac={frac}, seed={seed})")
+    print("=" * 90)
+
+    if cache_dir is None:
+        cache_dir = Path(csv_file).parent / "sample"
+    sample_csv, meta = build_stratified_sample(csv_file, cache_dir, frac, seed,
+                                               min_per_stratum, rebuild)
+
+    output_dir = Path(cache_dir) / f"reports_{meta['key']}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    analyzers = ['completeness', 'hc_sc'] if analyzer == 'all' else [analyzer]
+    reports = []
+    for name in analyzers:
+        if name == 'completeness':
+            analyze_nutrient_completeness(str(sample_csv), str(output_dir), sample=meta)
+        else:
+            analyze_hard_soft_constraints(str(sample_csv), str(output_dir), sample=meta)
+        reports.append(write_ci_report(sample_csv, meta, name, output_dir))
+
+    print(f"\n{'='*90}")
+    print("⚠️  Hasil di atas APPROXIMATE (dari sampel). Laporan dengan CI:")
+    for report in reports:
+        print(f"   - {report}")
+    print(f"{'='*90}")
+    return reports
+
+
+def add_sample_arguments(parser):
+    """
+    Tambahkan argumen --sample / --seed / --rebuild-sample ke parser analyzer
+    """
+    parser.add_argument('--sample', nargs='?', type=float, const=DEFAULT_FRAC, default=None,
+                        metavar='FRAC',
+                        help=f"Jalankan pada sampel bertingkat (default frac={DEFAULT_FRAC})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Random seed sampel")
+    parser.add_argument('--rebuild-sample', action='store_true', help="Buat ulang sampel di cache")
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+
+    parser = argparse.ArgumentParser(description="Jalankan analyzer pada sampel bertingkat")
+    parser.add_argument('--analyzer', choices=['completeness', 'hc_sc', 'all'], default='all')
+    parser.add_argument('--frac', type=float, default=DEFAULT_FRAC)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--min-per-stratum', type=int, default=2)
+    parser.add_argument('--rebuild', action='store_true')
+    args = parser.parse_args()
+
+    csv_file = data_processed / "4th_nutriensFood.csv"
+
+    if not csv_file.exists():
+        print(f"❌ Error: File tidak ditemukan: {csv_file}")
+        exit(1)
+
+    run_on_sample(str(csv_file), args.analyzer, args.frac, args.seed,
+                  args.min_per_stratum, args.rebuild)
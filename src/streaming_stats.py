@@ -0,0 +1,285 @@
+"""
+Akumulator statistik streaming yang bisa di-merge (mergeable)
+Author: Created for Tugas Akhir
+Date: March 4, 2026
+
+Dipakai oleh analyzer supaya data bisa diproses per chunk (atau paralel lalu
+digabung) dengan memori O(1) terhadap jumlah baris:
+- CountHistogram: histogram exact untuk nilai integer terbatas (0..max_value)
+- RunningMoments: mean / variance dengan algoritma Welford (merge: Chan et al.)
+- TopK: k item terbesar / terkecil berdasarkan key (heap)
+- iter_chunks / read_columns: helper baca CSV atau lazy stage view per chunk
+- report_path / sample_notice: penamaan + header laporan analyzer mode sampel
+- percentage: persentase yang aman untuk sumber kosong (0 baris)
+"""
+
+import heapq
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import StageView, is_view
+
+# Jumlah baris per chunk saat membaca CSV
+DEFAULT_CHUNKSIZE = 200_000
+# Label Food Group kosong (cube H. dan strata sampel memakai label yang sama)
+UNKNOWN_GROUP = "(Unknown)"
+
+
+def iter_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Baca CSV atau lazy stage view per chunk (index chunk = row id global)
+    """
+    if is_view(source):
+        return StageView.load(source).iter_chunks(chunksize)
+    return pd.read_csv(source, low_memory=False, chunksize=chunksize)
+
+
+def read_columns(source):
+    """
+    Daftar kolom dari CSV (header saja) atau lazy stage view
+    """
+    if is_view(source):
+        return list(StageView.load(source).columns)
+    return pd.read_csv(source, nrows=0).columns.tolist()
+
+
+def percentage(count, total):
+    """
+    count / total * 100; 0.0 jika total 0 (mis. CSV yang hanya berisi header)
+    """
+    return count / total * 100 if total else 0.0
+
+
+def report_path(output_dir, name, sample=None):
+    """
+    Path file laporan; laporan dari sampel diberi akhiran " [SAMPLE]" di nama file
+
+    Args:
+        output_dir (str): Folder output
+        name (str): Nama file laporan data penuh (mis. "E. nutrient_completeness_report.txt")
+        sample (dict): Metadata sampel (lihat sample_data.build_stratified_sample), None = data penuh
+    """
+    if sample is not None:
+        stem, _, suffix = name.rpartition('.')
+        name = f"{stem} [SAMPLE].{suffix}"
+    return Path(output_dir) / name
+
+
+def sample_notice(sample, ci_report):
+    """
+    Header peringatan untuk laporan yang dihitung dari sampel (angka TIDAK berbobot)
+
+    Args:
+        sample (dict): Metadata sampel
+        ci_report (str): Nama laporan estimasi berbobot + CI
+
+    Returns:
+        str: Teks header (diakhiri baris kosong)
+    """
+    return (f"*** SAMPLE: {sample['sample_rows']:,} dari {sample['population_rows']:,} baris "
+            f"(frac={sample['frac']}, seed={sample['seed']}) ***\n"
+            "Angka di laporan ini adalah hitungan mentah sampel bertingkat TANPA bobot stratum,\n"
+            "jadi persentase TIDAK mewakili data penuh. Estimasi berbobot + CI ada di:\n"
+            f"{ci_report}\n\n")
+
+
+class CountHistogram:
+    """
+    Histogram exact untuk nilai integer di range 0..max_value
+    """
+
+    def __init__(self, max_value):
+        self.max_value = int(max_value)
+        self.counts = np.zeros(self.max_value + 1, dtype=np.int64)
+
+    def update(self, values):
+        """
+        Tambahkan array nilai integer ke histogram
+        """
+        values = np.asarray(values, dtype=np.int64)
+        if len(values) and (values.min() < 0 or values.max() > self.max_value):
+            raise ValueError(f"Nilai di luar range 0..{self.max_value}")
+        self.counts += np.bincount(values, minlength=self.max_value + 1)
+
+    def merge(self, other):
+        if other.max_value != self.max_value:
+            raise ValueError("Histogram dengan range berbeda tidak bisa di-merge")
+        self.counts += other.counts
+        return self
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def nonzero(self):
+        """
+        Returns:
+            np.ndarray: Nilai-nilai yang muncul minimal sekali (ascending)
+        """
+        return np.flatnonzero(self.counts)
+
+    def min(self):
+        values = self.nonzero()
+        return int(values[0]) if len(values) else np.nan
+
+    def max(self):
+        values = self.nonzero()
+        return int(values[-1]) if len(values) else np.nan
+
+    def sum(self):
+        return int((np.arange(self.max_value + 1) * self.counts).sum())
+
+    def mean(self):
+        n = self.n
+        return self.sum() / n if n else np.nan
+
+    def median(self):
+        """
+        Median (sama seperti pandas: rata-rata dua nilai tengah jika n genap)
+        """
+        n = self.n
+        if n == 0:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        lower = int(np.searchsorted(cumulative, (n - 1) // 2 + 1))
+        upper = int(np.searchsorted(cumulative, n // 2 + 1))
+        return (lower + upper) / 2
+
+    def std(self, ddof=1):
+        """
+        Standard deviation (default ddof=1 seperti pandas)
+        """
+        n = self.n
+        if n - ddof <= 0:
+            return np.nan
+        values = np.arange(self.max_value + 1)
+        mean = self.mean()
+        return float(np.sqrt((self.counts * (values - mean) ** 2).sum() / (n - ddof)))
+
+    def to_dict(self):
+        return {'max_value': self.max_value, 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data['max_value'])
+        hist.counts = np.asarray(data['counts'], dtype=np.int64)
+        return hist
+
+
+class RunningMoments:
+    """
+    Mean, variance, min, max dengan algoritma Welford (batch + merge)
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """
+        Tambahkan array nilai (NaN diabaikan)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        batch = RunningMoments()
+        batch.n = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=1):
+        return self.m2 / (self.n - ddof) if self.n - ddof > 0 else np.nan
+
+    def std(self, ddof=1):
+        return float(np.sqrt(self.variance(ddof)))
+
+    def to_dict(self):
+        return {'n': self.n, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        moments = cls()
+        moments.n = data['n']
+        moments.mean = data['mean']
+        moments.m2 = data['m2']
+        moments.min = data['min']
+        moments.max = data['max']
+        return moments
+
+
+class TopK:
+    """
+    Simpan k item dengan key terbesar (largest=True) atau terkecil (largest=False)
+
+    Key berupa tuple angka. Untuk tie-break berdasarkan urutan baris, sertakan
+    row id di key (mis. (count, -row_id) untuk largest, (count, row_id) untuk smallest).
+    """
+
+    def __init__(self, k, largest=True):
+        self.k = k
+        self.largest = largest
+        self._heap = []
+
+    def _heap_key(self, key):
+        return tuple(key) if self.largest else tuple(-x for x in key)
+
+    def push(self, key, payload):
+        item = (self._heap_key(key), tuple(key), payload)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, item)
+
+    def push_many(self, keys, payloads):
+        for key, payload in zip(keys, payloads):
+            self.push(key, payload)
+        return self
+
+    def merge(self, other):
+        for _, key, payload in other._heap:
+            self.push(key, payload)
+        return self
+
+    def items(self):
+        """
+        Returns:
+            list: (key, payload) terurut dari yang terbaik
+        """
+        ordered = sorted(self._heap, key=lambda item: item[0], reverse=True)
+        return [(key, payload) for _, key, payload in ordered]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def to_dict(self):
+        return {'k': self.k, 'largest': self.largest,
+                'items': [[list(key), payload] for key, payload in self.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        top = cls(data['k'], data['largest'])
+        for key, payload in data['items']:
+            top.push(key, payload)
+        return top
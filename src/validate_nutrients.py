@@ -0,0 +1,292 @@
+"""
+Script untuk validasi plausibilitas nilai nutrisi (per 100 g)
+Author: Created for Tugas Akhir
+Date: March 11, 2026
+
+Fungsi:
+- Cek aturan plausibilitas secara vectorized per chunk (tanpa loop per baris)
+- Setiap baris mendapat bitflag pelanggaran (violation_flags)
+- Simpan daftar baris yang melanggar (baris yang tidak tercantum = flag 0)
+  + laporan ringkasan per aturan
+
+Aturan (bit):
+    0 NEGATIVE_VALUE   - ada nilai nutrisi negatif
+    1 ENERGY_MISMATCH  - Calories tidak konsisten dengan 4/4/9 x protein/karbohidrat/lemak
+    2 SUGARS_GT_CARB   - Sugars (g) > Carbohydrate (g)
+    3 SATFAT_GT_FAT    - Saturated Fats (g) > Fat (g)
+    4 FIBER_GT_CARB    - Fiber (g) > Carbohydrate (g)
+    5 MASS_OVER_100G   - Water + Protein + Fat + Carbohydrate > 100 g per 100 g
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analyze_hc_sc import NON_NUTRIENT_COLS
+from streaming_stats import DEFAULT_CHUNKSIZE, iter_chunks
+
+# Toleransi (pembulatan data sumber)
+GRAM_TOLERANCE = 0.5          # g, untuk perbandingan sub-komponen
+MASS_TOLERANCE = 2.0          # g, untuk total massa per 100 g
+ENERGY_TOLERANCE_ABS = 20.0   # kcal
+ENERGY_TOLERANCE_REL = 0.25   # 25% dari estimasi Atwater
+
+# (nama, deskripsi) urut sesuai bit
+RULES = [
+    ('NEGATIVE_VALUE', "Ada nilai nutrisi negatif"),
+    ('ENERGY_MISMATCH', "Calories != 4*Protein + 4*Carbohydrate + 9*Fat (di luar toleransi)"),
+    ('SUGARS_GT_CARB', "Sugars (g) > Carbohydrate (g)"),
+    ('SATFAT_GT_FAT', "Saturated Fats (g) > Fat (g)"),
+    ('FIBER_GT_CARB', "Fiber (g) > Carbohydrate (g)"),
+    ('MASS_OVER_100G', "Water + Protein + Fat + Carbohydrate > 100 g"),
+]
+RULE_BITS = {name: 1 << bit for bit, (name, _) in enumerate(RULES)}
+
+MASS_COLS = ['Water (g)', 'Protein (g)', 'Fat (g)', 'Carbohydrate (g)']
+
+# Kolom file G. nutrient_validation_flags.csv
+FLAG_COLUMNS = ['ID', 'Name', 'violation_flags', 'violations']
+
+
+def _column(chunk, name):
+    if name in chunk.columns:
+        return chunk[name].to_numpy(dtype=np.float64)
+    return np.full(len(chunk), np.nan)
+
+
+def compute_violation_flags(chunk):
+    """
+    Hitung bitflag pelanggaran untuk satu chunk (vectorized)
+
+    Args:
+        chunk (pd.DataFrame): Data nutrisi
+
+    Returns:
+        tuple: (flags np.ndarray uint8, dict nama aturan -> mask baris yang bisa dicek)
+    """
+    nutrient_cols = [col for col in chunk.columns if col not in NON_NUTRIENT_COLS]
+    values = chunk[nutrient_cols].to_numpy(dtype=np.float64)
+
+    calories = _column(chunk, 'Calories')
+    protein = _column(chunk, 'Protein (g)')
+    carb = _column(chunk, 'Carbohydrate (g)')
+    fat = _column(chunk, 'Fat (g)')
+    sugars = _column(chunk, 'Sugars (g)')
+    sat_fat = _column(chunk, 'Saturated Fats (g)')
+    fiber = _column(chunk, 'Fiber (g)')
+
+    applicable = {}
+    violations = {}
+
+    applicable['NEGATIVE_VALUE'] = ~np.isnan(values).all(axis=1)
+    violations['NEGATIVE_VALUE'] = (values < 0).any(axis=1)
+
+    atwater = 4 * protein + 4 * carb + 9 * fat
+    applicable['ENERGY_MISMATCH'] = ~np.isnan(calories) & ~np.isnan(atwater)
+    tolerance = np.maximum(ENERGY_TOLERANCE_ABS, ENERGY_TOLERANCE_REL * atwater)
+    violations['ENERGY_MISMATCH'] = np.abs(calories - atwater) > tolerance
+
+    for name, part, whole in (('SUGARS_GT_CARB', sugars, carb),
+                              ('SATFAT_GT_FAT', sat_fat, fat),
+                              ('FIBER_GT_CARB', fiber, carb)):
+        applicable[name] = ~np.isnan(part) & ~np.isnan(whole)
+        violations[name] = part > whole + GRAM_TOLERANCE
+
+    mass = np.column_stack([_column(chunk, col) for col in MASS_COLS])
+    applicable['MASS_OVER_100G'] = ~np.isnan(mass).all(axis=1)
+    violations['MASS_OVER_100G'] = np.nansum(mass, axis=1) > 100 + MASS_TOLERANCE
+
+    flags = np.zeros(len(chunk), dtype=np.uint8)
+    for name, bit in RULE_BITS.items():
+        # Perbandingan dengan NaN selalu False, tapi tetap dibatasi ke baris yang bisa dicek
+        flags |= np.where(violations[name] & applicable[name], bit, 0).astype(np.uint8)
+    return flags, applicable
+
+
+def describe_flags(flags):
+    """
+    Ubah bitflag jadi daftar nama aturan, mis. 5 -> 'NEGATIVE_VALUE|SUGARS_GT_CARB'
+    """
+    return '|'.join(name for name, bit in RULE_BITS.items() if flags & bit)
+
+
+def flagged_rows(chunk, flags):
+    """
+    Baris yang melanggar minimal 1 aturan: ID, Name, violation_flags, violations
+    """
+    flagged = flags != 0
+    rows = chunk.loc[flagged, ['ID', 'Name']].assign(violation_flags=flags[flagged])
+    rows['violations'] = rows['violation_flags'].map(describe_flags)
+    return rows[FLAG_COLUMNS]
+
+
+class ValidationSummary:
+    """
+    Akumulator ringkasan validasi per aturan (mergeable)
+    """
+
+    def __init__(self, n_examples=5):
+        self.n_rows = 0
+        self.n_flagged = 0
+        self.checked = {name: 0 for name in RULE_BITS}
+        self.violations = {name: 0 for name in RULE_BITS}
+        self.n_examples = n_examples
+        self.examples = {name: [] for name in RULE_BITS}
+
+    def update(self, chunk, flags, applicable):
+        self.n_rows += len(chunk)
+        self.n_flagged += int((flags != 0).sum())
+        names = chunk['Name'].astype(str).to_numpy() if 'Name' in chunk.columns else None
+        for name, bit in RULE_BITS.items():
+            hit = (flags & bit) != 0
+            self.checked[name] += int(applicable[name].sum())
+            self.violations[name] += int(hit.sum())
+            missing = self.n_examples - len(self.examples[name])
+            if missing > 0 and names is not None:
+                self.examples[name].extend(names[hit][:missing].tolist())
+        return self
+
+    def merge(self, other):
+        self.n_rows += other.n_rows
+        self.n_flagged += other.n_flagged
+        for name in RULE_BITS:
+            self.checked[name] += other.checked[name]
+            self.violations[name] += other.violations[name]
+            missing = self.n_examples - len(self.examples[name])
+            self.examples[name].extend(other.examples[name][:max(missing, 0)])
+        return self
+
+    def to_dict(self):
+        return {'n_rows': self.n_rows, 'n_flagged': self.n_flagged, 'checked': self.checked,
+                'violations': self.violations, 'n_examples': self.n_examples,
+                'examples': self.examples}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data['n_examples'])
+        summary.n_rows = data['n_rows']
+        summary.n_flagged = data['n_flagged']
+        summary.checked = dict(data['checked'])
+        summary.violations = dict(data['violations'])
+        summary.examples = {name: list(examples) for name, examples in data['examples'].items()}
+        return summary
+
+    def summary_table(self):
+        rows = []
+        for bit, (name, description) in enumerate(RULES):
+            checked = self.checked[name]
+            violations = self.violations[name]
+            rows.append({
+                'Bit': bit,
+                'Rule': name,
+                'Description': description,
+                'Checked_Rows': checked,
+                'Violations': violations,
+                'Violation_Pct': round(violations / checked * 100, 2) if checked else 0.0,
+            })
+        return pd.DataFrame(rows)
+
+
+def write_validation_report(summary, output_dir):
+    """
+    Tulis G. nutrient_validation_report.txt dan G. nutrient_validation_summary.csv
+
+    Returns:
+        tuple: (path laporan, path summary CSV)
+    """
+    table = summary.summary_table()
+    summary_csv = Path(output_dir) / "G. nutrient_validation_summary.csv"
+    table.to_csv(summary_csv, index=False)
+
+    report_file = Path(output_dir) / "G. nutrient_validation_report.txt"
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("LAPORAN VALIDASI PLAUSIBILITAS NUTRISI\n")
+        f.write("="*90 + "\n\n")
+        f.write(f"Total data: {summary.n_rows:,} baris\n")
+        pct = summary.n_flagged / summary.n_rows * 100 if summary.n_rows else 0
+        f.write(f"Baris dengan minimal 1 pelanggaran: {summary.n_flagged:,} ({pct:.2f}%)\n\n")
+
+        f.write("RINGKASAN PER ATURAN:\n")
+        f.write("-"*90 + "\n")
+        for row in table.itertuples():
+            f.write(f"\n[bit {row.Bit}] {row.Rule}\n")
+            f.write(f"  {row.Description}\n")
+            f.write(f"  Bisa dicek: {row.Checked_Rows:,} baris\n")
+            f.write(f"  Pelanggaran: {row.Violations:,} baris ({row.Violation_Pct:.2f}%)\n")
+            if summary.examples[row.Rule]:
+                f.write("  Contoh:\n")
+                for i, food in enumerate(summary.examples[row.Rule], 1):
+                    f.write(f"    {i}. {food}\n")
+
+    return report_file, summary_csv
+
+
+def validate_nutrients(csv_file, output_dir, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """
+    Validasi plausibilitas nutrisi untuk seluruh tabel (per chunk)
+
+    Args:
+        csv_file (str): Path ke 4th_nutriensFood.csv
+        output_dir (str): Folder output laporan
+        chunksize (int): Jumlah baris per chunk
+        progress (callable): Opsional, dipanggil progress(baris_diproses) setiap chunk
+
+    Returns:
+        ValidationSummary: Ringkasan validasi
+    """
+    print("=" * 90)
+    print("VALIDASI PLAUSIBILITAS NUTRISI")
+    print("=" * 90)
+
+    print(f"\n1. Validasi data dari: {csv_file}")
+    print(f"   (Dibaca per chunk {chunksize:,} baris...)")
+
+    # Header ditulis dulu supaya file flags selalu ada (juga untuk input kosong)
+    flags_csv = Path(output_dir) / "G. nutrient_validation_flags.csv"
+    pd.DataFrame(columns=FLAG_COLUMNS).to_csv(flags_csv, index=False)
+    summary = ValidationSummary()
+    for chunk in iter_chunks(csv_file, chunksize):
+        flags, applicable = compute_violation_flags(chunk)
+        summary.update(chunk, flags, applicable)
+        rows = flagged_rows(chunk, flags)
+        rows.to_csv(flags_csv, mode='a', header=False, index=False)
+        if progress:
+            progress(summary.n_rows)
+    print(f"   ✓ Total baris: {summary.n_rows:,}")
+
+    print(f"\n2. Ringkasan per aturan:")
+    for row in summary.summary_table().itertuples():
+        print(f"   [{row.Bit}] {row.Rule:<16} - {row.Violations:>10,} / {row.Checked_Rows:>10,} "
+              f"({row.Violation_Pct:5.2f}%)")
+
+    report_file, summary_csv = write_validation_report(summary, output_dir)
+    print(f"\n3. Menyimpan hasil:")
+    print(f"   ✓ Baris bermasalah (bitflag): {flags_csv}")
+    print(f"   ✓ Laporan: {report_file}")
+    print(f"   ✓ Summary: {summary_csv}")
+
+    print(f"\n{'='*90}")
+    print("✅ VALIDASI SELESAI!")
+    print(f"{'='*90}")
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', default=None,
+                        help="CSV atau lazy stage view (default: 4th_nutriensFood.csv)")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    data_processed = base_dir / "data" / "processed"
+
+    csv_file = Path(args.input) if args.input else data_processed / "4th_nutriensFood.csv"
+
+    if not csv_file.exists():
+        print(f"❌ Error: File tidak ditemukan: {csv_file}")
+        exit(1)
+
+    summary = validate_nutrients(str(csv_file), str(data_processed))
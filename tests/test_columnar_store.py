@@ -0,0 +1,55 @@
+"""
+Test ColumnarStore.build: tipe kolom harus mengikuti seluruh file, bukan chunk pertama,
+dan store / view ditolak jika CSV sumber berubah setelah build
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from columnar_store import ColumnarStore, StageView, StaleStoreError  # noqa: E402
+
+
+def test_build_infers_kinds_from_whole_file(tmp_path):
+    csv_file = tmp_path / "raw.csv"
+    pd.DataFrame({
+        'ID': [1, 2, 3, 4, 5, 6],
+        'Late NaN': [10, 20, 30, 40, None, 60],           # int di chunk pertama, NaN belakangan
+        'Late Text': [None, None, None, 1.5, 'abc', 7],   # kosong di chunk pertama, teks belakangan
+    }).to_csv(csv_file, index=False)
+
+    store = ColumnarStore.build(csv_file, tmp_path / "store", chunksize=2)
+    kinds = {name: spec['kind'] for name, spec in store._specs.items()}
+    assert kinds == {'ID': 'int', 'Late NaN': 'float', 'Late Text': 'text'}
+
+    expected = pd.read_csv(csv_file, dtype={'Late Text': str})
+    frame = StageView.from_store(tmp_path / "store").to_frame()
+    np.testing.assert_array_equal(frame['ID'].to_numpy(), expected['ID'].to_numpy())
+    np.testing.assert_array_equal(frame['Late NaN'].to_numpy(), expected['Late NaN'].to_numpy())
+    assert frame['Late Text'].isna().tolist() == [True, True, True, False, False, False]
+    assert frame['Late Text'].dropna().tolist() == ['1.5', 'abc', '7']
+
+
+def test_store_and_views_refuse_stale_source(tmp_path):
+    csv_file = tmp_path / "raw.csv"
+    pd.DataFrame({'ID': [1, 2, 3], 'Value': [1.5, 2.5, 3.5]}).to_csv(csv_file, index=False)
+    store = ColumnarStore.build(csv_file, tmp_path / "store")
+    view = StageView(store).select(np.array([True, False, True]))
+    view.save(tmp_path / "subset.view")
+    assert StageView.load(tmp_path / "subset.view").n_rows == 2
+
+    # Baris baru di-append ke CSV sumber (seperti ingest_delta) -> store & view basi
+    with open(csv_file, 'a', encoding='utf-8') as f:
+        f.write("4,4.5\n")
+    with pytest.raises(StaleStoreError):
+        StageView.from_store(tmp_path / "store")
+    with pytest.raises(StaleStoreError):
+        StageView.load(tmp_path / "subset.view")
+
+    ColumnarStore.build(csv_file, tmp_path / "store")
+    assert StageView.load(tmp_path / "store").n_rows == 4
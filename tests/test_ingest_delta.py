@@ -0,0 +1,139 @@
+"""
+Test ingest_delta: hasil ingest delta harus identik dengan rebuild pipeline penuh,
+dan delta yang ditolak tidak boleh mengubah file apa pun
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR / "src"))
+
+import ingest_delta as ingest  # noqa: E402
+from aggregate_cube import CUBE_FILE  # noqa: E402
+from pipeline import run_pipeline  # noqa: E402
+
+NUTRIENT_LIST = REPO_DIR / "data" / "processed" / "C. listNutriens.txt"
+COMPARED_FILES = [
+    ingest.RAW_CSV, ingest.HALAL_CSV, ingest.NUTRIENT_CSV,
+    "E. nutrient_completeness_report.txt", "E. nutrient_completeness_summary.csv",
+    "F. HC_SC_detailed_report.txt", "F. HC_SC_summary_table.csv", "F. HC_distribution.csv",
+    "G. nutrient_validation_flags.csv", "G. nutrient_validation_report.txt",
+    "G. nutrient_validation_summary.csv",
+]
+
+
+def make_raw(n_rows, seed, first_id):
+    """
+    CSV mentah sintetis: kolom C. listNutriens.txt + kolom ekstra (angka & teks)
+    """
+    rng = np.random.default_rng(seed)
+    columns = [line.strip() for line in NUTRIENT_LIST.read_text(encoding='utf-8').splitlines() if line.strip()]
+    words = ['CHICKEN', 'PORK', 'BEEF', 'CHEESE', 'BACON', 'RICE', 'APPLE', 'BREAD']
+    df = pd.DataFrame({
+        'ID': np.arange(first_id, first_id + n_rows),
+        'Name': [' '.join(rng.choice(words, 2)) for _ in range(n_rows)],
+        'Food Group': rng.choice(['Dairy', 'Meats', 'Fruits', None], size=n_rows),
+    })
+    for col in columns[3:]:
+        values = rng.gamma(2, 10, n_rows).round(2)
+        values[rng.random(n_rows) < rng.uniform(0.1, 0.7)] = np.nan
+        df[col] = values
+    df['Extra Score'] = rng.random(n_rows).round(4)
+    df['Extra Note'] = rng.choice(['a', 'b', 'c'], size=n_rows)
+    return df
+
+
+def setup_data_dir(data_dir, raw_bytes):
+    data_dir.mkdir(parents=True)
+    (data_dir / ingest.RAW_CSV).write_bytes(raw_bytes)
+    (data_dir / ingest.HARAM_LIST).write_text("PORK\nBACON\n", encoding='utf-8')
+    shutil.copy(NUTRIENT_LIST, data_dir / ingest.NUTRIENT_LIST)
+
+
+def body(csv_bytes):
+    return csv_bytes.split(b'\n', 1)[1]
+
+
+@pytest.fixture
+def pipeline_dir(tmp_path):
+    """
+    Folder data/processed berisi output pipeline penuh untuk 300 baris mentah
+    """
+    data_dir = tmp_path / "ingest" / "data"
+    setup_data_dir(data_dir, make_raw(300, 1, 1000).to_csv(index=False).encode('utf-8'))
+    run_pipeline(str(data_dir), str(tmp_path / "ingest" / "cache"))
+    return data_dir
+
+
+def snapshot(data_dir):
+    return {name: (data_dir / name).read_bytes() for name in ingest.TRACKED_FILES}
+
+
+def test_ingest_matches_full_rebuild(pipeline_dir, tmp_path):
+    delta_csv = tmp_path / "delta.csv"
+    make_raw(120, 2, 5000).to_csv(delta_csv, index=False)
+    original_raw = (pipeline_dir / ingest.RAW_CSV).read_bytes()
+
+    result = ingest.ingest_delta(str(delta_csv), str(pipeline_dir), str(tmp_path / "state.json"))
+    assert result['delta'] == 120 and 0 < result['halal'] < 120
+
+    full_dir = tmp_path / "full" / "data"
+    setup_data_dir(full_dir, original_raw + body(delta_csv.read_bytes()))
+    run_pipeline(str(full_dir), str(tmp_path / "full" / "cache"))
+
+    for name in COMPARED_FILES:
+        assert (pipeline_dir / name).read_bytes() == (full_dir / name).read_bytes(), name
+    with np.load(pipeline_dir / CUBE_FILE) as ingested, np.load(full_dir / CUBE_FILE) as rebuilt:
+        assert sorted(ingested.files) == sorted(rebuilt.files)
+        for key in rebuilt.files:
+            np.testing.assert_array_equal(ingested[key], rebuilt[key], err_msg=key)
+
+
+def test_reject_nan_id(pipeline_dir, tmp_path):
+    delta = make_raw(10, 3, 6000).astype({'ID': 'float64'})
+    delta.loc[4, 'ID'] = np.nan
+    delta.to_csv(tmp_path / "delta.csv", index=False)
+    state_file = tmp_path / "state.json"
+    before = snapshot(pipeline_dir)
+
+    with pytest.raises(ValueError, match="tipe kolom 'ID'"):
+        ingest.ingest_delta(str(tmp_path / "delta.csv"), str(pipeline_dir), str(state_file))
+    assert snapshot(pipeline_dir) == before
+
+
+def test_reject_kind_mismatch(pipeline_dir, tmp_path):
+    delta = make_raw(10, 4, 6000).astype({'Calories': object})
+    delta.loc[2, 'Calories'] = 'unknown'
+    delta.to_csv(tmp_path / "delta.csv", index=False)
+    before = snapshot(pipeline_dir)
+
+    with pytest.raises(ValueError, match="tipe kolom 'Calories'"):
+        ingest.ingest_delta(str(tmp_path / "delta.csv"), str(pipeline_dir), str(tmp_path / "state.json"))
+    assert snapshot(pipeline_dir) == before
+
+
+def test_failure_after_append_rolls_back(pipeline_dir, tmp_path, monkeypatch):
+    delta_csv = tmp_path / "delta.csv"
+    make_raw(50, 5, 7000).to_csv(delta_csv, index=False)
+    state_file = tmp_path / "state.json"
+    ingest.save_state(ingest.bootstrap_state(pipeline_dir), state_file, pipeline_dir)
+    before, state_before = snapshot(pipeline_dir), state_file.read_bytes()
+
+    def broken(chunk):
+        raise RuntimeError("gagal di tengah ingest")
+
+    monkeypatch.setattr(ingest, 'compute_violation_flags', broken)
+    with pytest.raises(RuntimeError, match="gagal di tengah ingest"):
+        ingest.ingest_delta(str(delta_csv), str(pipeline_dir), str(state_file))
+    assert snapshot(pipeline_dir) == before
+    assert state_file.read_bytes() == state_before
+
+    # Setelah rollback, ingest ulang delta yang sama tetap berhasil
+    monkeypatch.undo()
+    assert ingest.ingest_delta(str(delta_csv), str(pipeline_dir), str(state_file))['delta'] == 50
@@ -0,0 +1,189 @@
+"""
+Test analyzer per chunk: laporan E. / F. harus sama dengan perhitungan pandas in-memory
+(untuk berbagai chunksize), dan merge akumulator streaming harus exact
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from analyze_hc_sc import HARD_CONSTRAINTS, HCSCAccumulator, analyze_hard_soft_constraints  # noqa: E402
+from analyze_nutrient_completeness import (  # noqa: E402
+    CompletenessAccumulator,
+    analyze_nutrient_completeness,
+    categorize_completeness,
+    write_completeness_report,
+)
+from dataset_session import DatasetSession  # noqa: E402
+from streaming_stats import RunningMoments, TopK  # noqa: E402
+
+SOFT_CONSTRAINTS = [f"Soft {i} (mg)" for i in range(12)]
+CHUNKSIZES = [7, 64, 10_000]
+
+
+@pytest.fixture(scope='module')
+def nutrient_csv(tmp_path_factory):
+    rng = np.random.default_rng(7)
+    n_rows = 400
+    nutrients = HARD_CONSTRAINTS + SOFT_CONSTRAINTS
+    # Peluang terisi berbeda per baris supaya semua kategori / level HC muncul
+    fill = rng.uniform(0, 1.2, size=(n_rows, 1))
+    values = rng.uniform(0, 100, size=(n_rows, len(nutrients))).round(2)
+    values[rng.uniform(size=values.shape) > fill] = np.nan
+    df = pd.DataFrame(values, columns=nutrients)
+    df.insert(0, 'ID', np.arange(1000, 1000 + n_rows))
+    df.insert(1, 'Name', [f"FOOD {i}" for i in range(n_rows)])
+    df.insert(2, 'Food Group', rng.choice(['Fruits', 'Dairy', None], size=n_rows))
+    csv_file = tmp_path_factory.mktemp("data") / "4th_nutriensFood.csv"
+    df.to_csv(csv_file, index=False)
+    return csv_file
+
+
+def pandas_completeness_summary(df):
+    """
+    E. nutrient_completeness_summary.csv seperti implementasi in-memory lama
+    """
+    nutrient_cols = HARD_CONSTRAINTS + SOFT_CONSTRAINTS
+    df = df.copy()
+    df['nutrient_count'] = df[nutrient_cols].notna().sum(axis=1)
+    df['nutrient_percentage'] = df['nutrient_count'] / len(nutrient_cols) * 100
+    df['completeness_category'] = df['nutrient_count'].apply(
+        lambda x: categorize_completeness(x, len(nutrient_cols)))
+    summary = df.groupby('completeness_category').agg({
+        'nutrient_count': ['count', 'mean', 'min', 'max'],
+        'nutrient_percentage': 'mean'
+    }).round(2)
+    summary.columns = ['Total_Rows', 'Avg_Nutrients', 'Min_Nutrients', 'Max_Nutrients', 'Avg_Percentage']
+    return summary
+
+
+def pandas_hc_sc_tables(df):
+    """
+    F. HC_SC_summary_table.csv dan F. HC_distribution.csv seperti implementasi in-memory lama
+    """
+    df = df.copy()
+    df['HC_count'] = df[HARD_CONSTRAINTS].notna().sum(axis=1)
+    df['SC_count'] = df[SOFT_CONSTRAINTS].notna().sum(axis=1)
+    df['Total_count'] = df['HC_count'] + df['SC_count']
+    df_sorted = df.sort_values(by=['HC_count', 'SC_count'], ascending=[False, False])
+
+    summary = df_sorted.groupby(['HC_count', 'SC_count']).size().reset_index(name='Total_Rows')
+    summary = summary.sort_values(by=['HC_count', 'SC_count'], ascending=[False, False])
+    summary['Percentage'] = (summary['Total_Rows'] / len(df)) * 100
+    summary['Cumulative'] = summary['Total_Rows'].cumsum()
+    summary['Cumulative_Pct'] = (summary['Cumulative'] / len(df)) * 100
+
+    hc_dist = df_sorted.groupby('HC_count').agg({
+        'SC_count': ['count', 'mean', 'min', 'max', 'std'],
+        'Total_count': ['mean', 'min', 'max']
+    }).round(2)
+    hc_dist.columns = ['_'.join(col).strip() for col in hc_dist.columns.values]
+    return summary, hc_dist
+
+
+@pytest.mark.parametrize('chunksize', CHUNKSIZES)
+def test_completeness_matches_pandas(nutrient_csv, tmp_path, chunksize):
+    expected_file = tmp_path / "expected.csv"
+    pandas_completeness_summary(pd.read_csv(nutrient_csv)).to_csv(expected_file)
+
+    acc = analyze_nutrient_completeness(str(nutrient_csv), str(tmp_path), chunksize)
+    assert acc.n_rows == 400
+    assert (tmp_path / "E. nutrient_completeness_summary.csv").read_bytes() == expected_file.read_bytes()
+
+
+@pytest.mark.parametrize('chunksize', CHUNKSIZES)
+def test_hc_sc_matches_pandas(nutrient_csv, tmp_path, chunksize):
+    summary, hc_dist = pandas_hc_sc_tables(pd.read_csv(nutrient_csv))
+    summary.to_csv(tmp_path / "expected_summary.csv", index=False)
+    hc_dist.to_csv(tmp_path / "expected_dist.csv")
+
+    analyze_hard_soft_constraints(str(nutrient_csv), str(tmp_path), chunksize)
+    df = pd.read_csv(nutrient_csv)
+    report = (tmp_path / "F. HC_SC_detailed_report.txt").read_text(encoding='utf-8')
+    assert f"HC Mean: {df[HARD_CONSTRAINTS].notna().sum(axis=1).mean():.2f}/" in report
+    assert f"SC Mean: {df[SOFT_CONSTRAINTS].notna().sum(axis=1).mean():.2f}/" in report
+    assert ((tmp_path / "F. HC_SC_summary_table.csv").read_bytes()
+            == (tmp_path / "expected_summary.csv").read_bytes())
+    assert (tmp_path / "F. HC_distribution.csv").read_bytes() == (tmp_path / "expected_dist.csv").read_bytes()
+
+
+def test_reports_identical_across_chunksizes(nutrient_csv, tmp_path):
+    outputs = []
+    for chunksize in CHUNKSIZES:
+        out_dir = tmp_path / str(chunksize)
+        out_dir.mkdir()
+        analyze_nutrient_completeness(str(nutrient_csv), str(out_dir), chunksize)
+        analyze_hard_soft_constraints(str(nutrient_csv), str(out_dir), chunksize)
+        outputs.append({path.name: path.read_bytes() for path in sorted(out_dir.iterdir())})
+    assert len(outputs[0]) == 5
+    assert outputs[1:] == outputs[:1] * (len(outputs) - 1)
+
+
+@pytest.mark.parametrize('use_session', [False, True])
+def test_header_only_source(tmp_path, use_session):
+    csv_file = tmp_path / "4th_nutriensFood.csv"
+    pd.DataFrame(columns=['ID', 'Name', 'Food Group'] + HARD_CONSTRAINTS + SOFT_CONSTRAINTS).to_csv(
+        csv_file, index=False)
+    session = DatasetSession(str(csv_file)) if use_session else None
+
+    assert analyze_nutrient_completeness(str(csv_file), str(tmp_path), session=session).n_rows == 0
+    analyze_hard_soft_constraints(str(csv_file), str(tmp_path), session=session)
+    report = (tmp_path / "F. HC_SC_detailed_report.txt").read_text(encoding='utf-8')
+    assert "Total data: 0 baris" in report
+    assert "Data dengan HC lengkap (19/19): 0 (0.00%)" in report
+    assert "Total data: 0 baris" in (tmp_path / "E. nutrient_completeness_report.txt").read_text(encoding='utf-8')
+
+
+def test_accumulator_merge_equals_single_pass(nutrient_csv, tmp_path):
+    df = pd.read_csv(nutrient_csv)
+    nutrient_cols = HARD_CONSTRAINTS + SOFT_CONSTRAINTS
+
+    single = CompletenessAccumulator(nutrient_cols).update(df)
+    left = CompletenessAccumulator(nutrient_cols).update(df.iloc[:150])
+    left.merge(CompletenessAccumulator(nutrient_cols).update(df.iloc[150:]))
+    (tmp_path / "single").mkdir()
+    (tmp_path / "merged").mkdir()
+    for acc, name in ((single, "single"), (left, "merged")):
+        write_completeness_report(acc, tmp_path / name)
+    for name in ("E. nutrient_completeness_report.txt", "E. nutrient_completeness_summary.csv"):
+        assert (tmp_path / "single" / name).read_bytes() == (tmp_path / "merged" / name).read_bytes()
+
+    single = HCSCAccumulator(HARD_CONSTRAINTS, SOFT_CONSTRAINTS).update(df)
+    merged = HCSCAccumulator(HARD_CONSTRAINTS, SOFT_CONSTRAINTS).update(df.iloc[:150])
+    merged.merge(HCSCAccumulator(HARD_CONSTRAINTS, SOFT_CONSTRAINTS).update(df.iloc[150:]))
+    pd.testing.assert_frame_equal(merged.summary_table(), single.summary_table())
+    assert merged.high_quality.items() == single.high_quality.items()
+    assert merged.worst.items() == single.worst.items()
+
+
+def test_running_moments_merge():
+    values = np.random.default_rng(1).normal(50, 10, size=1000)
+    values[::37] = np.nan
+    merged = RunningMoments()
+    for part in np.array_split(values, 7):
+        merged.merge(RunningMoments().update(part))
+    clean = values[~np.isnan(values)]
+    assert merged.n == len(clean)
+    assert merged.mean == pytest.approx(clean.mean(), rel=1e-12)
+    assert merged.std() == pytest.approx(clean.std(ddof=1), rel=1e-12)
+    assert (merged.min, merged.max) == (clean.min(), clean.max())
+    # merge dengan akumulator kosong tidak mengubah apa pun
+    assert RunningMoments().merge(merged).to_dict() == merged.to_dict()
+
+
+def test_topk_merge():
+    keys = [(value, -row) for row, value in enumerate(np.random.default_rng(2).integers(0, 20, size=200).tolist())]
+    expected = sorted(keys, reverse=True)[:5]
+    for largest, expected_keys in ((True, expected), (False, sorted(keys)[:5])):
+        merged = TopK(5, largest=largest)
+        for start in range(0, len(keys), 30):
+            part = TopK(5, largest=largest).push_many(keys[start:start + 30], range(start, start + 30))
+            merged.merge(part)
+        assert [key for key, _ in merged.items()] == expected_keys
+    # round-trip to_dict / from_dict
+    assert TopK.from_dict(merged.to_dict()).items() == merged.items()